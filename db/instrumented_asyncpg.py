@@ -0,0 +1,55 @@
+"""
+Движок Tortoise ORM поверх asyncpg, который засекает каждый запрос для services.query_stats.
+
+Подключается строкой "engine" в конфиге Tortoise (services.settings.Settings.tortoise_config).
+Запросы в транзакциях идут через свою обёртку соединения, поэтому она тоже подменяется.
+"""
+
+import time
+from collections.abc import Callable, Coroutine
+from functools import wraps
+from typing import Any
+
+from tortoise.backends.asyncpg.client import AsyncpgDBClient, TransactionWrapper
+from tortoise.backends.base.client import NestedTransactionContext, TransactionContext, TransactionContextPooled
+
+from services.query_stats import record_query
+
+type _Execute = Callable[..., Coroutine[Any, Any, Any]]
+
+
+def _timed(method: _Execute) -> _Execute:
+    @wraps(method)
+    async def wrapper(self: AsyncpgDBClient, query: str, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await method(self, query, *args)
+        finally:
+            record_query(query, time.perf_counter() - started)
+
+    return wrapper
+
+
+class InstrumentedTransactionWrapper(TransactionWrapper):
+    execute_insert = _timed(TransactionWrapper.execute_insert)
+    execute_many = _timed(TransactionWrapper.execute_many)
+    execute_query = _timed(TransactionWrapper.execute_query)
+    execute_query_dict = _timed(TransactionWrapper.execute_query_dict)
+    execute_script = _timed(TransactionWrapper.execute_script)
+
+    def _in_transaction(self) -> TransactionContext:
+        return NestedTransactionContext(InstrumentedTransactionWrapper(self))
+
+
+class InstrumentedAsyncpgClient(AsyncpgDBClient):
+    execute_insert = _timed(AsyncpgDBClient.execute_insert)
+    execute_many = _timed(AsyncpgDBClient.execute_many)
+    execute_query = _timed(AsyncpgDBClient.execute_query)
+    execute_query_dict = _timed(AsyncpgDBClient.execute_query_dict)
+    execute_script = _timed(AsyncpgDBClient.execute_script)
+
+    def _in_transaction(self) -> TransactionContext:
+        return TransactionContextPooled(InstrumentedTransactionWrapper(self), self._pool_init_lock)
+
+
+client_class = InstrumentedAsyncpgClient
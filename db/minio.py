@@ -1,22 +1,73 @@
 import logging
+from functools import cache
+
+import urllib3
+from minio import Minio
+from urllib3.util import Retry, Timeout
 
 from exceptions.minio import BucketsUncreatedError
 from services.settings import settings
-from utils.minio import ensure_bucket
 
 logger = logging.getLogger(__name__)
 
 
+@cache
+def get_http_pool() -> urllib3.PoolManager:
+    """Пул соединений urllib3, через который ходит клиент Minio"""
+
+    return urllib3.PoolManager(
+        maxsize=settings.MINIO_POOL_SIZE,
+        timeout=Timeout(connect=settings.MINIO_CONNECT_TIMEOUT, read=settings.MINIO_READ_TIMEOUT),
+        retries=Retry(
+            total=settings.MINIO_RETRIES,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+    )
+
+
+@cache
+def get_minio() -> Minio:
+    """Общий клиент Minio; создаётся один раз и держит соединения в пуле get_http_pool"""
+
+    return Minio(
+        f"{settings.MINIO_HOST}:{settings.MINIO_PORT}",
+        access_key=settings.MINIO_ROOT_USER,
+        secret_key=settings.MINIO_ROOT_PASSWORD,
+        secure=False,
+        http_client=get_http_pool(),
+    )
+
+
+def ensure_bucket(name: str) -> None:
+    if get_minio().bucket_exists(name):
+        return
+    get_minio().make_bucket(name)
+    logger.info("Created bucket %s", name)
+
+
 async def init_minio() -> None:
     for bucket_name in settings.MINIO_BUCKETS:
         ensure_bucket(bucket_name)
     logger.info("Minio инициализирована")
 
 
+async def close_minio() -> None:
+    """Закрываем соединения пула Minio, если клиент создавался"""
+
+    if get_http_pool.cache_info().currsize == 0:
+        return
+    pool = get_http_pool()
+    get_minio.cache_clear()
+    get_http_pool.cache_clear()
+    pool.clear()
+    logger.info("Minio соединения закрыты")
+
+
 async def test_minio() -> None:
     """Проверка подключения к Minio"""
 
-    created_buckets = {b.name for b in settings.minio.list_buckets()}
+    created_buckets = {b.name for b in get_minio().list_buckets()}
     logger.debug("Minio created buckets %s", created_buckets)
     for bucket in settings.MINIO_BUCKETS:
         if bucket not in created_buckets:
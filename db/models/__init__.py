@@ -4,6 +4,8 @@ from .character import Character
 from .participation import Participation
 from .invitation import Invitation
 from .item import Item
+from .rating_event import RatingEvent
+from .rating_bucket import RatingBucket
 
 __all__ = [
     "Campaign",
@@ -11,5 +13,7 @@ __all__ = [
     "Invitation",
     "Item",
     "Participation",
+    "RatingBucket",
+    "RatingEvent",
     "User",
 ]
@@ -19,7 +19,22 @@ class TimestampedModel(models.Model):
 
 
 class CharacterData(models.Model):
+    # Документ персонажа Long Story Short (без конверта экспорта, где он лежит JSON-строкой)
     data = fields.JSONField(null=True)
+    # sha256 канонического JSON листа, чтобы не перезаписывать строку при повторной загрузке того же файла
+    data_hash = fields.CharField(max_length=64, null=True)
+
+    # Сводка для списков, чтобы не разбирать весь лист; заполняется при загрузке и изменении data
+    name = fields.CharField(max_length=255, null=True)
+    klass = fields.CharField(max_length=255, null=True)
+    level = fields.IntField(null=True)
+    hp_current = fields.IntField(null=True)
+    hp_max = fields.IntField(null=True)
+    ac = fields.IntField(null=True)
+
+    # Отрисованные превью (utils.character.CharacterPreviewMixin.rendered_previews), чтобы показывать
+    # персонажа без разбора листа; устаревают по версии разметки или сбрасываются в NULL при изменении data
+    preview = fields.JSONField(null=True)
 
     class Meta:
         abstract = True
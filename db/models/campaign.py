@@ -6,5 +6,5 @@ from .base import TimestampedModel, UuidModel
 class Campaign(TimestampedModel, UuidModel):
     title = fields.CharField(max_length=255)
     description = fields.CharField(max_length=1023, default="")
-    icon = fields.UUIDField(null=True)
+    icon = fields.UUIDField(null=True, db_index=True)  # имя объекта в MinIO; по нему считаются ссылки на иконку
     verified = fields.BooleanField(default=0)
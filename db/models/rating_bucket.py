@@ -0,0 +1,19 @@
+from tortoise import fields, models
+
+from utils.rating_window import RatingWindow
+
+
+# Сумма изменений рейтинга игрока за период (неделя, месяц, семестр); ведётся инкрементально
+# при записи журнала rating_event, чтобы таблицы за период не считались по всей истории
+class RatingBucket(models.Model):
+    id = fields.BigIntField(pk=True)
+    window = fields.CharEnumField(RatingWindow, max_length=16)
+    period_start = fields.DateField()
+    user = fields.ForeignKeyField("models.User", related_name="rating_buckets", on_delete=fields.CASCADE)
+    total = fields.IntField(default=0)
+
+    class Meta:
+        table = "rating_bucket"
+        unique_together = ("window", "period_start", "user")
+        # Таблица за период - один диапазон этого индекса в порядке (total, user_id)
+        indexes = [models.Index(fields=["window", "period_start", "total", "user_id"])]
@@ -0,0 +1,22 @@
+from tortoise import fields, models
+from tortoise.fields import OnDelete
+
+
+# Журнал изменений рейтинга: строки только добавляются, пишутся пачками (services.rating_ledger)
+class RatingEvent(models.Model):
+    id = fields.BigIntField(pk=True)
+    user = fields.ForeignKeyField("models.User", related_name="rating_events", on_delete=fields.CASCADE)
+    # Кто изменил рейтинг; None - система или удалённый пользователь
+    actor = fields.ForeignKeyField("models.User", null=True, related_name="rating_changes", on_delete=OnDelete.SET_NULL)
+    campaign = fields.ForeignKeyField(
+        "models.Campaign", null=True, related_name="rating_events", on_delete=OnDelete.SET_NULL
+    )
+    delta = fields.IntField()  # фактическое изменение после ограничения 0..MAX_RATING
+    rating = fields.IntField()  # рейтинг после изменения
+    reason = fields.CharField(max_length=255, null=True)
+    # Время самого изменения; пачка попадает в журнал позже
+    created_at = fields.DatetimeField()
+
+    class Meta:
+        table = "rating_event"
+        indexes = [models.Index(fields=["user_id", "created_at"])]
@@ -1,4 +1,4 @@
-from tortoise import fields
+from tortoise import fields, models
 
 from .base import CharacterData, TimestampedModel
 
@@ -8,6 +8,10 @@ class User(TimestampedModel, CharacterData):
     username = fields.CharField(max_length=32, null=True, index=True)
     admin = fields.BooleanField(index=True, default=False)
     rating = fields.IntField(default=0)
+    # Время последнего апдейта от пользователя; пишется пачками (services.user_sync), отстаёт на интервал записи
+    last_seen = fields.DatetimeField(null=True)
 
     class Meta:
         unique_together = ("id", "username")
+        # Таблица рейтинга листается keyset-запросом по (rating, id)
+        indexes = [models.Index(fields=["rating", "id"])]
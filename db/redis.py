@@ -0,0 +1,57 @@
+import logging
+import time
+from functools import cache
+from typing import Any
+
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+
+from services.metrics import REDIS_COMMAND_DURATION
+from services.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:  # noqa: FBT001, FBT002
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_DURATION.observe(time.perf_counter() - started, command="PIPELINE")
+
+
+class InstrumentedRedis(redis.Redis):
+    """Клиент Redis, засекающий каждое обращение к серверу для метрик"""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.observe(time.perf_counter() - started, command=str(args[0]).upper())
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> InstrumentedPipeline:  # noqa: FBT001, FBT002
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+@cache
+def get_redis() -> InstrumentedRedis:
+    """Общий клиент Redis для кэшей приложения (FSM-хранилища ботов живут в своих БД)"""
+
+    return InstrumentedRedis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        password=settings.REDIS_PASSWORD,
+        db=settings.REDIS_CACHE_DB,
+    )
+
+
+async def close_redis() -> None:
+    """Закрываем соединения общего клиента Redis, если он создавался"""
+
+    if get_redis.cache_info().currsize == 0:
+        return
+    await get_redis().aclose()
+    get_redis.cache_clear()
+    logger.info("Redis соединения закрыты")
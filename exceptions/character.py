@@ -0,0 +1,12 @@
+from collections.abc import Iterable, Sequence
+
+
+class InvalidCharacterPatchError(Exception):
+    def __init__(self, path: Sequence[str], unknown_fields: Iterable[str] = ()) -> None:
+        self.path = tuple(path)
+        self.unknown_fields = tuple(sorted(unknown_fields))
+
+    def __str__(self) -> str:
+        if not self.path:
+            return "Character sheet patch path must not be empty."
+        return f"Unknown summary fields in character sheet patch: {', '.join(self.unknown_fields)}."
@@ -0,0 +1,11 @@
+class InvalidImageError(Exception):
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"Image can't be processed: {self.reason}."
+
+
+class ImageTooLargeError(InvalidImageError):
+    def __init__(self, width: int, height: int, max_pixels: int) -> None:
+        super().__init__(f"{width}x{height} exceeds {max_pixels} pixels")
@@ -0,0 +1,7 @@
+class InvalidAwardLineError(Exception):
+    def __init__(self, line_number: int, line: str) -> None:
+        self.line_number = line_number
+        self.line = line
+
+    def __str__(self) -> str:
+        return f"Line {self.line_number} is not in the '@username +N' format: {self.line!r}."
@@ -0,0 +1,6 @@
+class FileTooLargeError(Exception):
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return f"File exceeds the {self.limit} bytes limit."
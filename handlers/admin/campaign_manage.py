@@ -2,16 +2,15 @@ import logging
 from typing import Any
 
 from aiogram import Router
-from aiogram.enums import ContentType
 from aiogram.types import CallbackQuery
 from aiogram_dialog import Data, Dialog, DialogManager, Window
-from aiogram_dialog.api.entities import MediaAttachment
 from aiogram_dialog.widgets.kbd import Button, Cancel, Group
 from aiogram_dialog.widgets.media import DynamicMedia
 from aiogram_dialog.widgets.text import Const, Format
 
 from db.models.campaign import Campaign
 from db.models.participation import Participation
+from services.icons import icon_attachment
 from utils.role import Role
 
 from . import states
@@ -33,7 +32,7 @@ async def get_campaign_manage_data(dialog_manager: DialogManager, **kwargs):
 
     icon = None
     if object_name := campaign.icon:
-        icon = MediaAttachment(type=ContentType.PHOTO, path=f"minio://campaign-icons:{object_name}")
+        icon = icon_attachment(object_name)
 
     return {
         "campaign_title": campaign.title,
@@ -1,9 +1,10 @@
 import json
 import logging
-from typing import TYPE_CHECKING
+from html import escape
 from uuid import UUID
 
 from aiogram import Router
+from aiogram.exceptions import TelegramAPIError
 from aiogram.types import BufferedInputFile, CallbackQuery, Message
 from aiogram_dialog import Dialog, DialogManager, Window
 from aiogram_dialog.widgets.input import ManagedTextInput, TextInput
@@ -26,30 +27,67 @@ from db.models.campaign import Campaign
 from db.models.character import Character
 from db.models.participation import Participation
 from db.models.user import User
-from services.character_data import character_preview_getter
+from exceptions.rating import InvalidAwardLineError
+from services.character_data import character_preview_getter, patch_char_data
+from services.character_pool import parse_characters
+from services.rating import RatingChange, adjust_rating, adjust_ratings, set_rating
+from services.rating_ledger import RatingSource
 from services.settings import settings
-from utils.character import CharacterData as CharData
-from utils.character import parse_character_data
+from services.user_cache import user_cache
+from utils.rating_award import parse_awards
 from utils.role import Role
 
 from . import states
 
-if TYPE_CHECKING:
-    from collections.abc import Sequence
+logger = logging.getLogger(__name__)
 
-    from db.models.base import CharacterData, UuidModel
 
+# === Гетеры ===
+def rating_source(dialog_manager: DialogManager, reason: str) -> RatingSource:
+    campaign_id = dialog_manager.dialog_data.get("campaign_id")
+    return RatingSource(
+        actor_id=dialog_manager.middleware_data["user"].id,
+        campaign_id=UUID(str(campaign_id)) if campaign_id else None,
+        reason=reason,
+    )
 
-logger = logging.getLogger(__name__)
 
+def get_holder_model(id_: int | UUID) -> type[User | Character]:
+    # Персонаж игрока вне кампаний хранится в самом User и адресуется telegram id
+    return User if isinstance(id_, int) else Character
 
-# === Гетеры ===
-async def get_character_data(id_: int | UUID) -> User | Character:
-    if isinstance(id_, int):
+
+async def get_holder(id_: int | UUID) -> User | Character:
+    if get_holder_model(id_) is User:
         return await User.get(id=id_)
     return await Character.get(id=id_).prefetch_related("user")
 
 
+async def fill_missing_summaries(model: type[User | Character], rows: list[dict]) -> None:
+    """
+    Достраивает сводку для строк, где её нет, хотя лист загружен (например, после неудачной миграции).
+
+    Листы разбираются пачкой вне event loop, найденная сводка сохраняется, чтобы не разбирать их снова.
+    """
+    missing = {row["id"]: row for row in rows if row["name"] is None}
+    if not missing:
+        return
+
+    sheets = await model.filter(id__in=list(missing), data__isnull=False).values_list("id", "data")
+    if not sheets:
+        return
+
+    parsed = await parse_characters([data for _, data in sheets])
+    for (id_, _), info in zip(sheets, parsed, strict=True):
+        if info is None:
+            continue
+        summary = info.summary()
+        missing[id_].update(summary)
+        await model.filter(id=id_).update(**summary)
+        if model is User:
+            await user_cache.invalidate(id_)
+
+
 async def get_characters_for_campaign(dialog_manager: DialogManager, **kwargs):
     """Получение персонажей в выбранной кампании"""
     if "campaign_id" not in dialog_manager.dialog_data and isinstance(dialog_manager.start_data, dict):
@@ -58,25 +96,29 @@ async def get_characters_for_campaign(dialog_manager: DialogManager, **kwargs):
     campaign_id: int = dialog_manager.dialog_data["campaign_id"]
     campaign = await Campaign.get(id=campaign_id)
 
-    list_participation = await Participation.filter(campaign=campaign, role=Role.PLAYER).prefetch_related("user").all()
-
-    if list_participation:
-        characters: Sequence[tuple[CharacterData, User, UuidModel]] = [
-            (participation.user, participation.user, participation.user) for participation in list_participation
-        ]
-    else:
-        characters: Sequence[tuple[CharacterData, User, UuidModel]] = [
-            (char, char.user, char)
-            for char in (await Character.filter(campaign=campaign).prefetch_related("user").all())
-        ]
-
-    characters_data: list[tuple[CharData, User, UuidModel]] = []
+    # Читаем только колонки-сводку, сами листы персонажей для списка не нужны
+    rows: list[dict] = await Participation.filter(campaign=campaign, role=Role.PLAYER).values(
+        id="user__id",
+        username="user__username",
+        name="user__name",
+        klass="user__klass",
+        level="user__level",
+    )
+    model: type[User | Character] = User
+    if not rows:
+        model = Character
+        rows = await Character.filter(campaign=campaign).values(
+            "id", "name", "klass", "level", username="user__username"
+        )
+    await fill_missing_summaries(model, rows)
+
+    characters_data = []
     player_without_characters = []
-    for char, user, model_uuid in characters:
-        if char.data:
-            characters_data.append((parse_character_data(json.loads(char.data["data"])), user, model_uuid))
+    for row in rows:
+        if row["name"] is not None:
+            characters_data.append(row)
         else:
-            player_without_characters.append(user.username)
+            player_without_characters.append(row["username"])
 
     return {
         "characters": characters_data,
@@ -90,8 +132,7 @@ async def get_characters_for_campaign(dialog_manager: DialogManager, **kwargs):
 
 async def preview_getter(dialog_manager: DialogManager, **kwargs):
     character_id = dialog_manager.dialog_data["character_id"]
-    character = await get_character_data(character_id)
-    data = json.loads(character.data["data"])
+    character = await get_holder(character_id)
 
     if isinstance(character, User):
         profile_link = f"https://t.me/{character.username}" if character.username else f"tg://user?id={character.id}"
@@ -100,7 +141,7 @@ async def preview_getter(dialog_manager: DialogManager, **kwargs):
         profile_link = f"https://t.me/{user.username}" if user.username else f"tg://user?id={user.id}"
 
     if isinstance(character, User):
-        character_preview = character_preview_getter(character, data)
+        character_preview = await character_preview_getter(character)
         return {
             "profile_link": profile_link,
             "user": character,
@@ -112,24 +153,44 @@ async def preview_getter(dialog_manager: DialogManager, **kwargs):
         "profile_link": profile_link,
         "user": user,
         "is_verified": False,
-        **character_preview_getter(user, data),
+        **await character_preview_getter(character),
     }
 
 
 async def get_level(dialog_manager: DialogManager, **kwargs):
     character_id = dialog_manager.dialog_data["character_id"]
-    character = await get_character_data(character_id)
+    character = await get_holder(character_id)
     data = character.data or {}
 
     try:
-        json_data = json.loads(data.get("data", "{}"))
-        level = json_data.get("info", {}).get("level", {}).get("value", 1)
-    except (json.JSONDecodeError, AttributeError):
+        level = data.get("info", {}).get("level", {}).get("value", 1)
+    except AttributeError:
         level = 1
 
     return {"level": level}
 
 
+async def get_campaign_players(dialog_manager: DialogManager, **kwargs):
+    campaign = await Campaign.get(id=dialog_manager.dialog_data["campaign_id"])
+    usernames = await Participation.filter(
+        campaign=campaign, role=Role.PLAYER, user__username__isnull=False
+    ).values_list("user__username", flat=True)
+
+    return {
+        "campaign_title": campaign.title,
+        "players": ", ".join(f"@{username}" for username in sorted(usernames, key=str.lower)) or "нет",
+        "max_step": settings.MAX_ONE_TIME_RATING,
+    }
+
+
+async def get_bulk_rating_preview(dialog_manager: DialogManager, **kwargs):
+    awards = dialog_manager.dialog_data.get("awards", [])
+    return {
+        "awards": "\n".join(f"@{username}: {delta:+d} ⭐" for _, username, delta in awards),
+        "count": len(awards),
+    }
+
+
 # === Кнопки (обработчики) ===
 async def on_character_selected(
     callback: CallbackQuery, widget: Select, dialog_manager: DialogManager, character_id: str
@@ -147,15 +208,10 @@ async def on_quick_rating_change(callback: CallbackQuery, widget: Button, dialog
     try:
         character_id = dialog_manager.dialog_data["character_id"]
 
-        user = await User.get(id=character_id)
-
-        new_rating = user.rating + change
-
-        new_rating = max(new_rating, 0)
-        new_rating = min(new_rating, settings.MAX_RATING)
-
-        user.rating = new_rating
-        await user.save()
+        change_result = await adjust_rating(character_id, change, rating_source(dialog_manager, "Быстрое изменение"))
+        if change_result is None:
+            await callback.answer("❌ Игрок не найден", show_alert=True)
+            return
 
         await dialog_manager.show()
 
@@ -170,18 +226,20 @@ async def on_rating_input(message: Message, widget: ManagedTextInput, dialog_man
         rating = int(text)
         character_id = dialog_manager.dialog_data["character_id"]
 
-        user = await User.get(id=character_id)
-
-        if abs(user.rating - rating) > settings.MAX_ONE_TIME_RATING:
+        change_result = await set_rating(
+            character_id,
+            rating,
+            settings.MAX_ONE_TIME_RATING,
+            rating_source(dialog_manager, "Установка вручную"),
+        )
+        if change_result is None:
+            await message.answer("❌ Игрок не найден")
+            return
+        if not change_result.applied:
             await message.answer(f"❌ Изменение рейтинга не может превышать {settings.MAX_ONE_TIME_RATING} за раз")
             return
 
-        rating = min(max(0, rating), settings.MAX_RATING)
-
-        user.rating = rating
-        await user.save()
-
-        await message.answer(f"✅ Рейтинг успешно изменен на {rating}")
+        await message.answer(f"✅ Рейтинг успешно изменен на {change_result.new}")
         await dialog_manager.switch_to(states.ManageCharacters.character_menu)
 
     except ValueError:
@@ -204,19 +262,10 @@ async def on_level_input(message: Message, widget: ManagedTextInput, dialog_mana
             await message.answer(f"❌ Уровень не может превышать {settings.MAX_LEVEL}")
             return
 
-        character = await get_character_data(character_id)
-        character_data = character.data or {}
-
-        character_data["data"] = character_data.get("data", "")
-
-        new_data = json.loads(character_data["data"])
-        new_data["info"] = new_data.get("info", {})
-        new_data["info"]["level"] = new_data["info"].get("level", {})
-        new_data["info"]["level"]["value"] = level
-
-        character_data["data"] = json.dumps(new_data)
-
-        await character.save()
+        model = get_holder_model(character_id)
+        if not await patch_char_data(model, character_id, ("info", "level", "value"), level, level=level):
+            await message.answer("❌ Персонаж не найден")
+            return
         await message.answer(f"✅ Уровень персонажа изменен на {level}")
         await dialog_manager.switch_to(states.ManageCharacters.character_menu)
 
@@ -227,6 +276,82 @@ async def on_level_input(message: Message, widget: ManagedTextInput, dialog_mana
         await message.answer("❌ Не удалось изменить уровень")
 
 
+async def on_bulk_rating_input(message: Message, widget: ManagedTextInput, dialog_manager: DialogManager, text: str):
+    """Разбор списка начислений за игру: по строке "@username +N" на игрока"""
+    try:
+        awards = parse_awards(text)
+    except InvalidAwardLineError as e:
+        await message.answer(f"❌ Строка {e.line_number} не похожа на «@username +N»: {escape(e.line)}")
+        return
+
+    players = await Participation.filter(
+        campaign_id=dialog_manager.dialog_data["campaign_id"], role=Role.PLAYER, user__username__isnull=False
+    ).values_list("user__id", "user__username")
+    by_username = {username.lower(): (id_, username) for id_, username in players}
+
+    unknown = [username for username in awards if username not in by_username]
+    if unknown:
+        await message.answer("❌ Нет таких игроков в кампании: @" + ", @".join(unknown))
+        return
+    too_large = [username for username, delta in awards.items() if abs(delta) > settings.MAX_ONE_TIME_RATING]
+    if too_large:
+        await message.answer(
+            f"❌ Изменение рейтинга не может превышать {settings.MAX_ONE_TIME_RATING} за раз: @" + ", @".join(too_large)
+        )
+        return
+
+    entries = [[*by_username[username], delta] for username, delta in awards.items() if delta]
+    if not entries:
+        await message.answer("❌ Список начислений пуст")
+        return
+
+    dialog_manager.dialog_data["awards"] = entries
+    await dialog_manager.switch_to(states.ManageCharacters.bulk_rating_confirm)
+
+
+async def notify_rating_awards(campaign: Campaign, changes: dict[int, RatingChange]) -> None:
+    """Одно сообщение каждому игроку с итогом начисления"""
+    bot = settings.player_bot
+    if bot is None:
+        logger.warning("Бот игроков не запущен, уведомления о рейтинге не отправлены")
+        return
+
+    title = escape(campaign.title)
+    for user_id, change in changes.items():
+        if change.new == change.old:
+            continue
+        try:
+            await bot.send_message(
+                user_id,
+                f"🏆 Итоги игры «{title}»: {change.new - change.old:+d} ⭐\nТеперь ваш рейтинг: {change.new}",
+            )
+        except TelegramAPIError as e:
+            # Игрок мог заблокировать бота; начисление уже сохранено
+            logger.warning("Не удалось уведомить игрока %d о рейтинге: %s", user_id, e)
+
+
+async def on_bulk_rating_confirm(callback: CallbackQuery, button: Button, dialog_manager: DialogManager):
+    """Начисление рейтинга всем игрокам из списка одним запросом"""
+    awards = dialog_manager.dialog_data.get("awards", [])
+    try:
+        changes = await adjust_ratings(
+            {user_id: delta for user_id, _, delta in awards},
+            rating_source(dialog_manager, "Итоги игры"),
+        )
+    except (IntegrityError, OperationalError) as e:
+        # Список остаётся в диалоге: начисление можно повторить без повторного ввода
+        logger.exception("Error in bulk rating change", exc_info=e)
+        await callback.answer("❌ Ошибка при изменении рейтинга", show_alert=True)
+        return
+    dialog_manager.dialog_data.pop("awards", None)
+
+    campaign = await Campaign.get(id=dialog_manager.dialog_data["campaign_id"])
+    await notify_rating_awards(campaign, changes)
+
+    await callback.answer(f"✅ Рейтинг начислен игрокам: {len(changes)}")
+    await dialog_manager.switch_to(states.ManageCharacters.character_selection)
+
+
 async def on_add_character(mes: CallbackQuery, wif: Button, dialog_manager: DialogManager):
     campaign_id = dialog_manager.dialog_data["campaign_id"]
 
@@ -237,10 +362,9 @@ async def on_download_json(callback: CallbackQuery, button: Button, dialog_manag
     """Обработчик скачивания JSON данных персонажа"""
     try:
         character_id = dialog_manager.dialog_data["character_id"]
-        character = await get_character_data(character_id)
+        character = await get_holder(character_id)
 
-        data = character.data or {}
-        json_str = data.get("data", "{}")
+        json_str = json.dumps(character.data or {}, ensure_ascii=False)
 
         if isinstance(character, User):
             filename = f"character_{character.username or character.id}.json"
@@ -286,16 +410,22 @@ character_selection_window = Window(
     ),
     ScrollingGroup(
         Select(
-            Format("@{item[1].username} – {item[0].name}"),
+            Format("@{item[username]} – {item[name]} ({item[klass]}, {item[level]} ур.)"),
             id="character_select",
             items="characters",
-            item_id_getter=lambda x: str(x[2].id),
+            item_id_getter=lambda x: str(x["id"]),
             on_click=on_character_selected,
         ),
         hide_on_single_page=True,
         height=5,
         id="characters_scroll",
     ),
+    SwitchTo(
+        Const("🏆 Рейтинг за игру"),
+        id="bulk_rating",
+        state=states.ManageCharacters.bulk_rating,
+        when=lambda data, *_: data.get("is_verified") and data.get("has_characters"),
+    ),
     Button(Const("➕ Добавить"), id="add_character", on_click=on_add_character),
     Cancel(Const("⬅️ Назад")),
     state=states.ManageCharacters.character_selection,
@@ -421,6 +551,37 @@ quick_rating_window = Window(
     getter=preview_getter,
 )
 
+bulk_rating_window = Window(
+    Multi(
+        Format("🏆 Рейтинг за игру: {campaign_title}"),
+        Const(
+            "Отправьте список начислений, по строке на игрока:\n<code>@username +5</code>\n<code>@username -2</code>"
+        ),
+        Format("За раз можно изменить рейтинг не больше чем на {max_step}"),
+        Format("Игроки: {players}"),
+        sep="\n\n",
+    ),
+    TextInput(
+        id="bulk_rating_input",
+        on_success=on_bulk_rating_input,
+    ),
+    SwitchTo(Const("⬅️ Назад"), id="bulk_to_list", state=states.ManageCharacters.character_selection),
+    state=states.ManageCharacters.bulk_rating,
+    getter=get_campaign_players,
+)
+
+bulk_rating_confirm_window = Window(
+    Multi(
+        Format("🏆 Начислить рейтинг игрокам ({count})?"),
+        Format("{awards}"),
+        sep="\n\n",
+    ),
+    Button(Const("✅ Начислить"), id="bulk_rating_confirm", on_click=on_bulk_rating_confirm),
+    SwitchTo(Const("⬅️ Назад"), id="bulk_confirm_back", state=states.ManageCharacters.bulk_rating),
+    state=states.ManageCharacters.bulk_rating_confirm,
+    getter=get_bulk_rating_preview,
+)
+
 # === Диалог и роутер ===
 dialog = Dialog(
     character_selection_window,
@@ -428,6 +589,8 @@ dialog = Dialog(
     change_level_window,
     change_rating_window,
     quick_rating_window,
+    bulk_rating_window,
+    bulk_rating_confirm_window,
 )
 
 router = Router()
@@ -1,12 +1,10 @@
 import logging
-import uuid
-from typing import TYPE_CHECKING, BinaryIO
+from typing import TYPE_CHECKING
 
 from aiogram import Router
 from aiogram.enums import ContentType
 from aiogram.types import CallbackQuery, Message
 from aiogram_dialog import Dialog, DialogManager, Window
-from aiogram_dialog.api.entities import MediaAttachment
 from aiogram_dialog.widgets.input import ManagedTextInput, MessageInput, TextInput
 from aiogram_dialog.widgets.kbd import Back, Button, Cancel, Next, Row
 from aiogram_dialog.widgets.media import DynamicMedia
@@ -15,6 +13,8 @@ from tortoise.exceptions import IncompleteInstanceError, IntegrityError, Operati
 
 from db.models.campaign import Campaign
 from db.models.participation import Participation
+from exceptions.media import InvalidImageError
+from services.icons import discard_icon, icon_attachment, icon_stored, upload_icon
 from services.settings import settings
 from utils.role import Role
 
@@ -30,7 +30,7 @@ logger = logging.getLogger(__name__)
 async def get_confirm_data(dialog_manager: DialogManager, **kwargs):
     icon = None
     if object_name := dialog_manager.dialog_data.get("icon"):
-        icon = MediaAttachment(type=ContentType.PHOTO, path=f"minio://campaign-icons:{object_name}")
+        icon = icon_attachment(object_name, thumbnail=True)
 
     return {
         "title": dialog_manager.dialog_data.get("title", ""),
@@ -68,19 +68,18 @@ async def on_description_entered(
 
 async def on_icon_entered(mes: Message, wid: MessageInput, dialog_manager: DialogManager):
     if mes.photo and mes.bot:
-        photo = mes.photo[-1]
-        file = await mes.bot.get_file(photo.file_id)
-        bin_stream: BinaryIO | None = await mes.bot.download_file(file.file_path or "")
-
-        object_id = uuid.uuid4()
-        settings.minio.put_object(
-            "campaign-icons",
-            str(object_id),
-            bin_stream,
-            file.file_size,
-        )
-
-        dialog_manager.dialog_data["icon"] = object_id
+        try:
+            object_name = await upload_icon(mes.bot, mes.photo[-1], dialog_manager.current_context().id)
+        except InvalidImageError as e:
+            logger.warning("Не удалось обработать иконку: %s", e)
+            await mes.answer("❌ Не удалось обработать изображение, попробуйте другое")
+            return
+
+        previous = dialog_manager.dialog_data.get("icon")
+        dialog_manager.dialog_data["icon"] = object_name
+        if previous != object_name:
+            # Прежняя картинка из этого диалога больше не нужна, если её не использует другая кампания
+            await discard_icon(previous, dialog_manager.current_context().id)
 
         await dialog_manager.next()
     else:
@@ -91,6 +90,14 @@ async def on_confirm(mes: CallbackQuery, button: Button, dialog_manager: DialogM
     campaign_data = dialog_manager.dialog_data
     user: User = dialog_manager.middleware_data["user"]
 
+    icon = campaign_data.get("icon")
+    if icon and not await icon_stored(icon):
+        # Отметка загрузки истекла или не записалась, и иконку успели удалить
+        await discard_icon(campaign_data.pop("icon"), dialog_manager.current_context().id)
+        await mes.answer("❌ Иконка больше не доступна, загрузите её заново", show_alert=True)
+        await dialog_manager.switch_to(states.CreateCampaign.select_icon)
+        return
+
     try:
         verified = False
         if isinstance(dialog_manager.start_data, dict):
@@ -99,7 +106,7 @@ async def on_confirm(mes: CallbackQuery, button: Button, dialog_manager: DialogM
         new_campaign: Campaign = await Campaign.create(
             title=campaign_data.get("title", ""),
             description=campaign_data.get("description", ""),
-            icon=campaign_data.get("icon"),
+            icon=icon,
             verified=verified,
         )
 
@@ -121,6 +128,12 @@ async def on_cancel(mes: CallbackQuery, button: Button, dialog_manager: DialogMa
     await dialog_manager.done()
 
 
+async def on_close(result: object, dialog_manager: DialogManager):
+    # Диалог больше не держит загруженную иконку: после создания кампании на неё ссылается
+    # сама кампания, после отмены иконка удаляется
+    await discard_icon(dialog_manager.dialog_data.get("icon"), dialog_manager.current_context().id)
+
+
 # === Окна ===
 title_window = Window(
     Const("🏰 Создание новой кампании\n\nВведите название кампании:\n(максимум 255 символов)"),
@@ -189,6 +202,6 @@ confirm_window = Window(
 )
 
 # === Создание диалога и роутера ===
-dialog = Dialog(title_window, description_window, icon_window, confirm_window)
+dialog = Dialog(title_window, description_window, icon_window, confirm_window, on_close=on_close)
 router = Router()
 router.include_router(dialog)
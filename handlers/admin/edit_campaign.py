@@ -4,7 +4,6 @@ from aiogram import Router
 from aiogram.enums import ContentType
 from aiogram.types import CallbackQuery, Message
 from aiogram_dialog import Dialog, DialogManager, Window
-from aiogram_dialog.api.entities import MediaAttachment
 from aiogram_dialog.widgets.input import ManagedTextInput, MessageInput, TextInput
 from aiogram_dialog.widgets.kbd import Button, Cancel, Column, SwitchTo
 from aiogram_dialog.widgets.media import DynamicMedia
@@ -13,6 +12,8 @@ from tortoise.exceptions import ConfigurationError, OperationalError
 
 from db.models.campaign import Campaign
 from db.models.participation import Participation
+from exceptions.media import InvalidImageError
+from services.icons import discard_icon, icon_attachment, icon_stored, release_icon, upload_icon
 from services.settings import settings
 from utils.role import Role
 
@@ -37,7 +38,7 @@ async def get_campaign_edit_data(dialog_manager: DialogManager, **kwargs):
 
     icon = None
     if object_name := dialog_manager.dialog_data["new_data"].get("icon", campaign.icon):
-        icon = MediaAttachment(type=ContentType.PHOTO, path=f"minio://campaign-icons:{object_name}")
+        icon = icon_attachment(object_name)
 
     return {
         "campaign_title": dialog_manager.dialog_data["new_data"].get("title", campaign.title),
@@ -90,10 +91,19 @@ async def on_description_edited(
 
 
 async def on_icon_entered(mes: Message, wid: MessageInput, dialog_manager: DialogManager):
-    if mes.photo:
-        photo = mes.photo[-1]
-
-        dialog_manager.dialog_data["new_data"]["icon"] = photo.file_unique_id
+    if mes.photo and mes.bot:
+        try:
+            object_name = await upload_icon(mes.bot, mes.photo[-1], dialog_manager.current_context().id)
+        except InvalidImageError as e:
+            logger.warning("Не удалось обработать иконку: %s", e)
+            await mes.answer("❌ Не удалось обработать изображение, попробуйте другое")
+            return
+
+        previous = dialog_manager.dialog_data["new_data"].get("icon")
+        dialog_manager.dialog_data["new_data"]["icon"] = object_name
+        if previous != object_name:
+            # Прежняя картинка из этого диалога больше не нужна, если её не использует другая кампания
+            await discard_icon(previous, dialog_manager.current_context().id)
 
         await dialog_manager.switch_to(states.EditCampaignInfo.confirm)
     else:
@@ -101,13 +111,24 @@ async def on_icon_entered(mes: Message, wid: MessageInput, dialog_manager: Dialo
 
 
 async def on_edit_confirm(mes: CallbackQuery, wid: Button, dialog_manager: DialogManager):
+    new_data = dialog_manager.dialog_data.get("new_data", {})
+    icon = new_data.get("icon")
+    if icon and not await icon_stored(icon):
+        # Отметка загрузки истекла или не записалась, и иконку успели удалить
+        await discard_icon(new_data.pop("icon"), dialog_manager.current_context().id)
+        await mes.answer("❌ Иконка больше не доступна, загрузите её заново", show_alert=True)
+        await dialog_manager.switch_to(states.EditCampaignInfo.edit_icon)
+        return
+
     try:
         campaign = await Campaign.get(id=dialog_manager.dialog_data.get("campaign_id", 0))
-        new_data = dialog_manager.dialog_data.get("new_data", {})
+        old_icon = campaign.icon
 
         campaign = await Campaign.update_from_dict(campaign, new_data)
 
         await campaign.save()
+        if str(campaign.icon) != str(old_icon):
+            await release_icon(old_icon)
 
         await mes.answer(f"✅ {campaign.title} успешно обновлён", show_alert=True)
         await dialog_manager.done()
@@ -123,6 +144,7 @@ async def on_remove_campaign(callback: CallbackQuery, button: Button, dialog_man
     try:
         title = campaign.title
         await campaign.delete()
+        await release_icon(campaign.icon)
         await callback.answer(
             f"✅ Кампания {title} удалена",
             show_alert=True,
@@ -133,6 +155,13 @@ async def on_remove_campaign(callback: CallbackQuery, button: Button, dialog_man
         await callback.answer("❌ Ошибка при удалении", show_alert=True)
 
 
+async def on_close(result: object, dialog_manager: DialogManager):
+    # Диалог больше не держит загруженную иконку: после сохранения на неё ссылается кампания,
+    # после отмены иконка удаляется
+    new_data = dialog_manager.dialog_data.get("new_data", {})
+    await discard_icon(new_data.get("icon"), dialog_manager.current_context().id)
+
+
 # === Окна ===
 select_field_window = Window(
     DynamicMedia("icon"),
@@ -236,6 +265,7 @@ dialog = Dialog(
     edit_icon_window,
     confirm_edit_window,
     confirm_delete_window,
+    on_close=on_close,
 )
 router = Router()
 router.include_router(dialog)
@@ -0,0 +1,32 @@
+from html import escape
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+
+from db.models import User
+from services.query_stats import query_stats
+
+router = Router()
+
+TOP_TAGS = 20
+
+
+@router.message(Command("query_stats"))
+async def cmd_query_stats(message: Message, user: User):
+    """Итоги счётчика запросов к БД по обработчикам с запуска бота (только для администраторов)"""
+    if not user.admin:
+        return
+
+    totals = query_stats.snapshot()[:TOP_TAGS]
+    if not totals:
+        await message.answer("Запросов к БД пока не было")
+        return
+
+    lines = ["📊 Запросы к БД на апдейт (среднее / максимум, среднее время):"]
+    lines.extend(
+        f"<code>{escape(tag)}</code>: {item.queries / item.updates:.1f} / {item.max_queries}, "
+        f"{item.elapsed / item.updates * 1000:.1f} мс ({item.updates} апд.)"
+        for tag, item in totals
+    )
+    await message.answer("\n".join(lines))
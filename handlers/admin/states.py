@@ -34,6 +34,8 @@ class ManageCharacters(StatesGroup):
     change_rating = State()
     quick_rating = State()
     delete_accept = State()
+    bulk_rating = State()
+    bulk_rating_confirm = State()
 
 
 class ManageInventory(StatesGroup):
@@ -1,4 +1,3 @@
-import json
 import logging
 
 from aiogram import Router
@@ -8,7 +7,8 @@ from aiogram_dialog.widgets.kbd import Button, Cancel, Column, Row
 from aiogram_dialog.widgets.media import DynamicMedia
 from aiogram_dialog.widgets.text import Const, Format, Multi
 
-from services.character_data import character_preview_getter
+from services.character_data import character_preview_getter, has_sheet
+from services.rating import get_user_rank
 from states.academy import Academy
 from states.academy_campaigns import AcademyCampaigns
 from states.inventory_view import InventoryView, TargetType
@@ -42,15 +42,18 @@ async def on_campaigns(c: CallbackQuery, b: Button, m: DialogManager):
 async def character_data_getter(dialog_manager: DialogManager, **kwargs) -> dict:
     user = dialog_manager.middleware_data["user"]
 
-    if user.data is None:
-        return {"has_character_data": False, "avatar": False}
+    rank = await get_user_rank(user.id)
+    rank_data = {"has_rank": rank is not None, "rank": rank[0] if rank else 0, "rank_total": rank[1] if rank else 0}
 
-    data = json.loads(user.data.get("data", "{}"))
+    if not await has_sheet(user):
+        return {"has_character_data": False, "avatar": False, "rating": user.rating, **rank_data}
 
-    character_preview = character_preview_getter(user, data)
+    character_preview = await character_preview_getter(user)
 
     return {
         **character_preview,
+        **rank_data,
+        "rating": user.rating,
         "has_character_data": True,
     }
 
@@ -66,6 +69,7 @@ academy_dialog = Dialog(
         Const(
             "📭 У вас пока нет загруженного персонажа", when=lambda data, *_: not data.get("has_character_data", False)
         ),
+        Format("\n📈 Место в рейтинге: {rank} из {rank_total} ({rating} ⭐)", when="has_rank"),
         Column(
             Row(
                 Button(Const("🏰 Кампании"), id="campaigns", on_click=on_campaigns),
@@ -1,4 +1,3 @@
-import json
 from uuid import UUID
 
 from aiogram import Router
@@ -11,7 +10,6 @@ from db.models import Campaign, Character, Participation, User
 from states.other_games import OtherGames
 from states.other_games_campaign import OtherGamesCampaign
 from states.other_games_character import OtherGamesCharacter
-from utils.character import CharacterData, parse_character_data
 
 router = Router()
 
@@ -19,14 +17,9 @@ router = Router()
 async def main_getter(dialog_manager: DialogManager, **kwargs) -> dict:
     user: User = dialog_manager.middleware_data["user"]
 
-    characters: list[Character] = (
-        await Character.filter(user=user, campaign__verified=False).prefetch_related("campaign").all()
-    )
-
-    characters_data: list[tuple[Character, CharacterData, Campaign]] = [
-        (character, parse_character_data(json.loads(character.data["data"])), character.campaign)
-        for character in characters
-    ]
+    characters_data: list[dict] = await Character.filter(
+        user=user, campaign__verified=False, name__isnull=False
+    ).values("id", "name", campaign_title="campaign__title")
 
     return {
         "characters_data": characters_data,
@@ -95,10 +88,10 @@ other_games_dialog = Dialog(
         ),
         ScrollingGroup(
             Select(
-                Format("👤 {item[1].name} - {item[2].title}"),
+                Format("👤 {item[name]} - {item[campaign_title]}"),
                 id="character_select",
                 items="characters_data",
-                item_id_getter=lambda c: c[0].id,
+                item_id_getter=lambda c: c["id"],
                 on_click=on_character_selected,
                 type_factory=UUID,
             ),
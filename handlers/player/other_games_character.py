@@ -1,5 +1,3 @@
-import json
-
 from aiogram import Router
 from aiogram.types import CallbackQuery
 from aiogram_dialog import Dialog, DialogManager, Window
@@ -19,9 +17,7 @@ router = Router()
 
 async def character_data_getter(dialog_manager: DialogManager, **kwargs) -> dict:
     character = await Character.get(id=dialog_manager.start_data["character_id"])
-    data = json.loads(character.data["data"])
-
-    character_preview = character_preview_getter(character, data)
+    character_preview = await character_preview_getter(character)
 
     return {
         **character_preview,
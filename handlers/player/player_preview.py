@@ -1,4 +1,3 @@
-import json
 import logging
 
 from aiogram import Router
@@ -21,10 +20,9 @@ async def preview_getter(dialog_manager: DialogManager, **kwargs):
         dialog_manager.dialog_data["user_id"] = dialog_manager.start_data.get("user_id", 0)
 
     user = await User.get(id=dialog_manager.dialog_data["user_id"])
-    data = json.loads(user.data["data"])
     light = dialog_manager.dialog_data["light"]
 
-    character_preview = character_preview_getter(user, data, light=light)
+    character_preview = await character_preview_getter(user, light=light)
 
     return {
         "profile_link": f"tg://user?id={user.id}",
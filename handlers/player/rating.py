@@ -1,31 +1,76 @@
 import logging
+from typing import Any
 
 from aiogram import Router
 from aiogram.types import CallbackQuery
 from aiogram_dialog import Dialog, DialogManager, Window
-from aiogram_dialog.widgets.kbd import Cancel, ScrollingGroup, Select
+from aiogram_dialog.widgets.kbd import (
+    Cancel,
+    Column,
+    CurrentPage,
+    FirstPage,
+    LastPage,
+    ManagedRadio,
+    NextPage,
+    PrevPage,
+    Radio,
+    Row,
+    Select,
+    StubScroll,
+)
 from aiogram_dialog.widgets.text import Const, Format, Multi
 
-from db.models import User
+from services.rating import LEADERBOARD_PAGE_SIZE, get_leaderboard_page
 from states.player_preview import PlayerPreview
 from states.rating import AcademyRating
+from utils.rating_window import RatingWindow
 
 logger = logging.getLogger(__name__)
 router = Router()
 
 
-async def rating_getter(dialog_manager: DialogManager, **kwargs):
-    top_users = await User.all().order_by("-rating")
+WINDOWS = [
+    (RatingWindow.ALL, "Всё время"),
+    (RatingWindow.WEEK, "Неделя"),
+    (RatingWindow.MONTH, "Месяц"),
+    (RatingWindow.SEMESTER, "Семестр"),
+]
+
+WINDOW_TITLES = {
+    RatingWindow.ALL: "Топ игроков по рейтингу в академии:",
+    RatingWindow.WEEK: "Больше всех рейтинга получили за эту неделю:",
+    RatingWindow.MONTH: "Больше всех рейтинга получили за этот месяц:",
+    RatingWindow.SEMESTER: "Больше всех рейтинга получили за этот семестр:",
+}
 
-    # Добавляем позиции в рейтинге
-    top_with_positions = [(i + 1, user) for i, user in enumerate(top_users)]
+
+async def rating_getter(dialog_manager: DialogManager, **kwargs):
+    window = RatingWindow(dialog_manager.find("window").get_checked() or RatingWindow.ALL)
+    page = await dialog_manager.find("top").get_page()
+    cursors = dialog_manager.dialog_data.setdefault("rating_cursors", {})
+    total, top_with_positions = await get_leaderboard_page(page, cursors, window)
+    pages = -(-total // LEADERBOARD_PAGE_SIZE)
 
     return {
+        "windows": WINDOWS,
+        "window_title": WINDOW_TITLES[window],
         "top_with_positions": top_with_positions,
-        "has_users": len(top_with_positions) > 0,
+        "pages": pages,
+        "has_users": pages > 0,
+        "has_pages": pages > 1,
     }
 
 
+async def on_start(start_data: Any, m: DialogManager):
+    await m.find("window").set_checked(RatingWindow.ALL)
+
+
+async def on_window_changed(c: CallbackQuery, r: ManagedRadio, m: DialogManager, window: str):
+    # Курсоры и номер страницы относятся к прежней таблице
+    m.dialog_data["rating_cursors"] = {}
+    await m.find("top").set_page(0)
+
+
 async def on_preview(c: CallbackQuery, b: Select, m: DialogManager, user_id: int):
     await m.start(PlayerPreview.preview, data={"user_id": user_id, "light": True})
 
@@ -35,30 +80,47 @@ rating_dialog = Dialog(
         Multi(
             Const("🏆 Рейтинг игроков"),
             Const(""),
-            Const("Топ игроков по рейтингу в академии:"),
+            Format("{window_title}"),
             Const(""),
             Const("📭 В рейтинге пока нет игроков", when=lambda data, *_: not data.get("has_users", False)),
             sep="\n",
         ),
-        ScrollingGroup(
+        Row(
+            Radio(
+                Format("🔘 {item[1]}"),
+                Format("⚪️ {item[1]}"),
+                id="window",
+                item_id_getter=lambda x: x[0],
+                items="windows",
+                on_state_changed=on_window_changed,
+            ),
+        ),
+        # Страница читается из БД целиком в геттере, поэтому вместо ScrollingGroup - StubScroll и отдельный пейджер
+        StubScroll(id="top", pages="pages"),
+        Column(
             Select(
-                Format("{item[0]}. @{item[1].username} - {item[1].rating} ⭐"),
+                Format("{item[position]}. @{item[username]} - {item[rating]} ⭐"),
                 id="preview",
                 items="top_with_positions",
-                item_id_getter=lambda x: x[1].id,
+                item_id_getter=lambda x: x["id"],
                 on_click=on_preview,
                 type_factory=int,
             ),
-            hide_on_single_page=True,
-            width=1,
-            height=6,
-            id="top",
             when="has_users",
         ),
+        Row(
+            FirstPage(scroll="top"),
+            PrevPage(scroll="top"),
+            CurrentPage(scroll="top"),
+            NextPage(scroll="top"),
+            LastPage(scroll="top"),
+            when="has_pages",
+        ),
         Cancel(Const("⬅️ Назад")),
         getter=rating_getter,
         state=AcademyRating.rating,
     ),
+    on_start=on_start,
 )
 
 router.include_router(rating_dialog)
@@ -9,6 +9,7 @@ from aiogram_dialog.widgets.text import Const, Multi
 
 from db.models import Invitation, User
 from db.models.participation import Participation
+from services.character_data import has_sheet
 from states.academy import Academy
 from states.inventory_view import TargetType
 from states.invitation import InvitationAccept
@@ -108,7 +109,7 @@ async def start_simple(message: Message, dialog_manager: DialogManager, user: Us
 
 async def on_academy(c: CallbackQuery, b: Button, m: DialogManager):
     user: User = m.middleware_data["user"]
-    if user.data is None:
+    if not await has_sheet(user):
         await m.start(
             UploadCharacter.upload,
             data={"target_type": TargetType.USER, "target_id": user.id},
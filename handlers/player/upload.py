@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from typing import TYPE_CHECKING
@@ -14,10 +15,13 @@ from aiogram_dialog.widgets.text import Const, Multi
 from pydantic import BaseModel, ValidationError, field_validator
 
 from db.models import Character
-from services.character_data import update_char_data
+from exceptions.upload import FileTooLargeError
+from services.character_data import has_sheet, update_char_data
+from services.settings import settings
 from states.inventory_view import TargetType
 from states.upload_character import UploadCharacter
-from utils.character import parse_character_data
+from utils.character import load_character
+from utils.download import download_text
 
 if TYPE_CHECKING:
     from db.models.base import CharacterData
@@ -83,8 +87,23 @@ async def upload_document(msg: Message, _: MessageInput, manager: DialogManager)
         logger.warning("User %d didn't send us a valid json", msg.from_user.id)
         return
 
-    f = await msg.bot.download(msg.document.file_id)
-    content = f.read()
+    limit = settings.MAX_CHARACTER_FILE_SIZE
+    try:
+        content = await download_text(msg.bot, msg.document.file_id, limit)
+        # Разбор и валидация больших листов не должны блокировать event loop, общий для обоих ботов
+        data, info = await asyncio.to_thread(load_character, content)
+    except FileTooLargeError:
+        logger.warning("User %d sent file exceeding %d bytes", msg.from_user.id, limit)
+        await msg.answer(f"❌ Файл слишком большой. Максимальный размер - {limit // 1024} КБ.")
+        return
+    except UnicodeDecodeError:
+        logger.warning("Failed to unicode decode payload from user %d", msg.from_user.id)
+        await msg.answer("❌ Не удалось прочитать файл. Убедитесь, что это корректный JSON-файл.")
+        return
+    except (json.JSONDecodeError, ValidationError, TypeError):
+        logger.warning("User %d sent incorrect json", msg.from_user.id)
+        await msg.answer("❌ Это невалидный JSON-файл. Проверьте его содержимое.")
+        return
 
     user = manager.middleware_data["user"]
     request = UploadCharacterRequest(**manager.start_data)
@@ -105,25 +124,15 @@ async def upload_document(msg: Message, _: MessageInput, manager: DialogManager)
         logger.error("Failed to find source for user %d", user)
         return
 
-    try:
-        data = json.loads(content.decode("utf-8"))
-        parse_character_data(data)
-        await update_char_data(source, data)
-    except UnicodeDecodeError:
-        logger.warning("Failed to unicode decode payload from user %d", msg.from_user.id)
-        await msg.answer("❌ Не удалось прочитать файл. Убедитесь, что это корректный JSON-файл.")
-        return
-    except (json.JSONDecodeError, ValidationError):
-        logger.warning("User %d sent incorrect json", msg.from_user.id)
-        await msg.answer("❌ Это невалидный JSON-файл. Проверьте его содержимое.")
-        return
-
-    await msg.answer("✅ Данные персонажа успешно загружены!")
+    if await update_char_data(source, data, info):
+        await msg.answer("✅ Данные персонажа успешно загружены!")
+    else:
+        await msg.answer("ℹ️ Этот файл уже загружен, данные персонажа не изменились.")
     await manager.done()
 
 
-async def has_data(dialog_manager: DialogManager, **kwargs):
-    return {"has_data": dialog_manager.middleware_data["user"].data}
+async def has_data(dialog_manager: DialogManager, **kwargs) -> dict[str, bool]:
+    return {"has_data": await has_sheet(dialog_manager.middleware_data["user"])}
 
 
 """
@@ -18,9 +18,18 @@ from aiogram.fsm.storage.base import DefaultKeyBuilder
 from aiogram.fsm.storage.redis import RedisStorage
 from aiogram_dialog import setup_dialogs
 
-from db.minio import init_minio, test_minio
+from db.minio import close_minio, init_minio, test_minio
 from db.postgres import close_db, init_db, test_db
+from db.redis import close_redis
+from middleware.telegram_api import TelegramApiMetricsMiddleware
+from services.character_pool import close_parse_pool
+from services.icons import close_image_pool
+from services.loop_monitor import loop_monitor
+from services.metrics_server import metrics_server
+from services.rating import rebuild_leaderboard
+from services.rating_ledger import rating_ledger
 from services.settings import settings
+from services.user_sync import user_sync
 from utils import json
 from utils.minio import MinioMessageManager
 
@@ -69,7 +78,10 @@ def register_all_middlewares(
     package: str = MIDDLEWARE_PACKAGE,
 ) -> None:
     for file_name, module in _iter_modules(path, package):
-        if file_name.startswith("update_"):
+        # outer_update_ оборачивает апдейт целиком, раньше всех остальных middleware
+        if file_name.startswith("outer_update_"):
+            target = dp.update.outer_middleware
+        elif file_name.startswith("update_"):
             target = dp.update.middleware
         elif file_name.startswith("message_"):
             target = dp.message.middleware
@@ -124,7 +136,9 @@ async def run_bot(
         token=token,
         default=properties,
     )
-    dp = Dispatcher(storage=storage)
+    bot.session.middleware(TelegramApiMetricsMiddleware(suffix))
+    # bot_name попадает в data обработчиков и middleware, по нему метрики делятся между ботами
+    dp = Dispatcher(storage=storage, bot_name=suffix)
 
     if token == settings.TOKEN_ADMIN:
         settings.admin_bot = bot
@@ -153,6 +167,8 @@ async def run_bot_safe(*args, **kwargs):
 
 async def main() -> None:
     logger.info("Запущен проект: %s", settings.PROJECT_NAME)
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
 
     await init_db()
     await init_minio()
@@ -160,6 +176,12 @@ async def main() -> None:
     await test_db()
     await test_minio()
 
+    await rebuild_leaderboard()
+    rating_ledger.start()
+    user_sync.start()
+    if settings.METRICS_ENABLED:
+        await metrics_server.start()
+
     # стартуем ботов как background задачи
     task_player = asyncio.create_task(
         run_bot_safe(
@@ -178,7 +200,10 @@ async def main() -> None:
 
     supress(task_admin, task_player)
 
-    await asyncio.gather(task_player, task_admin)
+    try:
+        await asyncio.gather(task_player, task_admin)
+    finally:
+        await close_services()
 
 
 def supress(*tasks):
@@ -202,7 +227,20 @@ def cancel_tasks(*tasks):
     logger.warning("Получен ctrl+c, завершаем...")
     for task in tasks:
         task.cancel()
-    asyncio.gather(close_db())
+
+
+async def close_services() -> None:
+    # Сначала дописываем журнал рейтинга и наблюдения пользователей, пока соединения ещё открыты
+    await asyncio.gather(rating_ledger.close(), user_sync.close())
+    await asyncio.gather(
+        close_db(),
+        close_redis(),
+        close_minio(),
+        close_parse_pool(),
+        close_image_pool(),
+        metrics_server.close(),
+        loop_monitor.close(),
+    )
 
 
 if __name__ == "__main__":
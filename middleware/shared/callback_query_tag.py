@@ -0,0 +1,21 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from services.query_stats import tag_update
+from utils.events import handler_tag
+
+
+class CallbackQueryTagMiddleware(BaseMiddleware):
+    """Помечает апдейт для счётчика запросов и метрик"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        tag_update(f"callback:{handler_tag(data)}")
+        return await handler(event, data)
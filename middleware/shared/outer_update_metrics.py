@@ -0,0 +1,33 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from services.metrics import UPDATE_DB_QUERIES, UPDATE_DURATION, UPDATES
+from services.query_stats import query_stats
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """
+    Время обработки и запросы к БД за весь апдейт, включая остальные middleware.
+
+    Тег апдейта (состояние диалога или обработчик) ставят message_query_tag и callback_query_tag.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        started = time.perf_counter()
+        with query_stats.track() as stats:
+            try:
+                return await handler(event, data)
+            finally:
+                labels = {"bot": data.get("bot_name", "unknown"), "state": stats.tag}
+                UPDATES.inc(**labels)
+                UPDATE_DURATION.observe(time.perf_counter() - started, **labels)
+                UPDATE_DB_QUERIES.observe(stats.count, **labels)
@@ -6,6 +6,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 
 from services.user import get_or_create_user
+from services.user_sync import user_sync
 from utils.events import extract_user
 
 logger = logging.getLogger(__name__)
@@ -24,5 +25,6 @@ class UserMiddleware(BaseMiddleware):
             user, created = await get_or_create_user(tg_user)
             if created:
                 logger.info("New user created with id: %d and username %s", user.id, user.username)
+            user_sync.observe(user, tg_user.username)
             return await handler(event, {**data, "user": user})
         return await handler(event, data)
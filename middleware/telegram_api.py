@@ -0,0 +1,39 @@
+import time
+from typing import TYPE_CHECKING, Any
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiogram.methods.base import Response
+
+from services.metrics import TELEGRAM_REQUEST_DURATION, TELEGRAM_RETRY_AFTER
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+class TelegramApiMetricsMiddleware(BaseRequestMiddleware):
+    """Время запросов к Bot API и ответы 429; подключается к сессии бота, а не к диспетчеру"""
+
+    def __init__(self, bot_name: str) -> None:
+        self.bot_name = bot_name
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[Any],
+        bot: "Bot",
+        method: TelegramMethod[Any],
+    ) -> Response[Any]:
+        # Long polling висит на сервере до таймаута, время такого запроса ничего не говорит про нагрузку
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+
+        labels = {"bot": self.bot_name, "method": type(method).__name__}
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter:
+            TELEGRAM_RETRY_AFTER.inc(**labels)
+            raise
+        finally:
+            TELEGRAM_REQUEST_DURATION.observe(time.perf_counter() - started, **labels)
@@ -0,0 +1,102 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "user" ADD "name" VARCHAR(255);
+        ALTER TABLE "user" ADD "klass" VARCHAR(255);
+        ALTER TABLE "user" ADD "level" INT;
+        ALTER TABLE "user" ADD "hp_current" INT;
+        ALTER TABLE "user" ADD "hp_max" INT;
+        ALTER TABLE "user" ADD "ac" INT;
+        ALTER TABLE "character" ADD "name" VARCHAR(255);
+        ALTER TABLE "character" ADD "klass" VARCHAR(255);
+        ALTER TABLE "character" ADD "level" INT;
+        ALTER TABLE "character" ADD "hp_current" INT;
+        ALTER TABLE "character" ADD "hp_max" INT;
+        ALTER TABLE "character" ADD "ac" INT;
+        CREATE OR REPLACE FUNCTION pg_temp.lss_int(value JSONB) RETURNS INT AS $$
+            SELECT CASE WHEN value #>> '{}' ~ '^-?[0-9]{1,9}$' THEN (value #>> '{}')::INT ELSE 0 END
+        $$ LANGUAGE SQL IMMUTABLE;
+        UPDATE "user" SET
+            "name" = LEFT(COALESCE("data"->'name'->>'value', 'Неизвестно'), 255),
+            "klass" = LEFT(COALESCE("data"->'info'->'charClass'->>'value', 'Неизвестно'), 255),
+            "level" = pg_temp.lss_int("data"->'info'->'level'->'value'),
+            "hp_current" = pg_temp.lss_int("data"->'vitality'->'hp-current'->'value'),
+            "hp_max" = pg_temp.lss_int("data"->'vitality'->'hp-max'->'value'),
+            "ac" = pg_temp.lss_int("data"->'vitality'->'ac'->'value')
+        WHERE "data" IS NOT NULL;
+        UPDATE "character" SET
+            "name" = LEFT(COALESCE("data"->'name'->>'value', 'Неизвестно'), 255),
+            "klass" = LEFT(COALESCE("data"->'info'->'charClass'->>'value', 'Неизвестно'), 255),
+            "level" = pg_temp.lss_int("data"->'info'->'level'->'value'),
+            "hp_current" = pg_temp.lss_int("data"->'vitality'->'hp-current'->'value'),
+            "hp_max" = pg_temp.lss_int("data"->'vitality'->'hp-max'->'value'),
+            "ac" = pg_temp.lss_int("data"->'vitality'->'ac'->'value')
+        WHERE "data" IS NOT NULL;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "user" DROP COLUMN "name";
+        ALTER TABLE "user" DROP COLUMN "klass";
+        ALTER TABLE "user" DROP COLUMN "level";
+        ALTER TABLE "user" DROP COLUMN "hp_current";
+        ALTER TABLE "user" DROP COLUMN "hp_max";
+        ALTER TABLE "user" DROP COLUMN "ac";
+        ALTER TABLE "character" DROP COLUMN "name";
+        ALTER TABLE "character" DROP COLUMN "klass";
+        ALTER TABLE "character" DROP COLUMN "level";
+        ALTER TABLE "character" DROP COLUMN "hp_current";
+        ALTER TABLE "character" DROP COLUMN "hp_max";
+        ALTER TABLE "character" DROP COLUMN "ac";"""
+
+
+MODELS_STATE = (
+    "eJztXVtv4jgU/isoT12JrWiAtjtarQQtnWGXlqqlO7PTqSKTGIgakjRx2kFV//vazj2xGV"
+    "IuJeAXILaPHX8+9rn42LxKU0uDhnt4BqY20Mem9KnyKplgCvGPXF61IgHbjnNIAgJDgxZW"
+    "k6WGLnKAinD6CBguxEkadFVHt5FukTZMzzBIoqXigro5jpM8U3/yoIKsMUQT6OCM+wecrJ"
+    "sa/And8NF+VEY6NLTU6+oaaZumK2hm07S7u+75BS1JmhsqqmV4UzMubc/QxDKj4p6na4eE"
+    "huSNoQkdgKCW6AZ5y6DHYZL/xjgBOR6MXlWLEzQ4Ap5BwJD+HHmmSjCo0JbIR+MvqQA8qm"
+    "USaHUTESxe3/xexX2mqRJp6uxL6+agfvwb7aXlorFDMyki0hslBAj4pBTXGEjVgaTbCkB5"
+    "QM9xDtKnkA1qmjIDrhaQHoY/3gNymBCjHHNYCHMI3/swlXAftL5pzIIRnIPxoHvZuR20Lq"
+    "9JT6au+2RQiFqDDsmRaeosk3rgD4mF54c/caJKKl+7gy8V8lj53r/qZAcuKjf4LpF3Ah6y"
+    "FNN6UYCWYLYwNQQGl4wH1rO1dw5smlIM7IcObPDy8bgiHRkwP6RnE+CwhzMiyIwkhmtLx2"
+    "4KfioGNMdogh/lZnPO4P3buqGLHy6VGZGrIEv2895SICbfrACUGbLNASotITfScB7V5PoC"
+    "eJJiXED9zDSiusqCco5IVpkYFhHKwWTZIGcuI4JjqJ6ho+MqGBpM27IMCEw2YkmyDGpDTL"
+    "cu1qutBa52v99Lrbft7iDDbneX7Q5mRIooLqQjmty9GmA4iV44ekwoNCRhCNTHF+BoSion"
+    "oergeY0VVei4DOQD2ot/bqABOBM81JHDerZz+XwLGSdMZUkR3XzWEe3nkmB0o4pKjEZozy"
+    "iYyabLAoKrKDEUNnCQrur2KnjjOllXyTAhC4olW7wlJp81lafZFGCCMX1r0jZpKbeAsCzw"
+    "5OoyxwRPFVupDX4vea5fb2TnPwi7fC1KAd8uJxl5KP++7V9xVNOgfAbMOxP35l7TVVStGL"
+    "qLHsqmV5EepxSFUA09uGx9y2qoZ71+O4s1qaCd0cDodw5cvt4fln+Xwr95ODdgQD0awGVI"
+    "Bz6EEYHAMMTQgM/QyGPYNREbwqh8BkIitbYSwjFp53f5qHHSOK0fN06rpA8EzTDlZA6ovq"
+    "KfxGtiK6rnONBkeLS4oKWJ9hc5zM7FUAsI9hQxoBZAyy+8p0iJDYSd8DOLDYQdHdg5zo5C"
+    "tlqGbJVGW1kct8QsZqLW1sdc4ZAgepeE+Aje90XEH7Jcr5/ItfrxabNxctI8rUWyIp81T2"
+    "i0u5+J3EjxO8ePmwY7j/SF5UDMhP/AGUW7i98bmCrLOAvcKXdu2fy0ONkBL5FvJclAuHu4"
+    "U9D3hJ+1bs9a5x2JOblXgFwyFKS86GWWLTaCi+weAIQ8Ewu1zbmIP8wP88utA2xNWc5sP6"
+    "FYp2M4sZnC8Aynt1r4rmE9XU7EZ5XZDyzMq53QwoV5taMDmxOPjsUKz8LmQcf0pjnVKzWw"
+    "IekH2wnSD6/WONLIZ71WoV/Af4h/N+r0E9Lshp8B6eeQpqg+nUofhv7DKFH2lH7WYwq/8s"
+    "ZpoqGmX0WCON0E/X2SSJcTFcmJKvzyI6mI8VOXT44jc4c8zDNwbi9bvV7eNYaH2UEKeyeP"
+    "LwzTVOu1s7dbKqaMwaLhUiHJBkOliupXGwuXEu6fVTBhqFANZ4WdQDnScm0WbMAT9OF+tl"
+    "0Gd2vcbNtjx1eFl23TXjb2WiqYjyEeUgDedgaVq7teb56fcq1eKeKjY/mjAt/dHE9U6CBc"
+    "qxPqVYo7Epx2ISXgTxvLcpeGsQZEQQeCmkMukmhh/H70gbJpokIHODqarbLGzGSZWIaG15"
+    "4ooJMkr721cLlbpiHh/BPOP+EjEs6//R1YcThzHXGxTx4wEZG5ORy5xl+SZHPe06MlYFxx"
+    "FN7cA60DLLQ5pwbKeKB13nLR+TZIrRS50wLRatHrX30Oi2ePEKSxfcHWyISxUF8YFuDgGp"
+    "NkIB0Rmm22VVionvfv2r1O5fqmc9a97QbnMaJVl2amvY43nVYve+gVGB5jZTyHqj4FBhvF"
+    "iCYr5nyiw4C4dHBiGC9bvYOjWlXOuGtDbm3UsotiYIYUEC0xRSmPXDRrC0iWZo0rWJo5CP"
+    "0Inik0keLAJ093Cu8pcGoQWwxpoBEYM8KCWo4DZhwtKCDIAEkOrG0lp/6aM+8fsvcjuArh"
+    "GNsuzHQZSsFsaWBDbBTXsBhCmr8+5gjFMhlyquo5xTdcU3SCSzN7h5gNx5CxKvK3DGOKcu"
+    "1nre5kkX9uT9E8Bwx1o5hFyCbeUyTJivEuFPOEe4vgWFeVoWV6ReZwhmpznoklLu1ZC3LA"
+    "UGzHsqGDdNYiyL/WgE0tLjmo/vqSg/DAQmpjKQc9f1+GR7+HN3aJmKn3Isfa3CyAIId8D1"
+    "kws2+bV83nhEblacslxT82QirLgwxHcOGgnwI3yG1v1ApncnJiVzjMvAI0Sx/+k5+fC2Ao"
+    "YtCWjUHLKThiZgdQ8lS/rQpLS98uyIhPy10/yA9Us3NFxY16IphKBFNtYcyNCKba0YHdxZ"
+    "OU173Wf52bT5XaD/OydTsgP49+mP2vV+QXBXyjBxKFH2OJA4ji6p/dPJO0xSaNOJS0doPw"
+    "Y2wXypoMkyVkWb6lEs6NVRsoPkakdvpKS5kn89bERZfDYECXs0zKshZWhdmy69qtMFt2dG"
+    "BzZou4uV/c3L/Fp2vEzf3i5n5xc3+JkBM39xdCTNzcvyhSkbFXQBgkadYkD1ZtxaXEQV1e"
+    "QBrUZa4wIFkZftOmOsPnMv8cUUiztjD5HIiliJLHfSYvsfj8jQn2JrY25zfle7DEX19KvL"
+    "++hK4SuEeWA6TQ319uT8AHExAHqlB/FoiEfvd9vN1c/BXoZm98b0FHVycSYysgyKnO2wwA"
+    "cZmtueV9hzz/S2rafJ/+MxbEzJs6+Ip3gkRcFRMr33hqFAAxKF5OAI9qixz1xaW4ANK8TE"
+    "SIZSKmW4bvr06QrMBlvV0RISvzWRfQ0lcvXt7+B35FXKk="
+)
@@ -0,0 +1,64 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "user" ADD "data_hash" VARCHAR(64);
+        ALTER TABLE "character" ADD "data_hash" VARCHAR(64);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "user" DROP COLUMN "data_hash";
+        ALTER TABLE "character" DROP COLUMN "data_hash";"""
+
+
+MODELS_STATE = (
+    "eJztXVtP4zgU/itVnlipi0ovwI5WK7VQZrpbKIKyMzsMitzEbSPSJCQOTIX472s798TuNP"
+    "RC0vqlTWwfJ/587HPxsfMqzUwV6s7hGZhZQJsY0qfKq2SAGcQXmbxqRQKWFeWQBARGOi2s"
+    "xEuNHGQDBeH0MdAdiJNU6Ci2ZiHNJM8wXF0niaaCC2rGJEpyDe3JhTIyJxBNoY0z7h9wsm"
+    "ao8Cd0glvrUR5rUFcTr6up5Nk0XUZzi6bd3fXOL2hJ8riRrJi6OzOi0tYcTU0jLO66mnpI"
+    "aEjeBBrQBgiqsWaQt/RbHCR5b4wTkO3C8FXVKEGFY+DqBAzpz7FrKASDCn0S+Wn+JeWARz"
+    "ENAq1mIILF65vXqqjNNFUijzr70r45aBz/RltpOmhi00yKiPRGCQECHinFNQJSsSFptgxQ"
+    "FtBznIO0GWSDmqRMgav6pIfBxXtADhIilCMOC2AO4HsfphJugzow9LnfgwswHvYuu7fD9u"
+    "U1acnMcZ50ClF72CU5dZo6T6UeeF1i4vHhDZywksrX3vBLhdxWvg+uuumOC8sNv0vknYCL"
+    "TNkwX2SgxpgtSA2AwSWjjnUt9Z0dm6QUHfuhHeu/fNSvSEM6zHbp2RTY7O4MCVI9ieEqaN"
+    "/NwE9Zh8YETfFtvdVa0Hn/tm/o5IdLpXrkys+qe3lvCRDjb5YDyhTZ9gCVVpAbSTiPavXG"
+    "EniSYlxAvcwkoprCgnKBSFaYGOYRyv5g2SJnriKCI6ieoa3hKhgaTMc0dQgMNmJxshRqI0"
+    "y3KdarbQSuzmDQT8y3nd4wxW53l50uZkSKKC6kIZrcuxpiOIleOH6MKTQkYQSUxxdgq3Ii"
+    "J6bq4HGNFVVoOwzkfdqLf26gDjgDPNCRg3qKOX2+BYwTpLKkiGY8a4i2c0UwemFFJUYjsG"
+    "dkzGSzVQHBVZQYCgvYSFM0ax28cR2vq2SYkAnFrJu8KSabNavP0inAABP61uTZ5EmZCYRl"
+    "gcdnlwUmeKLYWm3we8l1vHpDO/9B2OUbUQr4djnJyEL59+3giqOa+uVTYN4ZuDX3qqagak"
+    "XXHPRQNr2KtDihKARq6MFl+1taQz3rDzpprEkFnbT6T1CfAmeaS/mPE71L9d8+sEnd/7i5"
+    "hOZ/3OTq/SQrCST9z4FhUL6U8G3EEn3UgcMQs3wIQwKBYYChDp+hnsWwZyA2hGH5FIRE/B"
+    "cSwgl5zu/1o+ZJ87Rx3DytkjYQNIOUkwWgehZTHK+pJSuubUOD4RrkgpYk2l/kMDvnQ80n"
+    "2FPEgJIDLa/wniIlVmJ2wmEvVmJ2tGMXeI1yGb0psnVav2XxgBP/AhO1jjbhCocY0bskxE"
+    "fwvici/qjXG42Teq1xfNpqnpy0TmuhrMhmLRIand5nIjcS/M5xiCfBziJ9YdoQM+E/cE7R"
+    "7uH3BobCMs58v9SdUzaHN062wUvopIozEG4ebhT0lhTO2rdn7fOuxBzca0AuHlNTXvRS0x"
+    "YbwWWWYQBCroGF2vZ87R/m0PrlGgy2pkx7vp9QbNLDHluVYrjYk2tWfB+7liwnAt3K7FAX"
+    "5tVOaOHCvNrRjs2IR9tkxblh86BruLOM6pXo2ID0g+0E6Ydbax6p5LdRq9A/4N1E180G/Y"
+    "U0u+llQPo7oimKR6fQm5F3M46VPaW/jYjCq7x5GntQy6siRpx8BL0+iaXXYxXVY1V45cdS"
+    "HuOnUT85Ds0dcrPIwLm9bPf7WdcY7mYbyewlUb4wTFJt1s4utlRMGIN5484Cki3GnOXVr7"
+    "YWdybcP+tgwkChGs1zO4EypOVaLNiCJ+jD/Wy7DG5h3GzFseOrwsu2bS8bey4VzMcQDwkA"
+    "b7vDytVdv7/IT7lRrxTx0bH8Ub7vboEnKnAQbtQJ9SpFDfG3DZES8KeFZblD44F9Ir8Bfs"
+    "0BF0m0MH4/ekPZNFahDWwNzddZY2qwTE1dxXNPGBlLkjf+tGC6W+VBwvknnH/CRyScf/vb"
+    "sWKX6ybiYp9cYCAiczM4co2/OMn2vKdHK8C45ii8hTuDh1hoczYHlHFn8KLpovttmJgpMt"
+    "suwtmiP7j6HBRP78VIYvuCrZEpY6K+0E3AwTUiSUE6JjRFtlVYqJ4P7jr9buX6pnvWu+35"
+    "G1vCWZdmJr2ON912P717GOguY2Y8h4o2AzobxZAmLeY8okOfuHRwYhgv2/2Do1q1nnLXBt"
+    "zarKUnRd8MySFaIopSbrlo1ZaQLK0aV7C0MhB6ETwzaCDZhk+uZudeU+DUIJYYkkAjMGGE"
+    "BbVtG8w5WpBPkAKS7PwrJKf+mjPvH9IHTTgy4RjLys10KUrBbElgA2xkRzcZQpo/P2YIxT"
+    "QZcKri2vkXXBN0gktTa4eYDSeQMSvylwwjinKtZ61vZ5G3b09WXRuMND2fRcgm3lMkyYzx"
+    "LhSzhHuL4ERT5JFpuHnGcIpqe56JFU4/2ghyQJct27SgjTTWJMg/H4JNLU6LqP76tIhgw0"
+    "JiYSkDPX9dhke/h0efiZip9yLHWtzMgSCHfA9ZMLVum1XNF4RGZWnLJcU/NkIqzYMMR3Du"
+    "oJ8cR/EVN2qFMzg5sSscZl4DmqUP/8mOzyUwFDFoq8agZRQcMbJ9KHmqX6HC0pLHNDLi0z"
+    "LnOPID1axMUXE0oQimEsFUBYy5EcFUO9qxu7iT8rrf/q9786lS+2Fctm+H5PLohzH4ekWu"
+    "KOBb3ZAo/BgrbEAUR//s5p6kAps0YlPSxg3Cj7FdKGsyTJaAZfmWSjA21m2geBiR2ukrrW"
+    "SeLJoTl50O/Q5dzTIpy1xYFWbLrmu3wmzZ0Y7NmC3iEwjiEwjiEwiFgk98AqGgGIpPIIhP"
+    "IGwNOfEJhFyIiU8gLItUaDXnEAZxmg3Jg3Wbwwlx0KgvIQ0ada4wIFkpflNnGsN5tXhDVk"
+    "Czsf0GGRBLsd0At5m8xPLjNyLYmyDljAOa7woUH2OVeB9jhY7s+5lWAyTXB1mLEznDBMSG"
+    "CtSeBSLBAsY+HhMvPk673aPz29DWlKnEWFPxc6qLVlVAVKYwx+Xv0BLKipo2f3HkGQti5p"
+    "EnfMU7RiLO3ImUbzw0coDoFy8ngEe1ZfZM41JcAGleKrTGNBDTLcN3/MdI1uD7L1Zozdqc"
+    "/zm09PWLl7f/AXZxLuY="
+)
@@ -0,0 +1,64 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "user" ADD "preview" JSONB;
+        ALTER TABLE "character" ADD "preview" JSONB;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "user" DROP COLUMN "preview";
+        ALTER TABLE "character" DROP COLUMN "preview";"""
+
+
+MODELS_STATE = (
+    "eJztXVtP4zgU/itVnliJRaUtlx2tVmqhM9PdQhGUndlhUOQmprUmTULiwFSI/762c0/sTk"
+    "MvJK1foLF9nPjzic/V8YsytXRouAdnYGoDNDaVD7UXxQRTSH7k6vZrCrDtuIYWYDAyWGMt"
+    "2WrkYgdomJQ/AMOFpEiHruYgGyOL3sP0DIMWWhppiMxxXOSZ6NGDKrbGEE+gQyru7kkxMn"
+    "X4E7rhpf1DfUDQ0FOPi3R6b1au4pnNym5ve+cfWUt6u5GqWYY3NePW9gxPLDNq7nlIP6A0"
+    "tG4MTegADPXEMOhTBiMOi/wnJgXY8WD0qHpcoMMH4BkUDOXPB8/UKAY1dif6p/WXUgAezT"
+    "IptMjEFIuXV39U8ZhZqUJvdfa5fb3XPP6NjdJy8dhhlQwR5ZURAgx8UoZrDKTmQDpsFeA8"
+    "oOekBqMp5IOapsyAqwekB+GPt4AcFsQoxxwWwhzC9zZMFTIGfWAas2AG52A87F10b4btiy"
+    "s6kqnrPhoMovawS2sarHSWKd3zp8Qi74f/4kSd1L70hp9r9LL2bXDZzU5c1G74TaHPBDxs"
+    "qab1rAI9wWxhaQgMaRlPrGfrb5zYNKWc2Hed2ODh43nFCBswP6VnE+DwpzMiyMwkgaukcz"
+    "cFP1UDmmM8IZeNo6M5k/dv+5otfqRVZkYug6qGX/eaAjH5ZAWgzJBtDlBlCbmRhvOw3mgu"
+    "gCdtJgTUr0wjijQelHNEssbFsIhQDl6WDXLmMiI4huoJOoh0wdFgOpZlQGDyEUuSZVAbEb"
+    "p1sV59LXB1BoN+ar3t9IYZdru96HQJIzJESSOEWXHvckjgpHrhw4+EQkMLRkD78QwcXU3V"
+    "JFQd8l4TRRU6Lgf5gPbjP9fQAIIXPNSRw37KuXy+howTlvKkCDKfEGbjXBKMXtRRhdEI7R"
+    "mVMNl0WUBIFxWGwgYORhqyV8EbV8m+KoYJXVCshiVaYvJV08Y0WwJMMGZPTe9N75RbQHgW"
+    "eHJ1mWOCp5qt1Aa/UzzX7zey8++lXb4WpUBsl9OKPJR/3wwuBapp0D4D5q1JRnOnIw3v1w"
+    "zk4vuq6VV0xClFIVRD9y7aX7Ma6ll/0MliTTvoZNV/ivoEuJNCyn+S6E2q/+aBTev+x60F"
+    "NP/jllDvp1VpINn/AhiG7SsJ31os0R8GcDliVgxhRCAxDDE04BM08hj2TMyHMGqfgZCK/1"
+    "JCOKb3+b1x2DppnTaPW6f7dAwUzbDkZA6ovsWUxGtiq5rnONDkuAaFoKWJdhc5ws7FUAsI"
+    "dhQxoBVAy2+8o0jZDnxC8LmI0pcgkXrfAnqfDHZtRUxEBru2dGLnOOYK+RUyZKt0MFQlyE"
+    "BdOFzUOmgslL8JojcJ4ffgfV8K/9FoNJsnjXrz+PSodXJydFqPxHG+ap5c7vQ+UdGc4ndB"
+    "zCENdh7pj5YDCRP+A2cM7R55bmBqPPs3cP3dulWLKZBiBzxHfsAkA5HhkUFBP2pz1r45a5"
+    "93Fe7LvQLkkmlL1UUvs2zxEVwk0gUw9kwi1DYXzng33fGXYS5isFrObDehWGcQIxH440Qx"
+    "0mFBcRgDpdvJXMIqxyykebUVWrg0r7Z0YnPi0bF4qYTEPOia3jSneqUmNiR9ZztB+e7VW4"
+    "c6/dus19g/4F/Ev1tN9hey6pZfAdnfESvRfDqNXYz8i4dE21P2txlT+J23ThM3OvK7SBCn"
+    "b8F+nyTKG4mOGoku/PYPShHjp9k4OY7MHXoxz8C5uWj3+3nvI5lmB6v8qLNYGKap1mtnl1"
+    "sqpozBoql9IckG0/qK6lcbS+2T7p9VMGGoUI1mhZ1AOdJqxWM24Al6dz/bNoNbGjdbeez4"
+    "fell27SXjb+WSubjiIcUgDfdYe3ytt+f56dcq1eK+uh4/qjAdzfHExU6CNfqhHpR4oEEO7"
+    "NoC/jTJrLcZSnXAVEwgKDnkIsU1pg8H7tgbJro0AEOwrNV9ph5WSaWoZO1J0o+psVrv1u4"
+    "3C1zI+n8k84/6SOSzr/dnVi5kXgdqcePHjAxlbk5HIXGX5Jkc97TwyVgXHGi49zN10MitA"
+    "X7L6q4+XrectH9OkytFLkMx2i16A8uP4XNs2mPaWyfiTUy4SzUHw0LCHCNSTKQPlCaMtsq"
+    "PFTPB7edfrd2dd096930ghzSaNVllWmv43W33c9u0AaGx1kZz6GGpsDgoxjRZMWcT3QQEF"
+    "cOTgLjRbu/d1jfb2TctSG3turZRTEwQwqIlpiikrtajuoLSJajulCwHOUg9DN4ptDEqgMf"
+    "PeQUjikIepAhhjTQGIw5aUFtxwEzgRYUEGSApEn2peTUX3Pm3X32Wx6uSjnGtgszXYZSMl"
+    "sa2BAb1TUsjpAWr485QrlMhpyqeU7xgGuKTnJpJnZI2HAMOauiOGQYU1QrnrUymybYGqnq"
+    "ngNGyChmEfKJdxRJumK8CcU84c4iOEaaOrJMr8g7nKHanGdiiQ9MrQU5YKi2Y9nQwYi3CI"
+    "p3Y/Kp5cbM/V9vzAw3LKQCSznoxXEZEf0Ofl1O5ky9FTlecLMAggLyHWTBTNw2r5rPSY3K"
+    "01ZLir9vhlSWBzmO4MJJPwW+dljerBXByynIXREw8wrQrHz6T/79XABDmYO2bA5aTsGRb3"
+    "YApUj1K1VaWvpLmJz8tNynMsWJanauqfz6o0ymkslUJcy5kclUWzqx27iT8qrf/q97/aFW"
+    "/25etG+G9Ofhd3Pw5ZL+YoBvdEOi9GMssQFRfvpnO/ckldikkZuS1m4Qvo/twliTY7KELC"
+    "u2VMJ3Y9UGio8R7Z090lLmybw1cdHlMJjQ5SyTqqyF+9Js2XbtVpotWzqxObNFnjIhT5mQ"
+    "p0yUCj55ykRJMZSnTMhTJjaGnDxlohBi8pQJecqEEMJN632RY6KAvE3SrEnkrtrjkJK4zc"
+    "YCArfZEMpbWpV5pfUp4vgH5+95C2nWtqUjB2IldnSQMdOHWHyJjAl2Jg885+MXe1vlkcKK"
+    "6Ehh6KqBK285QAodK1ye5CQuIA7UIHqSiIQxol38Er88YnmzpxO0oYO0icIJWwU1+/MCVy"
+    "BuU5oTCbYoSrWkMSOOPz0RQcz9qoxY8U6QyM8axco3eTUKgBg0ryaAh/VFtqWTVkIAWV0m"
+    "e8kyMdfzJTazEyQrMLPLlb20Mju7gJa+evHy+j98CRFX"
+)
@@ -0,0 +1,62 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_user_rating_932d34" ON "user" ("rating", "id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_user_rating_932d34";"""
+
+
+MODELS_STATE = (
+    "eJztXVtv2zYU/iuGnjrAKxzbuWwYBtiJu3lz4iJxdmsLgZYYm6gsqRKV1Cjy30dSd4p0rf"
+    "gSyeZLYpE8lPjxiOdK8Zu2cExo+W8vwcIFaGZrPze+aTZYQPKjUNdsaMB10xpagMHUYo2N"
+    "bKupjz1gYFL+ACwfkiIT+oaHXIwceg87sCxa6BikIbJnaVFgoy8B1LEzg3gOPVLx4RMpRr"
+    "YJv0I/vnQ/6w8IWmbucZFJ783Kdbx0Wdn9/fDqHWtJbzfVDccKFnba2l3iuWMnzYMAmW8p"
+    "Da2bQRt6AEMzMwz6lNGI46LwiUkB9gKYPKqZFpjwAQQWBUP75SGwDYpBg92J/un+qpWAx3"
+    "BsCi2yMcXi23M4qnTMrFSjt7r8vXf7pnP2Axul4+OZxyoZItozIwQYhKQM1xRIw4N02DrA"
+    "RUCvSA1GCygGNU/JgWtGpG/jHy8BOS5IUU45LIY5hu9lmGpkDObYtpbRDK7AeDK8HtxNet"
+    "fv6UgWvv/FYhD1JgNa02alS670TTglDnk/whcn6aTx93Dye4NeNv4b3wz4iUvaTf7T6DOB"
+    "ADu67TzpwMwwW1waA0NaphMbuOYLJzZPqSb2VSc2evh0XjHCFixO6eUceOLpTAi4mSRwVX"
+    "TuFuCrbkF7hufksn16umLy/urdssWPtOJm5Caqaod1zzkQs09WAkqObH+AahvIjTycJ612"
+    "Zw08aTMpoGFlHlFkiKBcIZINIYZlhHL0suyRMzcRwSlUj9BDpAuBBtN3HAsCW4xYloxDbU"
+    "rodsV6rZ3A1R+PR7n1tj+ccOx2f90fEEZkiJJGCLPi4c2EwEn1wofPGYWGFkyB8fkJeKae"
+    "q8moOuS9Jooq9HwB8hHtuz9voQUkL3isI8f9VHP5fI4ZJy4VSRFkPyLMxrkhGMOkoxqjEd"
+    "szOmGyxaaAkC5qDIULPIwM5G6DN95n+6oZJnRBcdqObIkpVi3aC74E2GDGnprem96psICI"
+    "LPDs6rLCBM8126oN/kEL/LDfxM7/pOzynSgFcrucVhSh/ONufCNRTaP2HJj3NhnNBxMZuN"
+    "mwkI8/1U2voiPOKQqxGvrmuvcPr6FejsZ9HmvaQZ9X/ynqc+DPSyn/WaIXqf77Bzav+591"
+    "19D8z7pSvZ9W5YFk/0tgGLevJXw7sUQ/W8AXiFk5hAmBwjDG0IKP0CpiOLSxGMKkPQchFf"
+    "+VhHBG7/Nj+6R73r3onHUvmnQMFM245HwFqKHFlMVr7upG4HnQFrgGpaDliY4XOcLO5VCL"
+    "CI4UMWCUQCtsfKRIuR58RPCpjNKXIVF63xp6nwp2HURMRAW7DnRiVzjmSvkVOLJtOhjqEm"
+    "SgLhwhan00k8rfDNGLhPBr8H4ohX9qtzud83arc3Zx2j0/P71oJeK4WLVKLveHv1HRnON3"
+    "ScwhD3YR6XeOBwkT/gmXDO0heW5gGyL7N3L93ft1iymQYg88JX7ALAOR4ZFBwTBqc9m7u+"
+    "xdDTThy70F5LJpS/VFj1u2xAiuE+kCGAc2EWr7C2e8mu743TAXMVgdb3mcUOwyiJEJ/Ami"
+    "GPmwoDyMgfLtVC5hnWMWyrw6CC1cmVcHOrEF8eg5olRCYh4M7GBRUL1yExuTvrKdoH0MWt"
+    "0Tk/7ttBrsHwgv0t/dDvsLWXU3rIDs75SVGCGdwS6m4cVDpu0F+9tJKcLOuxeZG52GXWSI"
+    "87dgv88z5e1MR+1MF2H7B62M8dNpn58l5g69WGXg3F33RqOi95FMs4d1cdRZLgzzVLu1s6"
+    "stFXPGYNnUvphkj2l9ZfWrvaX2KffPNpgwVqimy9JOoAJpveIxe/AEvbqf7ZDBrYybrTp2"
+    "fFN52fbtZROvpYr5BOIhB+DdYNK4uR+NVvkpd+qVoj46kT8q8t2t8ETFDsKdOqG+aelAop"
+    "1ZtAX86hJZ7rOU64goGkDUc8xFGmtMno9dMDbNdOgBD+HlNnvkXpa5Y5lk7UmSj2nxzu8W"
+    "L3eb3Eg5/5TzT/mIlPPveCdWbSTeRerxlwDYmMrcAo5S4y9Lsj/v6ckGMG450XHl5usJEd"
+    "qS/Rd13Hy9arkY/DPJrRSFDMdktRiNb36Lm/Npj3lsn4g1Mhcs1O8sB0hwTUk4SB8oTZVt"
+    "FRGqV+P7/mjQeH87uBzeDaMc0mTVZZV5r+PtoDfiN2gDKxCsjFfQQAtgiVFMaHgxFxK9jY"
+    "hrByeB8bo3enPSarY5d23Mrd0WvyhGZkgJ0ZJS1HJXy2lrDcly2pIKltMChGEGzwLaWPfg"
+    "lwB5pWMKkh5UiCEPNAYzQVpQz/PAUqIFRQQckDTJvpKc+n3O/PCJ/5aHr1OOcd3STMdRKm"
+    "bLAxtjo/uWIxDS8vWxQKiWyZhTjcArH3DN0Sku5WKHhA1nULAqykOGKUW94llbs2mirZG6"
+    "GXhgiqxyFqGY+EiRpCvGi1AsEh4tgjNk6FPHDsq8wxzV/jwTG3xgaifIAUt3PceFHkaiRV"
+    "C+G1NMrTZmNr+/MTPesJALLBWgl8dlZPRH+HU5lTP1UuREwc0SCErIj5AFubhtUTVfkRpV"
+    "pK2XFH/dDCmeBwWO4NJJPyW+dljdrBXJyynJXZEw8xbQrH36T/H9XANDlYO2aQ5aQcFRb3"
+    "YEpUz1q1RaWv5LmIL8tMKnMuWJam6hqfr6o0qmUslUFcy5UclUBzqxh7iT8v2o9+/g9udG"
+    "66N93bub0J8nH+3x3zf0FwN8rxsSlR9jgw2I6tM/h7knqcImjdqUtHOD8HVsF8aaApMlZl"
+    "m5pRK/G9s2UEKMaO/skXjzhNsSg2mHTWZu7G0HyaqVdt1FNmKTzeyduqywTWUMHbrOrIyh"
+    "A53YgjGkzq5QZ1eosysqBZ86u6KiGKqzK9TZFXtDTp1dUQoxdXaFOrtCCuG+9b7E3VFC3m"
+    "ZpdiRyt+1xyEncTnsNgdtpS+UtreJeaXOBBF7H1TvpYpqdbRQpgFiLfSKpa23NJTIlOJrs"
+    "8kLkQO7DVQcVa7KDiqGvR668zQApdVhxdVKehIB40IDoUSESR56O8fv+6uDm/Z550IMeMu"
+    "aaIBgW1TRXhcNA2qYy5xwcUJRqQ2NGHn96JIJY+K0aueKdIVEfS0qVb/JqlAAxal5PAE9a"
+    "62x2J62kALI6LifKsbHQ8yU3szMkWzCzq5UTtTU7u4SWvn3x8vw/oSorLw=="
+)
@@ -0,0 +1,76 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "rating_event" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "delta" INT NOT NULL,
+    "rating" INT NOT NULL,
+    "reason" VARCHAR(255),
+    "created_at" TIMESTAMPTZ NOT NULL,
+    "actor_id" BIGINT REFERENCES "user" ("id") ON DELETE SET NULL,
+    "campaign_id" UUID REFERENCES "campaign" ("id") ON DELETE SET NULL,
+    "user_id" BIGINT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_rating_even_user_id_1518cb" ON "rating_event" ("user_id", "created_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "rating_event";"""
+
+
+MODELS_STATE = (
+    "eJztXetv4rgW/1dQPs1K3BEF+tjV1ZWgZXa5S8uopbt7d2YUmcSFaEKSyaMdNOr/fm3nac"
+    "fOkhIgAX/hYfs48c/HPj4P2z+Ula1D03t/DVYOMBaW8kvrh2KBFUQ/cnntlgIcJ83BCT6Y"
+    "m6Swli0193wXaD5KfwKmB1GSDj3NNRzfsPEzrMA0caKtoYKGtUiTAsv4FkDVtxfQX0IXZX"
+    "z6gpINS4ffoRf/db6qTwY0dep1DR0/m6Sr/tohaY+P45sPpCR+3FzVbDNYWWlpZ+0vbSsp"
+    "HgSG/h7T4LwFtKALfKhnmoHfMmpxnBS+MUrw3QAmr6qnCTp8AoGJwVD+/RRYGsagRZ6EP/"
+    "r/UUrAo9kWhtawfIzFj9ewVWmbSaqCH3X92+D+Xe/iJ9JK2/MXLskkiCivhBD4ICQluKZA"
+    "ai7EzVaBnwf0BuX4xgryQaUpGXD1iPR9/OMtIMcJKcoph8Uwx/C9DVMFtUGfWuY66sECjG"
+    "fj29HDbHD7Ebdk5XnfTALRYDbCOV2SumZS34VdYqPxEQ6cpJLWn+PZby38t/X39G7EdlxS"
+    "bva3gt8JBL6tWvaLCvQMs8WpMTCoZNqxgaO/sWNpStmxB+3Y6OXTfvUN34T5Lr1eApffnQ"
+    "kB05MIrpr23Qp8V01oLfwl+ts9Py/ovD8G92TyQ6WYHrmLsrph3isFYvbNSkDJkO0PUGUL"
+    "uUHDedbp9jbAExcTAhpm0ogaGg/KApGscTEsI5SjwbJHztxGBKdQPUPXQFVwVjBD2zYhsP"
+    "iIZckY1OaIbles19kJXMPpdELNt8PxjGG3x9vhCDEiQRQVMnySPL6bITjxuvDpa2ZBgxPm"
+    "QPv6AlxdpXIySx00rtFCFboeB/mI9sPv99AEggEer5Hjeuo5fb7GjBOn8qSIYT0bPmnnlm"
+    "CMk4oajEasz6iIyVbbAoKqaDAUDnB9QzOcKnjjY7auBmOCXhnVocJniKm2guSeVDXCNdVZ"
+    "wuXxwBOs3bVFU24+a9VdsSnAAgvy1vjZ+Em5CZVnkcjOtgUmCapYpTaJT0rghfUmdo8v0k"
+    "6xk0WS2E6BM/JQ/vdheidYqkflGTAfLdSaT7qh+e2WaXj+lzqPQh6EuMXUwilelr+7HfzF"
+    "rtivJ9MhizWuYMiqQxj1JfCWpZShLNGbVKH9A0vrQhf9DTShi75QD8JZNJDkuwSGcflGwr"
+    "cTzfyrCTyOjBVDmBBIDGMMTbRSMfMYji2fD2FSnoHQqOkiBb0R+vpX96x/2b/qXfSv2rgN"
+    "GM045bIA1FCDzOK1dFQtcN1oTbYhaDTR6SKH2LkcahHBiSIGtBJohYVPFCnHhc8GfCmz6M"
+    "uQyHXfBus+6fw7Ch+RdP4daccWGCpL2RUYsioNDE1xumATDhe1obEQyt8M0ZuE8CF4P5TC"
+    "P3e7vd5lt9O7uDrvX16eX3UScZzPKpLLw/GvWDRT/C7wwdBg55H+YLsQMeHvcE3QHqP3Bp"
+    "bG038j09+j1zQfSxsbi18SO2CWgVDzUKNg6MW6HjxcD25GCndwV4BcNoyruegx0xYfwU08"
+    "f8D3AwsJtf25d2pkuWfcfkhhtd31aUKxSydGxhHK8WLQblKxG8Ogy8nYyib7LKR6dRSrcK"
+    "leHWnH5h39Ni+0EqkHIytY5ZZeVMfGpAfWE5TPQad/puPPXqdFvkD4J/3d75FPSLL7YQYk"
+    "n3OSooV0GvkzD/88Zcpekc9eShFW3r/KPOg8rCJDTD+C/L7MpHczFXUzVYTln5Qyyk+ve3"
+    "mRqDv4T5GC83A7mEzy1kfUza6v8r3OYmFIU+1Wz663VKSUwbKhjjHJHsMcy66v9hbqKM0/"
+    "VTBhvKCar0sbgXKkzfLH7MESdHA72zGDWxszW330+La0su3bysafSyXzccQDBeDDaNa6e5"
+    "xMiuyUO7VKYRsdzx4V2e4KLFGxgXCnRqgfStqQaKcaLgG/O0iWeyQEPSKKGhDVHHORQgqj"
+    "9yN/CJtmKnSBa/jrKmtkBsvSNnU09yTBxzh550+Lp7ttHiSNf9L4J21E0vh3uh0rN1bvIv"
+    "T4WwAsH8vcHI5C5S9Lsj/r6dkWMFYc6Fi4GX2GhLZg/0UTN6MXTRejv2bUTJGLcExmi8n0"
+    "7te4OBv2SGP7grSRJWei/mDaQIBrSsJA+oRp6qyr8FC9mT4OJ6PWx/vR9fhhHMWQJrMuya"
+    "StjvejwYTdsA7MgDMz3kDNWAGTj2JCw4q5kOh9RNw4OBGMt4PJu7NOu8uYa2Nu7XfYSTFS"
+    "Q0qIlpSikbtazjsbSJbzjlCwnOcgDCN4VtDyVRd+Cwy3tE9BUIN0MdBA+2DBCQsauC5YC1"
+    "ZBEQEDJA6yryWn/jNnfvrCnm3iqZhjHKc00zGUktloYGNsVM+0OUJaPD/mCOU0GXOqFrjl"
+    "Ha4UneRSxneI2HABObOi2GWYUjTLn1WZThNtjVT1wAVzwyynEfKJTxRJPGO8CcU84ckiuD"
+    "A0dW5bQZkxzFDtzzKxxYFbO0EOmKrj2g50fYM3CYp3Y/Kp5cbM9j9vzIw3LFCOpRz0Yr+M"
+    "iP4ET9uTMVNvRY7n3CyBoID8BFmQ8dvml+YFoVF52mZJ8cNGSLE8yDEElw76KXH6Y32jVg"
+    "SDUxC7ImDmCtBsfPhPfnxugKGMQds2Bi23wJEjO4JStPSrVVgafTIoJz4td3SoOFDNyRWV"
+    "pz/KYCoZTFXDmBsZTHWkHXuMOyk/Tgb/G93/0up8tm4HDzP88+yzNf3zDv8igO91Q6K0Y2"
+    "yxAVEe/XOce5JqrNLITUk7VwgPo7tkj/DnaC7MCf9ivSV7q0D1akvRPpsMa2aWx3vbTlI0"
+    "7W4640Y8s53y05Tptl2gGSG24h1RIAQ4Kd8wqVaZTzMcdiUQSwlOFjIIvHIXpaUUjQzM2s"
+    "nWiNO2YTREtY2bXWi0QELaLq9RZKmkD6/gCImDa7pN9TNLRbdqtpSKbsWKLpkEpd+Ylga1"
+    "9RjXF74i+8ChnZuENzmWgZhnxSaBeE6p2oMZgoRrJ6/E+i+ZMzNidWefR0xIm0CFNoHT1j"
+    "SOxqkmvaVH2rE5b6m83FJebikvt6wVfPJyy5piKC+3lJdb7g05ebllKcTk5ZbyckshhPte"
+    "9yXmjhLyNkuzI5FbtcWBkri97gYCt9cVylucxQxpfWVwrI7FR+3ENDs7SSIHYlkz2UEOkm"
+    "hE6MGBt5/nPC5iGy59QgfZ67LljWZldgDVyCNDMRm5QQx6amTK2w4Q+tqyuoqUzQBxoQaN"
+    "Z4lI7LE7xQsAqSVYdt/Ylkjktqs1dPKIYlLRfGpxTzwqgwkTCNtMJskG6e4VjzpxyC6dpQ"
+    "PoGtpS4bhLo5x2kcMUpGVqc1XmEfkxt1R3xR7KZ7RU4x53LFbNMiTyvO1UPUNDowSIUfFm"
+    "AnjW2eS8RFRKCCDJY4INbcvn2kbFhpgMSQWGmHrF4lZmiSmhx1UvXl7/D1QAZhg="
+)
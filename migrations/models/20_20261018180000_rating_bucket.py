@@ -0,0 +1,79 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "rating_bucket" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "window" VARCHAR(16) NOT NULL,
+    "period_start" DATE NOT NULL,
+    "total" INT NOT NULL DEFAULT 0,
+    "user_id" BIGINT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_rating_buck_window_5494c1" UNIQUE ("window", "period_start", "user_id")
+);
+CREATE INDEX IF NOT EXISTS "idx_rating_buck_window_7727bc" ON "rating_bucket" ("window", "period_start", "total", "user_id");
+COMMENT ON COLUMN "rating_bucket"."window" IS 'ALL: all\nWEEK: week\nMONTH: month\nSEMESTER: semester';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "rating_bucket";"""
+
+
+MODELS_STATE = (
+    "eJztXVtv2zgW/iuGnrqAt3Bs5zLBYgEndafeOnGRONvZaQqBlhhbiCy5EpU0KPLfl6SupE"
+    "jVim+SzZfEInko6eMRz5XkL23umtD231+C+QJYU0c7b/zSHDCH+EeurtnQwGKR1pACBCY2"
+    "bWxkW0185AED4fIHYPsQF5nQNzxrgSyX3MMJbJsUugZuaDnTtChwrB8B1JE7hWgGPVzx7T"
+    "suthwT/oR+fLl41B8saJvM41omuTct19HLgpbd3Q0+fKQtye0muuHawdxJWy9e0Mx1kuZB"
+    "YJnvCQ2pm0IHegBBM/Ma5CmjN46LwifGBcgLYPKoZlpgwgcQ2AQM7V8PgWMQDBr0TuRP99"
+    "9aCXgM1yHQWg4iWPx6Dd8qfWdaqpFbXX7q3bzrnPyDvqXro6lHKyki2islBAiEpBTXFEjD"
+    "g+S1dYDygH7ANciaQzGoLCUHrhmRvo9/vAXkuCBFOeWwGOYYvrdhquF3MEeO/RKNYAHG48"
+    "FV/3bcu/pC3mTu+z9sClFv3Cc1bVr6wpW+C4fExd9H+OEknTS+DsafGuSy8ffous8PXNJu"
+    "/LdGngkEyNUd91kHZobZ4tIYGNwyHdhgYb5xYFlKNbA7Hdjo4dNxRRayYX5IL2fAEw9nQs"
+    "CNJIaromM3Bz91GzpTNMOX7ePjgsH7b++GTn64FTci11FVO6x7ZUDMPlkJKDmy7QGqrSA3"
+    "WDiPWu3OEniSZlJAw0oWUcsQQVkgkg0hhmWEcvSxbJEzVxHBKVRP0LNwFwIN5sJ1bQgcMW"
+    "JZMg61CabbFOu1NgLXxWg0ZObbi8GYY7e7q4s+ZkSKKG5kIVo8uB5jOIle+PCYUWhIwQQY"
+    "j8/AM3WmJqPq4O8aK6rQ8wXIR7QfP99AG0g+8FhHjvup5vT5GjNOXCqSIpbzZCH6niuCMU"
+    "g6qjEasT2jYyabrwoI7qLGUCyAhyzDWqyDN75k+6oxJviRcR86fIKEaiVIbmhXfdJTlSVc"
+    "Hg8ywbptVzbl5qvm7TlfAhwwpU9N7k3ulJtQRR6J7Gxb4JJgmq3VJ/FNC/yw38Tv8V35KT"
+    "aiJMn9FKQiD+V/bkfXElU9as+Beefgt/lmWgZqNmzLR9+r/BWKICRvzChOsVr+7qr3F6+x"
+    "Xw5HFzzWpIML3hwiqM+APytlDGWJ3mQKbR9Y1hY66S5hCZ10pXYQqWKBpP9LYBi3ryV8G7"
+    "HMH23gC2SsHMKEQGEYY2hjTcXOYzhwkBjCpD0HoVVRJQU/Ef73z/ZR97R71jnpnjXJOxA0"
+    "45LTAlBDCzKL12yhG4HnRTrZkqCxRIeLHGbncqhFBAeKGDBKoBU2PlCkFh58suBzGaUvQ6"
+    "L0viX0PhX824sYkQr+7enAFjgqS/kVOLJ1OhjqEnQhLhwhahfWVCp/M0RvEsK74P1QCv/R"
+    "bnc6p+1W5+TsuHt6enzWSsRxvqpILl8M/iSimeF3SQyGBTuP9EfXg5gJP8MXivYAPzdwDJ"
+    "H9G7n+7vy6xViaxFn8nPgBswyEXw+/FAyjWJe928veh74m/LjXgFw2jau+6HHTlhjBZSJ/"
+    "AKHAwUJte+GdCnnuubAfNlhd7+UwodhkECMTCBVEMdgwqTyMYbHtVG5lnWMWyrzaCy1cmV"
+    "d7OrD5QL8rSq3E5kHfCeY51YsZ2Jh0x3aCdh+0ukcm+dtpNeg/EF6kv7sd+hfS6m5YAenf"
+    "CS0xQjqDXkzCi4dM2zP6t5NShJ13zzI3Og67yBCzt6C/TzPl7UxH7UwXYfsHrYzx02mfni"
+    "TmDrkoMnBur3rDYd77iIfZQ7o46iwXhizVZu3saktFxhgsm+oYk2wxzbGsfrW1VEfl/lkH"
+    "E8YK1eSltBMoR1qveMwWPEE797PtM7iVcbNVx45vKi/btr1s4rlUMZ9APDAA3vbHjeu74b"
+    "DIT7lRrxTx0Yn8UZHvrsATFTsIN+qE+qWlLxKtVCMt4M8FluU+TUGPiKIXiHqOuUijjfHz"
+    "0QvKppkOPeBZ6GWdPXIfy8y1TTz3JMnHpHjjd4unu1VupJx/yvmnfETK+Xe4A6sWVm8i9f"
+    "hHABxEZG4OR6nxlyXZnvf0aAUY15zoWLgYfYyFtmT9RR0XoxdNF/2/xsxMkctwTGaL4ej6"
+    "z7g5n/bIYvuMrZGZYKL+aLtAgmtKwkH6QGiqbKuIUP0wursY9htfbvqXg9tBlEOazLq0kv"
+    "U63vR7Q37BOrADwcz4ARrWHNhiFBMaXsyFRO8j4trBiWG86g3fHbWabc5dG3Nrt8VPipEZ"
+    "UkK0pBS1XNVy3FpCshy3pILlOAdhmMEzhw7SPfgjsLzSMQVJDyrEwAKNwFSQFtTzPPAi0Y"
+    "IiAg5IkmRfSU79PWd++87vbeLrhGMWi9JMx1EqZmOBjbHRfdsVCGn5/JgjVNNkzKlG4JUP"
+    "uDJ0iku52CFmwykUzIrykGFKUa941tpsmmhppG4GHphYdjmLUEx8oEiSGeNNKOYJDxbBqW"
+    "XoE9cJynzDHNX2PBMrbLi1EeSArS88dwE9ZIkmQflqTDG1WpjZ/P3CzHjBAhNYykEvj8vI"
+    "6A9wtz2VM/VW5ETBzRIISsgPkAW5uG1eNS9IjcrT1kuK7zZDiudBgSO4dNJPid0fq5u1Iv"
+    "k4JbkrEmZeA5q1T//Jf59LYKhy0FbNQcspOOrLjqCUqX6VSktjdwYV5Kfltg6VJ6otck3V"
+    "7o8qmUolU1Uw50YlU+3pwO7jSsovw97/+jfnjda9c9W7HZOfR/fO6Os1+UUB3+qCROXHWG"
+    "EBotr6Zz/XJFXYpFGLkjZuEO7Gdgm38L8IjEeINIHpwtQ3iyyX6FyBSdp0zZbLMx5IN9wO"
+    "E3qWa+p0fTq5pp8pb8cwa0/ktMhFYeLe1heiFE3Yy87VEbetZjbVZaJuFthU6QDns25+r6"
+    "Vl2GO32e8a1pbOG8C2752v/f7n88YzhI9YZRtdjz+dN+aug2b3zm2fKLREcfPhHPqRj6f0"
+    "2VknS+TrHPFKd+bcrBM+X4f/tPIGkJjZeboi86fSgkCYY4vNFz4rMZ5ylgzeJ+0PMmyvFF"
+    "6l8FZQ4d2luhaeuCTV1pIDmX6rrMGk5daWRWeAzXgzldJV1cmiSOnCbCXaUUoKcNK+ZnPy"
+    "2mRZ+NmVQCwlOFjIIPDLnWubUtQyj34jK1kPO+RUk0hE/NqFMSYspN3y+nCWSqVcFez4tf"
+    "PARF3TApWZtm62VGbamuMSdBLcHmwVzqrKSIPKJvhVF76icM6uc9Eobwo8AzHPyl0C8Zyy"
+    "7rBNCBLpnT5SYZgmNXdUIKbCkqlZ4BM4bEtjb3KgVHLbng5sLrlNnUWuziJXZ5FXCj51Fn"
+    "lFMVRnkauzyLeGnDqLvBRi6ixydRa5FMJt632Ju6OEvM3SbEjkrtvjwEjcTnsJgdtpS+Ut"
+    "qeI+aXNuCbyOxTsjxjQb2/grB2JZN9lO9v2qRerBjtMOcxEXuQ+X3VCNLk1e8QDaMgu2Kx"
+    "SRYZiMHvgKfT1y5a0GCHvKbFVFynKAeNCA1pNCJI7YHeJ5zYwKll3mvyISud0Fajp5MAuI"
+    "VsSEX7ZUb0iwiHGEe3aWhyTJDa7nd5PNW94qHlXikE3Gj3vQs4yZJoggRzXNohgySNtU5r"
+    "D3PQrtrugBkAdtn7D2KjywQ26tZkjUiTGpxYo/jRIgRs3rCeBRa5kdv3Er+RLCVm7Pb3xH"
+    "JHQXy31TGZI1+KaqlZ68NudUCdN2/eLl9f8t3tu5"
+)
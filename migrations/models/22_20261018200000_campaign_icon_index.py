@@ -0,0 +1,71 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_campaign_icon_66293b" ON "campaign" ("icon");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_campaign_icon_66293b";"""
+
+
+MODELS_STATE = (
+"eJztXWtv4rga/ison+ZI7IgCvWy1OhK0zA47tIxaembPTkeRSVyIGhImcdqpRv3vazt3x8"
+    "6QEiABf2mJ7ddJHr/xe7X9U1nYOjTd9xdgsQTGzFLOGz8VCywg/pGpazYUsFzGNaQAgalJ"
+    "G2vJVlMXOUBDuPwBmC7ERTp0NcdYIsMm97A80ySFtoYbGtYsLvIs47sHVWTPIJpDB1d8/Y"
+    "aLDUuHP6AbXi4f1QcDmnrqcQ2d3JuWq+hlScvu7oaXH2hLcrupqtmmt7Di1ssXNLetqLnn"
+    "Gfp7QkPqZtCCDkBQT7wGecrgjcMi/4lxAXI8GD2qHhfo8AF4JgFD+ePBszSCQYPeifzp/l"
+    "cpAI9mWwRaw0IEi5+v/lvF70xLFXKri4+9m3edk//Qt7RdNHNoJUVEeaWEAAGflOIaA6k5"
+    "kLy2ClAW0Etcg4wF5IOapmTA1QPS9+GPt4AcFsQoxxwWwhzC9zZMFfwO+tgyX4IRzMF4Mr"
+    "wa3E56V5/Jmyxc97tJIepNBqSmTUtfmNJ3/pDY+PvwP5yok8aX4eRjg1w2/hlfD9iBi9pN"
+    "/lHIMwEP2aplP6tATzBbWBoCg1vGA+st9TcObJpSDuxOBzZ4+HhckYFMmB3Sizlw+MMZET"
+    "AjieGq6NgtwA/VhNYMzfFl+/g4Z/D+17uhkx9uxYzIdVDV9uteUyAmn6wAlAzZ9gBV1pAb"
+    "aTiPWu3OCniSZkJA/co0oobGgzJHJGtcDIsI5eBjyQEyI5TXY8x1JHCM1BN0DNwFR4Hp27"
+    "YJgcUHLEnGgDbFdJvivNZG4OqPx6PUdNsfThhuu7vqDzAfUkRxIwPR4uH1BMNJ1MKHx4Q+"
+    "QwqmQHt8Bo6upmoSmg7+rLGeCh2Xg3xA++HTDTSB4PsOVeSwn2rOnq8h44SlPCFiWE8Gou"
+    "+5JhjDqKMaoxGaMypmssW6gOAuagzFEjjI0IxlGbzxOdlXjTHBj4z7UOETJFRrQXJDuxqQ"
+    "nkoRcFvDg0ywdtsWTbnZqkV7wZYAC8zoU5N7kztlJlSeQyI52+Z4JFLNSnVJfFU81+83cn"
+    "t8k26KjShJYjcFqchC+dft+FqgqQftGTDvLPw2X3VDQ82GabjoW5W/Qh6E5I1TilOolb+7"
+    "6v3NKuwXo3GfxZp00GetIYL6HLjzQrZQkuhNltD2gU2bQifdFQyhk67QDCJVaSDp/wIYhu"
+    "1rCd9GDPNHE7gcGSuGMCKQGIYYmlhTMbMYDi3EhzBqz0BoVFRJwU+E//3WPuqeds86J92z"
+    "JnkHgmZYcpoDqm9BJvGaL1XNc5xAJ1sRtDTR4SKH2bkYagHBgSIGtAJo+Y0PFKmlA58M+F"
+    "xE6UuQSL1vBb1Pxv72IkQkY397OrA5jspCfgWGrEwHw04nxQJBF+LC4aLWN2ZC+ZsgepMQ"
+    "3gXv+1L493a70zlttzonZ8fd09Pjs1YkjrNVeXK5P/yTiOYUvwtiMGmws0h/sB2ImfATfK"
+    "FoD/FzA0vj2b+B6+/OrVuMpUmcxc+RHzDJQPj18EtBP4p10bu96F0OFO7HXQJyySyu+qLH"
+    "TFt8BFeJ/AGEPAsLte2FdyrkuWfCfthgtZ2Xw4Rik0GMRCCUE8VIh0nFYQwj3U6mVtY5Zi"
+    "HNq73QwqV5tacDmw3027zMSmweDCxvkVG9UgMbku7YTlDuvVb3SCd/O60G/Qf8i/h3t0P/"
+    "Qlrd9Ssg/TulJZpPp9GLqX/xkGh7Rv92Ygq/8+5Z4kbHfhcJ4vQt6O/TRHk70VE70YXf/k"
+    "EpYvx02qcnkblDLvIMnNur3miU9T7iYXaQyo86i4Vhmmqzdna1pWLKGCya6hiSbDHNsah+"
+    "tbVUR+n+KYMJQ4Vq+lLYCZQhrVc8ZgueoJ372fYZ3Mq42apjxzell23bXjb+XCqZjyMeUg"
+    "DeDiaN67vRKM9PuVGvFPHR8fxRge8uxxMVOgg36oT6qcQvEixUIy3gjyWW5S5NQQ+IghcI"
+    "eg65SKGN8fPRC8qmiQ4d4BjopcwemY9lbps6nnui5GNSvPG7hdPdOjeSzj/p/JM+Iun8O9"
+    "yBleuqN5F6/N0DFiIyN4Oj0PhLkmzPe3q0BowlJzrmrkWfYKEtWH9Rx7XoedPF4O9JaqbI"
+    "ZDhGs8VofP1n2JxNe0xj+4ytkTlnov5g2kCAa0zCQPpAaKpsq/BQvRzf9UeDxuebwcXwdh"
+    "jkkEazLq1Mex1vBr0Ru2AdmB5nZryEmrEAJh/FiIYVcz7R+4C4dnBiGK96o3dHrWabcdeG"
+    "3NptsZNiYIYUEC0xRS1XtRy3VpAsxy2hYDnOQOhn8CyghVQHfvcMp3BMQdCDDDGkgUZgxk"
+    "kL6jkOeBFoQQEBAyRJsq8kp/6aM79+Y7c2cVXCMctlYaZjKCWzpYENsVFd0+YIafH8mCGU"
+    "02TIqZrnFA+4pugklzKxQ8yGM8iZFcUhw5iiXvGs0myaYGmkqnsOmBpmMYuQT3ygSJIZ40"
+    "0oZgkPFsGZoalT2/KKfMMM1fY8E2tsuLUR5ICpLh17CR1k8CZB8WpMPrVcmNn89cLMcMFC"
+    "KrCUgV4clxHRb3SzvYpm/sicqTcixwtuFkBQQH6ALMjEbbOqeU5qVJa2XlJ8txlSLA9yHM"
+    "GFk34K7P5Y3awVwccpyF0RMHMJaNY+/Sf7fa6AocxBWzcHLaPgyC87gFKk+lUqLS29Mygn"
+    "Py2zdag4UW2ZaSp3f5TJVDKZqoI5NzKZak8Hdh9XUn4e9f4/uDlvtO6tq97thPw8urfGX6"
+    "7JLwr4VhckSj/GGgsQ5dY/+7kmqcImjVyUtHGDcDe2i7+Ff9/THiFSOKZLqr6ZZ7kE5wpM"
+    "46YlWy7PeCBtfztM6Bi2rtL16eSafqasHZNaeyKmRTbyE/e2vhAlb8Jeda4OuG09s6kuE3"
+    "Uzx6aKBzibdfNrLS3BHrvNflewtnTeAKZ5b30ZDD6dN54hfMQq2/h68vG8sbAtNL+3bgdE"
+    "oSWKmwsX0A18PIWPzjpZIV/niFW6E8dmnbD5OuynlTWA+MzO0uWZP5UWBNwcW2y+sFmJ4Z"
+    "SzYvA+an+QYXup8EqFt4IK7y7VNf/EJaG2Fh3I9EtlDUYtt7YsOgFswpspla6qThZ5Shdm"
+    "K96OUkKAo/Y1m5NLk2X+Z1cAsZjgYCGDwC12rG1MUcs8+o2sZD3skFNNIhHha+fGmLCQto"
+    "vrw0kqmXKVs+PXzgMTdU0LlGZa2WwpzbSS4xJ0EtwebBXOqkpIg8om+FUXvrxwzq5z0Shv"
+    "cjwDIc+KXQLhnFJ22MYHifROHyk3TBObOzIQU2HJ1MzxCRy2pbE3OVAyuW1PBzaT3CbPIp"
+    "dnkcuzyCsFnzyLvKIYyrPI5VnkW0NOnkVeCDF5Frk8i1wI4bb1vsjdUUDeJmk2JHLL9jik"
+    "JG6nvYLA7bSF8pZUMZ+0vjA4Xsf8nRFDmo1t/JUBsaibbCf7ftUi9aBCaYdY+UWqCyGH//"
+    "K9HSnCEpwdlZosq+TbEIbLM4EzsSs+vS8eXWG+5jnCRdbdVyiwluJ9em4vdNXAI7seIOnD"
+    "gqvK7KsB4kANGk8SkTDweojHbqc06eRuDWsikdkkoqaTR2od2JqYsKvP6g0JFjEWd+vV4p"
+    "BEKd71/G6S6edbxaNKHLLJNIAedAxtrnASAYKaZl4qAIjbbHJdQKEg/R5F6Ne0UcSx9yes"
+    "vXLPXRE7HRIk8uCf2PGAP40CIAbN6wngUWuVjdtxK/FK0FZm63Z8R8T1+otdjAmSElyM1c"
+    "oyL83HWMC0LV+8vP4LaAFslg=="
+)
@@ -0,0 +1,142 @@
+"""
+Микробенчмарк рендера форматированного текста LSS: utils.rich_text против прежней реализации.
+
+Запуск из корня репозитория:
+    python -m scripts.bench_rich_text path/to/sheet.json [...] [--number 200]
+
+Принимает экспорты Long Story Short (с конвертом или без). Без файлов гоняет синтетическую длинную предысторию.
+Прежняя реализация не экранирует HTML и теряет списки и заголовки, так что сравнение скорее в её пользу.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+from utils.character import extract_sheet
+from utils.rich_text import render_html
+
+
+# === Прежняя реализация (до utils.rich_text), оставлена только для сравнения ===
+def legacy_extract_telegram_text(text_data: dict[str, Any]) -> str:
+    if not text_data:
+        return ""
+
+    content = text_data.get("data", {}).get("content", [])
+    paragraphs = []
+
+    for block in content:
+        if block.get("type") == "paragraph":
+            paragraph_text = legacy_process_paragraph(block.get("content", []))
+            if paragraph_text:
+                paragraphs.append(paragraph_text)
+
+    return "\n".join(paragraphs)
+
+
+def legacy_process_paragraph(items: list[dict[str, Any]]) -> str:
+    result = []
+
+    for item in items:
+        item_type = item.get("type")
+
+        if item_type == "text":
+            html_text = legacy_process_text_item(item)
+            if html_text:
+                result.append(html_text)
+
+        elif item_type == "roller":
+            result.append(f"[{item.get('content', [{}])[0].get('text', '')}]")
+
+    return " ".join(result).strip()
+
+
+def legacy_process_text_item(item: dict[str, Any]) -> str:
+    text = item.get("text", "").strip()
+    if not text:
+        return ""
+
+    for mark in item.get("marks", []):
+        mark_type = mark.get("type")
+        if mark_type == "bold":
+            text = f"<b>{text}</b>"
+        elif mark_type == "italic":
+            text = f"<i>{text}</i>"
+        elif mark_type == "underline":
+            text = f"<u>{text}</u>"
+
+    return text
+
+
+# === Данные ===
+def find_text_values(node: Any) -> list[dict[str, Any]]:
+    """Собирает из листа все значения форматированного текста ({"data": {"type": "doc", ...}})"""
+    found = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            data = current.get("data")
+            if isinstance(data, dict) and data.get("type") == "doc":
+                found.append(current)
+                continue
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return found
+
+
+def synthetic_backstory(paragraphs: int = 200) -> dict[str, Any]:
+    def text(value: str, *marks: str) -> dict[str, Any]:
+        return {"type": "text", "text": value, "marks": [{"type": mark} for mark in marks]}
+
+    content = [
+        {
+            "type": "paragraph",
+            "content": [
+                text(f"Глава {i}. ", "bold"),
+                text("Долгая дорога через горы и долины, где гномы ковали топоры. " * 5),
+                text("Важное ", "italic", "underline"),
+                text("Налог на вход: 5 зм & <печать>. " if i % 10 == 0 else ""),
+                {"type": "roller", "content": [{"type": "text", "text": "1d20+3"}]},
+            ],
+        }
+        for i in range(paragraphs)
+    ]
+    return {"data": {"type": "doc", "content": content}}
+
+
+def load_values(paths: list[Path]) -> list[dict[str, Any]]:
+    if not paths:
+        return [synthetic_backstory()]
+
+    values = []
+    for path in paths:
+        values.extend(find_text_values(extract_sheet(json.loads(path.read_text(encoding="utf-8")))))
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sheets", nargs="*", type=Path, help="JSON-файлы листов Long Story Short")
+    parser.add_argument("--number", type=int, default=200, help="сколько раз прогнать все тексты")
+    args = parser.parse_args()
+
+    values = load_values(args.sheets)
+    size = sum(len(json.dumps(value, ensure_ascii=False)) for value in values)
+    out = sys.stdout
+    out.write(f"Текстов: {len(values)}, объём JSON: {size} символов, прогонов: {args.number}\n")
+
+    candidates = {
+        "legacy": lambda: [legacy_extract_telegram_text(value) for value in values],
+        "rich_text": lambda: [render_html(value.get("data")) for value in values],
+    }
+    for name, func in candidates.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=5))
+        out.write(f"{name:>10}: {best / args.number * 1000:.3f} мс на прогон\n")
+
+
+if __name__ == "__main__":
+    main()
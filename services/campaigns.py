@@ -1,8 +1,7 @@
-from aiogram.enums import ContentType
 from aiogram_dialog import DialogManager
-from aiogram_dialog.api.entities import MediaAttachment
 
 from db.models import Campaign, Participation
+from services.icons import icon_attachment
 from utils.role import Role
 
 
@@ -15,7 +14,7 @@ async def campaign_getter(dialog_manager: DialogManager, **kwargs):
 
     icon = None
     if object_name := campaign.icon:
-        icon = MediaAttachment(type=ContentType.PHOTO, path=f"minio://campaign-icons:{object_name}")
+        icon = icon_attachment(object_name)
 
     return {
         "title": campaign.title,
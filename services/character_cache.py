@@ -0,0 +1,109 @@
+"""
+Кэш распарсенных персонажей (CharacterData).
+
+Запись идентифицируется классом модели, её первичным ключом и updated_at:
+любое сохранение модели сдвигает updated_at, поэтому устаревшая запись просто не совпадёт.
+Первый уровень - LRU в памяти процесса, второй (опциональный) - Redis.
+"""
+
+import json
+import logging
+
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from db.models.base import CharacterData as BaseCharacterData
+from db.redis import get_redis
+from services.settings import settings
+from utils.character import CharacterData
+from utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, str]
+
+
+class CharacterCache:
+    def __init__(self, max_size: int, *, use_redis: bool = False, ttl: int = 0) -> None:
+        self.use_redis = use_redis
+        self.ttl = ttl
+        self._local: LRUCache[CacheKey, tuple[str, CharacterData]] = LRUCache(max_size)
+
+    @staticmethod
+    def _key(holder: BaseCharacterData) -> CacheKey:
+        return type(holder).__name__, str(holder.pk)
+
+    @staticmethod
+    def _stamp(holder: BaseCharacterData) -> str:
+        updated_at = getattr(holder, "updated_at", None)
+        return updated_at.isoformat() if updated_at else ""
+
+    @staticmethod
+    def _redis_key(key: CacheKey) -> str:
+        return f"character:{key[0]}:{key[1]}"
+
+    async def get(self, holder: BaseCharacterData) -> CharacterData | None:
+        key, stamp = self._key(holder), self._stamp(holder)
+
+        cached = self._local.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        if not self.use_redis:
+            return None
+
+        info = await self._get_remote(key, stamp)
+        if info is not None:
+            self._local.set(key, (stamp, info))
+        return info
+
+    async def _get_remote(self, key: CacheKey, stamp: str) -> CharacterData | None:
+        try:
+            raw = await get_redis().get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning("Не удалось прочитать персонажа %s из Redis: %s", key, e)
+            return None
+        if raw is None:
+            return None
+
+        try:
+            payload = json.loads(raw)
+            if payload.get("updated_at") != stamp:
+                return None
+            return CharacterData.model_validate(payload["data"])
+        except (json.JSONDecodeError, KeyError, ValidationError):
+            logger.warning("Повреждённая запись персонажа %s в Redis", key)
+            return None
+
+    async def set(self, holder: BaseCharacterData, info: CharacterData) -> None:
+        key, stamp = self._key(holder), self._stamp(holder)
+        self._local.set(key, (stamp, info))
+
+        if not self.use_redis:
+            return
+
+        payload = json.dumps({"updated_at": stamp, "data": info.model_dump(mode="json", by_alias=True)})
+        try:
+            await get_redis().set(self._redis_key(key), payload, ex=self.ttl or None)
+        except RedisError as e:
+            logger.warning("Не удалось записать персонажа %s в Redis: %s", key, e)
+
+    async def invalidate(self, model: type[BaseCharacterData], pk: object) -> None:
+        """Сбрасывает запись по классу модели и ключу, загружать саму строку для этого не нужно"""
+        key = model.__name__, str(pk)
+        self._local.pop(key)
+
+        if not self.use_redis:
+            return
+
+        try:
+            await get_redis().delete(self._redis_key(key))
+        except RedisError as e:
+            logger.warning("Не удалось удалить персонажа %s из Redis: %s", key, e)
+
+
+character_cache = CharacterCache(
+    settings.CHARACTER_CACHE_SIZE,
+    use_redis=settings.CHARACTER_CACHE_REDIS,
+    ttl=settings.CHARACTER_CACHE_TTL,
+)
@@ -1,32 +1,196 @@
+import json
 import logging
+from collections.abc import Sequence
+from typing import Any
 
 from aiogram.enums import ContentType
 from aiogram_dialog.api.entities import MediaAttachment
+from tortoise import connections
 
+from db.models import User
 from db.models.base import CharacterData as BaseCharacterData
-from db.models.character import Character
-from db.models.user import User
-from utils.character import CharacterData, parse_character_data
+from exceptions.character import InvalidCharacterPatchError
+from services.character_cache import character_cache
+from services.user_cache import user_cache
+from utils.character import PREVIEW_VERSION, CharacterData, parse_character_data, sheet_hash
 
 logger = logging.getLogger(__name__)
 
 
-async def update_char_data(holder: BaseCharacterData, data: dict):
+async def _invalidate_holder(model: type[BaseCharacterData], pk: object) -> None:
+    # Строка пользователя могла попасть в кэш UserMiddleware
+    if model is User:
+        await user_cache.invalidate(pk)
+
+
+async def _load_deferred(holder: BaseCharacterData, field: str) -> Any:
+    # Модель могла быть получена без этого поля (лёгкая запись из кэша пользователей): догружаем одним
+    # запросом и оставляем в модели
+    if field not in holder.__dict__:
+        setattr(holder, field, await type(holder).filter(pk=holder.pk).first().values_list(field, flat=True))
+    return getattr(holder, field)
+
+
+async def get_sheet(holder: BaseCharacterData) -> dict | None:
+    """Лист персонажа; читать его нужно так, а не через holder.data (у лёгкой модели поля нет)"""
+    return await _load_deferred(holder, "data")
+
+
+async def has_sheet(holder: BaseCharacterData) -> bool:
+    """Загружен ли лист персонажа; сам лист при этом не читается"""
+    if "data" in holder.__dict__:
+        return holder.data is not None
+    # Хэш и имя есть в лёгкой записи; хэш сбрасывает patch_char_data, имени в листе может не быть
+    if holder.data_hash is not None or holder.name is not None:
+        return True
+    return await type(holder).filter(pk=holder.pk, data__isnull=False).exists()
+
+
+async def get_preview(holder: BaseCharacterData) -> dict | None:
+    """Сохранённые превью персонажа; читать их нужно так, а не через holder.preview (у лёгкой модели поля нет)"""
+    return await _load_deferred(holder, "preview")
+
+
+async def update_char_data(holder: BaseCharacterData, data: dict, info: CharacterData | None = None) -> bool:
+    """Сохраняет лист персонажа. Возвращает False, если ровно такой же лист уже сохранён"""
+    data_hash = sheet_hash(data)
+    if holder.data_hash == data_hash:
+        return False
+
+    if info is None:
+        info = parse_character_data(data)
+
     holder.data = data
-    await holder.save()
+    holder.data_hash = data_hash
+    summary = info.summary()
+    for field, value in summary.items():
+        setattr(holder, field, value)
+    holder.preview = info.rendered_previews()
+    # Явный список полей: так сохраняется и частичная модель из кэша пользователей
+    await holder.save(update_fields=["data", "data_hash", *summary, "preview", "updated_at"])
+    await character_cache.set(holder, info)
+    await _invalidate_holder(type(holder), holder.pk)
+    return True
+
+
+# Колонки сводки, допустимые в патче листа
+SUMMARY_FIELDS = frozenset(("name", "klass", "level", "hp_current", "hp_max", "ac"))
+
+
+def _jsonb_set_expr(path: Sequence[str], value: Any, params: list[Any]) -> str:
+    """
+    Собирает выражение, записывающее значение по пути в JSONB-колонку data, параметры дописываются в params.
+
+    Обычный jsonb_set не создаёт промежуточные объекты, поэтому каждый уровень
+    пути оборачивается в свой jsonb_set поверх COALESCE с пустым объектом.
+    """
+    keys = []
+    docs = ["COALESCE(\"data\", '{}'::JSONB)"]
+    for part in path:
+        params.append(part)
+        keys.append(f"ARRAY[${len(params)}::TEXT]")
+        docs.append(f"COALESCE({docs[-1]}->${len(params)}::TEXT, '{{}}'::JSONB)")
+
+    params.append(json.dumps(value, ensure_ascii=False))
+    expr = f"${len(params)}::JSONB"
+    for doc, key in zip(reversed(docs[:-1]), reversed(keys), strict=True):
+        expr = f"jsonb_set({doc}, {key}, {expr})"
+    return expr
 
 
-def character_preview_getter(user: User | Character, data: dict, *, light: bool = False):
+async def patch_char_data(
+    model: type[BaseCharacterData],
+    pk: object,
+    path: Sequence[str],
+    value: Any,
+    **summary: Any,
+) -> bool:
+    """
+    Точечно меняет одно поле листа персонажа прямо в БД, не загружая и не переписывая документ целиком.
+
+    path - путь в документе LSS, например ("info", "level", "value"), недостающие объекты создаются.
+    summary - колонки сводки, которые меняются вместе с полем (например level=5).
+    Возвращает False, если строки с таким ключом нет.
+    """
+    unknown = summary.keys() - SUMMARY_FIELDS
+    if not path or unknown:
+        raise InvalidCharacterPatchError(path, unknown)
+
+    params: list[Any] = []
+    data_expr = _jsonb_set_expr(path, value, params)
+
+    # Хэш сбрасываем: канонический JSON считается только в Python, пересчитается при следующей загрузке.
+    # Превью тоже сбрасываем, оно перестроится при первом показе персонажа
+    assignments = [f'"data" = {data_expr}', '"data_hash" = NULL', '"preview" = NULL', '"updated_at" = NOW()']
+    for field, field_value in summary.items():
+        params.append(field_value)
+        assignments.append(f'"{field}" = ${len(params)}')
+    params.append(pk)
+
+    table = model._meta.db_table  # noqa: SLF001
+    query = f'UPDATE "{table}" SET {", ".join(assignments)} WHERE "id" = ${len(params)} RETURNING "id"'  # noqa: S608
+    rows_count, _ = await connections.get("default").execute_query(query, params)
+
+    await character_cache.invalidate(model, pk)
+    await _invalidate_holder(model, pk)
+    return rows_count > 0
+
+
+async def get_character_data(holder: BaseCharacterData) -> CharacterData | None:
+    """Возвращает распарсенного персонажа, по возможности из кэша"""
+    data = await get_sheet(holder)
+    if not data:
+        return None
+
+    info = await character_cache.get(holder)
+    if info is None:
+        info = parse_character_data(data)
+        await character_cache.set(holder, info)
+    return info
+
+
+async def get_rendered_previews(holder: BaseCharacterData) -> dict[str, Any] | None:
+    """
+    Возвращает сохранённые превью персонажа, перестраивая их, если их нет или сменилась версия разметки.
+
+    Перестроенные превью записываются отдельным UPDATE без сдвига updated_at, чтобы не сбросить кэш персонажей.
+    Запись идёт, только если лист с тех пор не менялся (тот же updated_at): иначе превью старого листа
+    с текущей версией разметки уже никогда бы не перестроилось.
+    """
+    preview = await get_preview(holder)
+    if isinstance(preview, dict) and preview.get("version") == PREVIEW_VERSION:
+        return preview
+
+    info = await get_character_data(holder)
+    if info is None:
+        return None
+
+    holder.preview = info.rendered_previews()
+    updated = (
+        await type(holder)
+        .filter(pk=holder.pk, updated_at=getattr(holder, "updated_at", None))
+        .update(preview=holder.preview)
+    )
+    if updated:
+        await _invalidate_holder(type(holder), holder.pk)
+    else:
+        logger.debug("Лист %s %s изменился, превью не сохранено", type(holder).__name__, holder.pk)
+    return holder.preview
+
+
+async def character_preview_getter(holder: BaseCharacterData, *, light: bool = False):
     ret = {}
-    info: CharacterData = parse_character_data(data)
-    ret["character_data_preview"] = info.light_preview() if light else info.preview()
-    avatar_url = data.get("avatar", {}).get("webp")
-    if avatar_url:
+    preview = await get_rendered_previews(holder)
+    if preview is None:
+        return ret
+
+    ret["character_data_preview"] = preview["light"] if light else preview["full"]
+    if preview["avatar"]:
         ret["avatar"] = MediaAttachment(
-            url=avatar_url,
+            url=preview["avatar"],
             type=ContentType.PHOTO,
         )
     else:
-        logger.warning("No avatar for user %d", user.id)
+        logger.warning("No avatar for %s %s", type(holder).__name__, holder.pk)
 
     return ret
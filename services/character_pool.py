@@ -0,0 +1,66 @@
+"""
+Массовый разбор листов персонажей вне event loop.
+
+Сейчас пачками разбираются только листы без сводки в списке персонажей кампании (fill_missing_summaries):
+сам список читает колонки-сводку, а выгрузка JSON отдаёт лист как есть, без разбора. Большие пачки уходят
+в пул процессов, маленькие - в поток: запускать процессы ради пары листов дороже самого разбора.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cache
+from itertools import chain
+
+from services.settings import settings
+from utils.character import CharacterData, parse_character_batch
+
+logger = logging.getLogger(__name__)
+
+
+@cache
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Пул процессов для разбора листов, создаётся при первой большой пачке"""
+
+    logger.info("Пул разбора персонажей запущен (%d процессов)", settings.CHARACTER_PARSE_WORKERS)
+    # Процессы запускаются через spawn: форк процесса, где крутится event loop, небезопасен
+    return ProcessPoolExecutor(
+        max_workers=settings.CHARACTER_PARSE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+async def parse_characters(sheets: Sequence[dict | None]) -> list[CharacterData | None]:
+    """
+    Разбирает листы, сохраняя порядок. Пустой или битый лист даёт None, остальные разбираются как обычно.
+    """
+    batch = list(sheets)
+    if len(batch) < settings.CHARACTER_PARSE_PROCESS_THRESHOLD:
+        return await asyncio.to_thread(parse_character_batch, batch)
+
+    size = settings.CHARACTER_PARSE_CHUNK_SIZE
+    chunks = [batch[i : i + size] for i in range(0, len(batch), size)]
+    loop = asyncio.get_running_loop()
+    try:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(get_parse_pool(), parse_character_batch, chunk) for chunk in chunks)
+        )
+    except BrokenProcessPool:
+        logger.exception("Пул разбора персонажей упал, разбираем в потоке")
+        await close_parse_pool()
+        return await asyncio.to_thread(parse_character_batch, batch)
+    return list(chain.from_iterable(results))
+
+
+async def close_parse_pool() -> None:
+    """Останавливаем пул разбора персонажей, если он запускался"""
+
+    if get_parse_pool.cache_info().currsize == 0:
+        return
+    pool = get_parse_pool()
+    get_parse_pool.cache_clear()
+    await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+    logger.info("Пул разбора персонажей остановлен")
@@ -0,0 +1,223 @@
+"""
+Иконки кампаний: приём картинки из Telegram, нормализация и хранение в MinIO.
+
+Картинка сжимается в пуле потоков (Pillow отпускает GIL на декодировании, масштабировании и кодировании),
+в MinIO кладутся иконка и миниатюра с content-type; иконка сразу попадает в кэш utils.minio.media_cache.
+
+Имя объекта - UUID из sha256 присланного файла: одна и та же картинка для разных кампаний хранится,
+кэшируется и загружается в Telegram один раз. Ссылки на иконку - кампании с таким Campaign.icon
+и загрузки из незавершённых диалогов: каждая отмечается в Redis своим владельцем (id контекста диалога)
+и живёт ICON_PENDING_TTL, чтобы брошенный диалог не держал иконку вечно. Когда ссылок не остаётся,
+release_icon удаляет объекты и забывает их в кэшах. Диалог снимает свою отметку через discard_icon,
+а перед сохранением кампании проверяет icon_stored: отметка могла истечь, а Redis - быть недоступен.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from io import BytesIO
+
+from aiogram import Bot
+from aiogram.enums import ContentType
+from aiogram.types import PhotoSize
+from aiogram_dialog.api.entities import MediaAttachment
+from minio.error import S3Error
+from redis.exceptions import RedisError
+from urllib3.exceptions import HTTPError
+
+from db.minio import get_minio
+from db.models import Campaign
+from db.redis import get_redis
+from services.media_file_ids import forget_sources
+from services.settings import settings
+from utils.images import EncodedImage, ImageLimits, NormalizedIcon, normalize_icon
+from utils.minio import media_cache
+
+logger = logging.getLogger(__name__)
+
+ICON_BUCKET = "campaign-icons"
+# Загрузки из незавершённых диалогов: sorted set владельцев, score - время истечения отметки
+PENDING_KEY_PREFIX = "icon:pending"
+ICON_LIMITS = ImageLimits(settings.ICON_MAX_SIDE, settings.ICON_MAX_BYTES)
+THUMBNAIL_LIMITS = ImageLimits(settings.ICON_THUMBNAIL_SIDE, settings.ICON_THUMBNAIL_MAX_BYTES)
+
+
+@cache
+def get_image_pool() -> ThreadPoolExecutor:
+    """Пул потоков для обработки картинок, создаётся при первой загрузке"""
+
+    return ThreadPoolExecutor(max_workers=settings.IMAGE_WORKERS, thread_name_prefix="image")
+
+
+async def close_image_pool() -> None:
+    """Останавливаем пул обработки картинок, если он запускался"""
+
+    if get_image_pool.cache_info().currsize == 0:
+        return
+    pool = get_image_pool()
+    get_image_pool.cache_clear()
+    await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+    logger.info("Пул обработки картинок остановлен")
+
+
+def icon_name(data: bytes) -> str:
+    """Имя объекта иконки по содержимому присланного файла"""
+    return str(uuid.UUID(bytes=hashlib.sha256(data).digest()[:16]))
+
+
+def thumbnail_name(object_name: str) -> str:
+    return f"{object_name}.thumb"
+
+
+def _icon_path(name: str) -> str:
+    return f"minio://{ICON_BUCKET}:{name}"
+
+
+def icon_attachment(object_name: str, *, thumbnail: bool = False) -> MediaAttachment:
+    """Вложение для показа иконки через MinioMessageManager"""
+    name = thumbnail_name(object_name) if thumbnail else object_name
+    return MediaAttachment(type=ContentType.PHOTO, path=_icon_path(name))
+
+
+def _put(object_name: str, image: EncodedImage) -> None:
+    get_minio().put_object(
+        ICON_BUCKET,
+        object_name,
+        BytesIO(image.data),
+        len(image.data),
+        content_type=image.content_type,
+        metadata={"width": str(image.width), "height": str(image.height)},
+    )
+
+
+def _put_icon(object_name: str, normalized: NormalizedIcon) -> None:
+    # Миниатюра пишется последней: по ней _icon_exists понимает, что иконка сохранена целиком
+    _put(object_name, normalized.icon)
+    _put(thumbnail_name(object_name), normalized.thumbnail)
+
+
+def _icon_exists(object_name: str) -> bool:
+    try:
+        get_minio().stat_object(ICON_BUCKET, thumbnail_name(object_name))
+    except S3Error as e:
+        if e.code == "NoSuchKey":
+            return False
+        raise
+    return True
+
+
+def _remove_icon(object_name: str) -> None:
+    get_minio().remove_object(ICON_BUCKET, object_name)
+    get_minio().remove_object(ICON_BUCKET, thumbnail_name(object_name))
+
+
+def _pending_key(object_name: str) -> str:
+    return f"{PENDING_KEY_PREFIX}:{object_name}"
+
+
+async def _hold(object_name: str, owner: str) -> None:
+    key = _pending_key(object_name)
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.zadd(key, {owner: time.time() + settings.ICON_PENDING_TTL})
+            pipe.expire(key, settings.ICON_PENDING_TTL)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Не удалось отметить загрузку иконки %s в Redis: %s", object_name, e)
+
+
+async def _unhold(object_name: str, owner: str) -> None:
+    try:
+        await get_redis().zrem(_pending_key(object_name), owner)
+    except RedisError as e:
+        logger.warning("Не удалось снять отметку загрузки иконки %s в Redis: %s", object_name, e)
+
+
+async def _is_pending(object_name: str) -> bool:
+    # Без Redis неизвестно, держит ли иконку чей-то диалог, поэтому она считается занятой
+    key = _pending_key(object_name)
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(key, "-inf", time.time())
+            pipe.zcard(key)
+            _, holders = await pipe.execute()
+    except RedisError as e:
+        logger.warning("Не удалось проверить загрузки иконки %s в Redis: %s", object_name, e)
+        return True
+    return holders > 0
+
+
+async def icon_stored(object_name: str) -> bool:
+    """Проверяет, что иконка всё ещё лежит в MinIO (перед тем как сослаться на неё из кампании)"""
+    return await asyncio.to_thread(_icon_exists, object_name)
+
+
+async def upload_icon(bot: Bot, photo: PhotoSize, owner: str) -> str:
+    """
+    Скачивает фото из Telegram, нормализует и сохраняет в MinIO. Возвращает имя объекта иконки.
+
+    owner - id контекста диалога: пока он не вызовет discard_icon (или не истечёт ICON_PENDING_TTL),
+    release_icon эту иконку не удалит.
+    InvalidImageError - файл не удалось прочитать как картинку.
+    """
+    file = await bot.get_file(photo.file_id)
+    stream = await bot.download_file(file.file_path or "")
+    data = stream.getvalue() if stream is not None else b""
+
+    object_name = icon_name(data)
+    # Отметка ставится до проверки: иначе release_icon может удалить найденную иконку между ними
+    await _hold(object_name, owner)
+    if await icon_stored(object_name):
+        logger.info("Иконка %s уже есть в хранилище", object_name)
+        return object_name
+
+    loop = asyncio.get_running_loop()
+    normalized = await loop.run_in_executor(
+        get_image_pool(), normalize_icon, data, ICON_LIMITS, THUMBNAIL_LIMITS, settings.ICON_MAX_PIXELS
+    )
+
+    await asyncio.to_thread(_put_icon, object_name, normalized)
+    media_cache.set((ICON_BUCKET, object_name), normalized.icon.data)
+    logger.info(
+        "Иконка %s сохранена: %d -> %d байт (%dx%d)",
+        object_name,
+        len(data),
+        len(normalized.icon.data),
+        normalized.icon.width,
+        normalized.icon.height,
+    )
+    return object_name
+
+
+async def discard_icon(object_name: str | None, owner: str) -> None:
+    """Снимает отметку загрузки диалога owner и удаляет иконку, если она больше никому не нужна"""
+    if object_name is None:
+        return
+    await _unhold(object_name, owner)
+    await release_icon(object_name)
+
+
+async def release_icon(object_name: str | uuid.UUID | None) -> None:
+    """Удаляет иконку из MinIO и кэшей, если на неё не ссылается ни одна кампания и ни один открытый диалог"""
+    if object_name is None or await Campaign.filter(icon=object_name).exists():
+        return
+
+    name = str(object_name)
+    if await _is_pending(name):
+        logger.info("Иконка %s не удалена: она загружена в незавершённом диалоге", name)
+        return
+    try:
+        await asyncio.to_thread(_remove_icon, name)
+    except (S3Error, HTTPError):
+        logger.exception("Не удалось удалить иконку %s", name)
+        return
+
+    names = (name, thumbnail_name(name))
+    for stored in names:
+        media_cache.pop((ICON_BUCKET, stored))
+    await forget_sources(*(_icon_path(stored) for stored in names))
+    logger.info("Иконка %s удалена: на неё не ссылается ни одна кампания", name)
@@ -0,0 +1,125 @@
+"""
+Наблюдение за event loop: задержка и зависания из-за синхронных вызовов.
+
+Оба бота работают в одном event loop, так что любой блокирующий вызов (MinIO, разбор листа, Pillow)
+останавливает всех пользователей. Задача-пульс в loop каждые interval секунд отмечает, что loop жив,
+и пишет в метрики, насколько позже срока она проснулась. Сторожевой поток проверяет пульс; если loop молчит
+дольше threshold, он снимает стек потока loop и пишет его в лог вместе с задачей и тегом апдейта,
+который сейчас обрабатывается (пока зависание длится, снимается до max_samples стеков).
+Расходы в обычной работе - одно пробуждение задачи и потока на интервал.
+"""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from services.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+from services.query_stats import update_tag
+from services.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STACK_LIMIT = 25  # кадров стека в отчёте, считая от самого глубокого
+
+
+class LoopMonitor:
+    def __init__(self, interval: float, threshold: float, max_samples: int) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.max_samples = max_samples
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._beat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # === Пульс (в event loop) ===
+    async def _heartbeat(self) -> None:
+        while True:
+            planned = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - planned)
+            EVENT_LOOP_LAG.observe(lag)
+            self._beat = now
+            if lag >= self.threshold:
+                logger.warning("Event loop был заблокирован %.3f с", lag)
+
+    # === Сторож (в своём потоке) ===
+    def _describe_current(self) -> str:
+        loop = self._loop
+        task = asyncio.current_task(loop) if loop is not None else None
+        if task is None:
+            return "вне задачи (колбэк loop)"
+        coro = task.get_coro()
+        name = getattr(coro, "__qualname__", task.get_name())
+        tag = update_tag(task.get_context())
+        return f"задача {name}, апдейт {tag}" if tag else f"задача {name}"
+
+    def _sample(self, silent: float, number: int) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT)) if frame is not None else "нет стека\n"
+        logger.warning(
+            "Event loop не отвечает %.3f с (снимок %d из %d), %s:\n%s",
+            silent,
+            number,
+            self.max_samples,
+            self._describe_current(),
+            stack.rstrip(),
+        )
+
+    def _watch(self) -> None:
+        stalled = False
+        samples = 0
+        next_sample = 0.0
+        while not self._stop.wait(self.interval):
+            # Пульс в норме приходит раз в interval, молчание сверх этого - задержка loop
+            silent = time.monotonic() - self._beat - self.interval
+            if silent < self.threshold:
+                stalled = False
+                continue
+
+            if not stalled:
+                stalled, samples, next_sample = True, 0, silent
+                EVENT_LOOP_STALLS.inc()
+            if samples < self.max_samples and silent >= next_sample:
+                samples += 1
+                # Следующие снимки всё реже: при долгом зависании стек обычно не меняется
+                next_sample = silent * 2
+                self._sample(silent, samples)
+
+    # === Запуск и остановка ===
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-monitor")
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+        logger.info("Наблюдение за event loop запущено (порог %.3f с)", self.threshold)
+
+    async def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+loop_monitor = LoopMonitor(
+    settings.LOOP_MONITOR_INTERVAL,
+    settings.LOOP_MONITOR_THRESHOLD,
+    settings.LOOP_MONITOR_MAX_SAMPLES,
+)
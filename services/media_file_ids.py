@@ -0,0 +1,72 @@
+"""
+file_id, выданные Telegram за уже отправленные картинки (иконки кампаний из MinIO, аватары по ссылке).
+
+После первой отправки картинку можно показывать по file_id, не загружая её байты заново.
+file_id действует только для бота, который его получил, поэтому ключ в Redis включает id бота
+и источник картинки (путь minio://... или ссылку), значение - file_id и file_unique_id.
+Каждая запись живёт MEDIA_FILE_ID_TTL с момента сохранения, после чего картинка один раз загружается заново.
+Недоступный Redis не мешает показу: картинка просто отправляется как раньше.
+"""
+
+import logging
+
+from aiogram_dialog.api.entities import MediaId
+from redis.exceptions import RedisError
+
+from db.redis import get_redis
+from services.settings import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "media:file_id"
+# Боты, сохранявшие file_id: по ним forget_sources находит записи источника без обхода всех ключей
+BOTS_KEY = f"{KEY_PREFIX}:bots"
+
+
+def _key(bot_id: int, source: str) -> str:
+    return f"{KEY_PREFIX}:{bot_id}:{source}"
+
+
+async def get_file_id(bot_id: int, source: str) -> MediaId | None:
+    try:
+        raw = await get_redis().get(_key(bot_id, source))
+    except RedisError as e:
+        logger.warning("Не удалось прочитать file_id для %s из Redis: %s", source, e)
+        return None
+    if raw is None:
+        return None
+
+    file_id, _, file_unique_id = raw.decode().partition(" ")
+    return MediaId(file_id, file_unique_id or None)
+
+
+async def set_file_id(bot_id: int, source: str, media_id: MediaId) -> None:
+    value = f"{media_id.file_id} {media_id.file_unique_id or ''}".rstrip()
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.set(_key(bot_id, source), value, ex=settings.MEDIA_FILE_ID_TTL)
+            pipe.sadd(BOTS_KEY, bot_id)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Не удалось сохранить file_id для %s в Redis: %s", source, e)
+
+
+async def forget_file_id(bot_id: int, source: str) -> None:
+    try:
+        await get_redis().delete(_key(bot_id, source))
+    except RedisError as e:
+        logger.warning("Не удалось удалить file_id для %s из Redis: %s", source, e)
+
+
+async def forget_sources(*sources: str) -> None:
+    """Забывает file_id картинок у всех ботов, например когда сама картинка удалена"""
+    if not sources:
+        return
+    redis = get_redis()
+    try:
+        bot_ids = await redis.smembers(BOTS_KEY)
+        keys = [_key(int(bot_id), source) for bot_id in bot_ids for source in sources]
+        if keys:
+            await redis.delete(*keys)
+    except RedisError as e:
+        logger.warning("Не удалось удалить file_id для %s из Redis: %s", sources, e)
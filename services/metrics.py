@@ -0,0 +1,190 @@
+"""
+Метрики процесса в текстовом формате Prometheus.
+
+Свой небольшой реестр вместо prometheus_client: нужны только счётчики, гистограммы и значения, снимаемые
+в момент запроса. Всё обновляется из event loop, поэтому блокировки не нужны.
+Отдаёт метрики services.metrics_server по адресу /metrics.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from math import inf
+
+type LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        pass
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """Значение, которое снимается функцией collect в момент запроса метрик"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], dict[LabelValues, float]],
+        labels: tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.collect = collect
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in self.collect().items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = (*sorted(buckets), inf)
+        # Счётчики по корзинам (не накопительные), сумма и число наблюдений
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = ([0] * len(self.buckets), [0.0, 0])
+        counts, totals = state
+        counts[bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, (counts, (total, count)) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {int(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register[M: Metric](self, metric: M) -> M:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# === Апдейты ===
+UPDATES = registry.register(Counter("bot_updates_total", "Обработанные апдейты", ("bot", "state")))
+UPDATE_DURATION = registry.register(
+    Histogram("bot_update_duration_seconds", "Время обработки апдейта", ("bot", "state"))
+)
+UPDATE_DB_QUERIES = registry.register(
+    Histogram(
+        "bot_update_db_queries",
+        "Запросов к БД на апдейт",
+        ("bot", "state"),
+        buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34),
+    )
+)
+
+# === Telegram API ===
+TELEGRAM_REQUEST_DURATION = registry.register(
+    Histogram("telegram_api_request_duration_seconds", "Время запроса к Telegram Bot API", ("bot", "method"))
+)
+TELEGRAM_RETRY_AFTER = registry.register(
+    Counter("telegram_api_retry_after_total", "Ответы 429 (Too Many Requests) от Telegram", ("bot", "method"))
+)
+
+# === Хранилища ===
+REDIS_COMMAND_DURATION = registry.register(
+    Histogram("redis_command_duration_seconds", "Время обращения к Redis (конвейер - одно обращение)", ("command",))
+)
+MINIO_FETCH_DURATION = registry.register(
+    Histogram("minio_fetch_duration_seconds", "Время загрузки объекта из MinIO", ("bucket",))
+)
+
+# === Event loop ===
+EVENT_LOOP_LAG = registry.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "Насколько позже срока просыпается периодическая задача (services.loop_monitor)",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+    )
+)
+EVENT_LOOP_STALLS = registry.register(
+    Counter("event_loop_stalls_total", "Зависания event loop дольше порога LOOP_MONITOR_THRESHOLD")
+)
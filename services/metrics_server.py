@@ -0,0 +1,76 @@
+"""HTTP-эндпоинт /metrics (aiohttp) в процессе ботов"""
+
+import logging
+
+from aiohttp import web
+from tortoise import connections
+from tortoise.exceptions import ConfigurationError
+
+from db.minio import get_http_pool
+from services.metrics import Gauge, LabelValues, registry
+from services.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _db_pool_usage() -> dict[LabelValues, float]:
+    try:
+        pool = getattr(connections.get("default"), "_pool", None)
+    except ConfigurationError:
+        return {}
+    if pool is None:
+        return {}
+    size, idle = pool.get_size(), pool.get_idle_size()
+    return {("busy",): size - idle, ("idle",): idle, ("max",): pool.get_max_size()}
+
+
+def _minio_pool_usage() -> dict[LabelValues, float]:
+    if get_http_pool.cache_info().currsize == 0:
+        return {}
+    manager = get_http_pool()
+    busy = idle = size = opened = 0
+    for key in manager.pools.keys():  # noqa: SIM118 - RecentlyUsedContainer не поддерживает итерацию
+        pool = manager.pools.get(key)
+        if pool is None or pool.pool is None:
+            continue
+        # Очередь пула хранит свободные соединения и None на месте ещё не открытых
+        idle += sum(conn is not None for conn in pool.pool.queue)
+        busy += pool.pool.maxsize - pool.pool.qsize()
+        size += pool.pool.maxsize
+        opened += pool.num_connections
+    return {("busy",): busy, ("idle",): idle, ("max",): size, ("opened_total",): opened}
+
+
+registry.register(Gauge("db_pool_connections", "Соединения пула Postgres", _db_pool_usage, ("state",)))
+registry.register(Gauge("minio_pool_connections", "Соединения пула Minio", _minio_pool_usage, ("state",)))
+
+
+async def _metrics(request: web.Request) -> web.Response:
+    return web.Response(text=registry.render(), headers={"Content-Type": CONTENT_TYPE})
+
+
+class MetricsServer:
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", _metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Метрики доступны на http://%s:%d/metrics", self.host, self.port)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+metrics_server = MetricsServer(settings.METRICS_HOST, settings.METRICS_PORT)
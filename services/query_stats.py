@@ -0,0 +1,130 @@
+"""
+Счётчик запросов к БД на один апдейт Telegram и поиск N+1.
+
+Клиент БД (db.instrumented_asyncpg) сообщает о каждом запросе в record_query, запрос засчитывается апдейту,
+в контексте которого выполняется (contextvar, его задаёт QueryStatsMiddleware). Апдейт помечается тегом -
+состоянием диалога или именем обработчика. Когда апдейт обработан, слишком тяжёлые апдейты и одинаковые
+запросы, повторённые много раз (признак N+1), пишутся в лог, а итоги копятся по тегам.
+"""
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+
+from services.settings import settings
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_TAG = "unknown"
+# Сколько символов запроса показывать в логе
+SQL_PREVIEW_LENGTH = 300
+
+
+class UpdateQueries:
+    """Запросы одного апдейта"""
+
+    __slots__ = ("count", "elapsed", "statements", "tag")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.elapsed = 0.0
+        self.statements: Counter[str] = Counter()
+        self.tag = UNKNOWN_TAG
+
+
+class TagTotals:
+    """Итоги по всем апдейтам с одним тегом"""
+
+    __slots__ = ("elapsed", "max_queries", "queries", "updates")
+
+    def __init__(self) -> None:
+        self.updates = 0
+        self.queries = 0
+        self.elapsed = 0.0
+        self.max_queries = 0
+
+
+_current: ContextVar[UpdateQueries | None] = ContextVar("update_queries", default=None)
+
+
+def record_query(query: str, elapsed: float) -> None:
+    """Засчитывает запрос текущему апдейту; вне апдейта (фоновые задачи, старт) ничего не делает"""
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.elapsed += elapsed
+    stats.statements[query] += 1
+
+
+def update_tag(context: Context) -> str | None:
+    """Тег апдейта, который обрабатывается в данном контексте (например, контексте задачи), или None"""
+    stats = context.get(_current)
+    return stats.tag if stats is not None else None
+
+
+def tag_update(tag: str) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.tag = tag
+
+
+class QueryStats:
+    def __init__(self, log_queries: int, log_seconds: float, repeat_threshold: int) -> None:
+        self.log_queries = log_queries
+        self.log_seconds = log_seconds
+        self.repeat_threshold = repeat_threshold
+        self.totals: dict[str, TagTotals] = {}
+
+    @contextmanager
+    def track(self) -> Iterator[UpdateQueries]:
+        """Считает запросы, выполненные внутри блока, как запросы одного апдейта"""
+        stats = UpdateQueries()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            _current.reset(token)
+            self._finish(stats, time.perf_counter() - started)
+
+    def _finish(self, stats: UpdateQueries, duration: float) -> None:
+        totals = self.totals.get(stats.tag)
+        if totals is None:
+            totals = self.totals[stats.tag] = TagTotals()
+        totals.updates += 1
+        totals.queries += stats.count
+        totals.elapsed += stats.elapsed
+        totals.max_queries = max(totals.max_queries, stats.count)
+
+        if stats.count >= self.log_queries or stats.elapsed >= self.log_seconds:
+            logger.warning(
+                "Апдейт %s: %d запросов к БД за %.3f с (обработка %.3f с)",
+                stats.tag,
+                stats.count,
+                stats.elapsed,
+                duration,
+            )
+        for query, times in stats.statements.most_common():
+            if times < self.repeat_threshold:
+                break
+            logger.warning(
+                "Возможный N+1 в %s: запрос выполнен %d раз: %s",
+                stats.tag,
+                times,
+                query[:SQL_PREVIEW_LENGTH],
+            )
+
+    def snapshot(self) -> list[tuple[str, TagTotals]]:
+        """Итоги по тегам, самые нагружающие БД сначала"""
+        return sorted(self.totals.items(), key=lambda item: item[1].queries, reverse=True)
+
+
+query_stats = QueryStats(
+    settings.QUERY_STATS_LOG_QUERIES,
+    settings.QUERY_STATS_LOG_SECONDS,
+    settings.QUERY_STATS_REPEAT_THRESHOLD,
+)
@@ -0,0 +1,278 @@
+"""
+Рейтинг академии: изменение рейтинга и таблицы лидеров (за всё время и за неделю, месяц, семестр).
+
+Изменение - один UPDATE с ограничением 0..MAX_RATING прямо в SQL (и для одного игрока, и для начисления
+за игру всем сразу), так что одновременные правки не теряются; каждое изменение попадает в журнал rating_event.
+
+Основной источник - зеркало рейтинга в Redis (ZSET): страницы и место игрока берутся за O(log n).
+Зеркало перестраивается из Postgres при старте и обновляется при каждом изменении рейтинга.
+Если Redis недоступен или зеркало пусто, те же данные читаются из Postgres keyset-запросом по (rating, id).
+Таблицы за период читаются из заранее посчитанных корзин rating_bucket (их ведёт services.rating_ledger).
+"""
+
+import logging
+from datetime import datetime
+from typing import NamedTuple
+
+from redis.exceptions import RedisError
+from tortoise import connections
+from tortoise.expressions import Q
+
+from db.models import RatingBucket, User
+from db.redis import get_redis
+from services.rating_ledger import RatingSource, rating_ledger
+from services.settings import settings
+from services.user_cache import user_cache
+from utils.rating_window import RatingWindow, period_start
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_PAGE_SIZE = 6
+LEADERBOARD_KEY = "leaderboard:rating"
+REBUILD_CHUNK_SIZE = 1000
+
+# Курсоры страниц: номер страницы (строкой, чтобы пережить JSON в FSM-хранилище) -> [rating, id]
+# последнего игрока предыдущей страницы
+type LeaderboardCursors = dict[str, list[int]]
+
+
+class RatingChange(NamedTuple):
+    old: int
+    new: int
+    applied: bool  # False, если изменение отклонено (слишком большой шаг)
+
+
+# old блокирует строку и отдаёт рейтинг до изменения, upd записывает новый; LEFT JOIN отличает
+# отклонённое изменение (new_rating = NULL) от отсутствующего игрока (ни одной строки)
+_CHANGE_RATING_SQL = """
+WITH old AS (SELECT "id", "rating" FROM "user" WHERE "id" = $1 FOR UPDATE),
+upd AS (
+    UPDATE "user" u SET "rating" = LEAST(GREATEST({value}, 0), $2)
+    FROM old WHERE u."id" = old."id" AND {condition}
+    RETURNING u."rating"
+)
+SELECT old."rating" AS old_rating, upd."rating" AS new_rating FROM old LEFT JOIN upd ON TRUE
+"""
+
+# Изменение для многих игроков сразу: массивы id и изменений разворачиваются в строки, строки блокируются
+# в порядке id (так одновременные массовые начисления не ловят взаимную блокировку) и обновляются одним UPDATE
+_ADJUST_MANY_SQL = """
+WITH input AS (SELECT * FROM unnest($1::bigint[], $2::int[]) AS t("id", "delta")),
+old AS (SELECT u."id", u."rating" FROM "user" u JOIN input USING ("id") ORDER BY u."id" FOR UPDATE OF u),
+upd AS (
+    UPDATE "user" u SET "rating" = LEAST(GREATEST(old."rating" + input."delta", 0), $3)
+    FROM old JOIN input USING ("id") WHERE u."id" = old."id"
+    RETURNING u."id", u."rating"
+)
+SELECT upd."id", old."rating" AS old_rating, upd."rating" AS new_rating FROM old JOIN upd USING ("id")
+"""
+
+
+def _member(user_id: int) -> str:
+    # При равном рейтинге ZSET упорядочивает участников лексикографически; ведущие нули дают тот же
+    # порядок по id, что и ORDER BY rating DESC, id DESC в Postgres
+    return f"{user_id:020d}"
+
+
+# === Зеркало в Redis ===
+async def rebuild_leaderboard() -> None:
+    """Заново заполняет зеркало рейтинга из Postgres; старое зеркало заменяется атомарно"""
+    rows = await User.all().values_list("id", "rating")
+    tmp_key = f"{LEADERBOARD_KEY}:rebuild"
+
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.delete(tmp_key)
+            for i in range(0, len(rows), REBUILD_CHUNK_SIZE):
+                pipe.zadd(tmp_key, {_member(id_): rating for id_, rating in rows[i : i + REBUILD_CHUNK_SIZE]})
+            if rows:
+                pipe.rename(tmp_key, LEADERBOARD_KEY)
+            else:
+                pipe.delete(LEADERBOARD_KEY)
+            await pipe.execute()
+    except RedisError:
+        logger.exception("Не удалось перестроить зеркало рейтинга, таблица будет читаться из Postgres")
+        return
+    logger.info("Зеркало рейтинга перестроено: %d игроков", len(rows))
+
+
+async def update_leaderboard(user_id: int, rating: int) -> None:
+    """Записывает новый рейтинг игрока в зеркало; вызывать после сохранения в Postgres"""
+    await update_leaderboard_many({user_id: rating})
+
+
+async def update_leaderboard_many(ratings: dict[int, int]) -> None:
+    """Записывает новые рейтинги нескольких игроков в зеркало одной командой"""
+    if not ratings:
+        return
+    try:
+        await get_redis().zadd(LEADERBOARD_KEY, {_member(user_id): rating for user_id, rating in ratings.items()})
+    except RedisError as e:
+        # До следующего перестроения при старте зеркало будет расходиться
+        logger.warning("Не удалось обновить рейтинг %s в Redis: %s", list(ratings), e)
+
+
+async def _redis_page(page: int, page_size: int) -> tuple[int, list[tuple[int, int]]] | None:
+    start = page * page_size
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.zcard(LEADERBOARD_KEY)
+            pipe.zrevrange(LEADERBOARD_KEY, start, start + page_size - 1, withscores=True)
+            total, members = await pipe.execute()
+    except RedisError as e:
+        logger.warning("Не удалось прочитать рейтинг из Redis: %s", e)
+        return None
+    if not total:
+        return None
+    return total, [(int(member), int(score)) for member, score in members]
+
+
+async def _redis_rank(user_id: int) -> tuple[int, int] | None:
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.zrevrank(LEADERBOARD_KEY, _member(user_id))
+            pipe.zcard(LEADERBOARD_KEY)
+            rank, total = await pipe.execute()
+    except RedisError as e:
+        logger.warning("Не удалось прочитать место игрока из Redis: %s", e)
+        return None
+    if rank is None:
+        return None
+    return rank + 1, total
+
+
+# === Postgres ===
+async def _db_page(page: int, cursors: LeaderboardCursors, page_size: int) -> tuple[int, list[tuple[int, int]]]:
+    query = User.all().order_by("-rating", "-id").limit(page_size)
+
+    cursor = cursors.get(str(page))
+    if page == 0:
+        pass
+    elif cursor is not None:
+        rating, id_ = cursor
+        query = query.filter(Q(rating__lt=rating) | Q(rating=rating, id__lt=id_))
+    else:
+        query = query.offset(page * page_size)
+
+    return await User.all().count(), await query.values_list("id", "rating")
+
+
+async def _bucket_page(
+    window: RatingWindow, page: int, cursors: LeaderboardCursors, page_size: int
+) -> tuple[int, list[tuple[int, int]]]:
+    # Каждый запрос читает лишь диапазон индекса (window, period_start, total, user_id) текущего периода
+    buckets = RatingBucket.filter(window=window, period_start=period_start(window, datetime.now(settings.timezone)))
+    query = buckets.order_by("-total", "-user_id").limit(page_size)
+
+    cursor = cursors.get(str(page))
+    if page == 0:
+        pass
+    elif cursor is not None:
+        total, user_id = cursor
+        query = query.filter(Q(total__lt=total) | Q(total=total, user_id__lt=user_id))
+    else:
+        query = query.offset(page * page_size)
+
+    return await buckets.count(), await query.values_list("user_id", "total")
+
+
+async def _db_rank(user_id: int) -> tuple[int, int] | None:
+    user = await User.get_or_none(id=user_id).values("rating")
+    if user is None:
+        return None
+    rating = user["rating"]
+    above = await User.filter(Q(rating__gt=rating) | Q(rating=rating, id__gt=user_id)).count()
+    return above + 1, await User.all().count()
+
+
+# === Изменение рейтинга ===
+async def _change_rating(user_id: int, sql: str, params: list, source: RatingSource) -> RatingChange | None:
+    _, rows = await connections.get("default").execute_query(sql, [user_id, settings.MAX_RATING, *params])
+    if not rows:
+        return None
+
+    old, new = rows[0]["old_rating"], rows[0]["new_rating"]
+    if new is None:
+        return RatingChange(old, old, applied=False)
+
+    if new != old:
+        await user_cache.invalidate(user_id)
+        await update_leaderboard(user_id, new)
+        rating_ledger.record(user_id, new - old, new, source)
+    return RatingChange(old, new, applied=True)
+
+
+async def adjust_rating(user_id: int, delta: int, source: RatingSource) -> RatingChange | None:
+    """Прибавляет delta к рейтингу игрока с ограничением 0..MAX_RATING. None - игрока нет"""
+    sql = _CHANGE_RATING_SQL.format(value='old."rating" + $3', condition="TRUE")
+    return await _change_rating(user_id, sql, [delta], source)
+
+
+async def set_rating(user_id: int, value: int, max_step: int, source: RatingSource) -> RatingChange | None:
+    """
+    Устанавливает рейтинг игрока (с ограничением 0..MAX_RATING), если он меняется не больше чем на max_step.
+
+    Шаг проверяется в том же запросе по заблокированному значению. None - игрока нет.
+    """
+    sql = _CHANGE_RATING_SQL.format(value="$3", condition='ABS(old."rating" - $3) <= $4')
+    return await _change_rating(user_id, sql, [value, max_step], source)
+
+
+async def adjust_ratings(deltas: dict[int, int], source: RatingSource) -> dict[int, RatingChange]:
+    """
+    Прибавляет изменения к рейтингам нескольких игроков одним UPDATE (атомарно) с ограничением 0..MAX_RATING.
+
+    Возвращает изменения по id игрока; отсутствующих игроков в ответе нет.
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return {}
+
+    _, rows = await connections.get("default").execute_query(
+        _ADJUST_MANY_SQL, [list(deltas), list(deltas.values()), settings.MAX_RATING]
+    )
+    changes = {row["id"]: RatingChange(row["old_rating"], row["new_rating"], applied=True) for row in rows}
+
+    changed = {user_id: change.new for user_id, change in changes.items() if change.new != change.old}
+    await user_cache.invalidate(*changed)
+    await update_leaderboard_many(changed)
+    for user_id, rating in changed.items():
+        rating_ledger.record(user_id, rating - changes[user_id].old, rating, source)
+    return changes
+
+
+# === Таблица лидеров ===
+async def get_leaderboard_page(
+    page: int,
+    cursors: LeaderboardCursors,
+    window: RatingWindow = RatingWindow.ALL,
+    page_size: int = LEADERBOARD_PAGE_SIZE,
+) -> tuple[int, list[dict]]:
+    """
+    Возвращает число игроков в рейтинге и игроков страницы page в виде {"position", "id", "username", "rating"}.
+
+    Для окна ALL rating - текущий рейтинг, для остальных окон - сумма изменений за текущий период.
+    При чтении из Postgres курсор следующей страницы дописывается в cursors, чтобы листание вперёд шло по индексу.
+    """
+    if window == RatingWindow.ALL:
+        result = await _redis_page(page, page_size) or await _db_page(page, cursors, page_size)
+    else:
+        result = await _bucket_page(window, page, cursors, page_size)
+    total, entries = result
+
+    if not entries:
+        return total, []
+
+    cursors[str(page + 1)] = list(reversed(entries[-1]))
+    usernames = dict(await User.filter(id__in=[id_ for id_, _ in entries]).values_list("id", "username"))
+
+    rows = [
+        {"position": position, "id": id_, "username": usernames.get(id_), "rating": rating}
+        for position, (id_, rating) in enumerate(entries, start=page * page_size + 1)
+    ]
+    return total, rows
+
+
+async def get_user_rank(user_id: int) -> tuple[int, int] | None:
+    """Место игрока в рейтинге (с единицы) и число игроков в рейтинге"""
+    return await _redis_rank(user_id) or await _db_rank(user_id)
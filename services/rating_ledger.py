@@ -0,0 +1,170 @@
+"""
+Журнал изменений рейтинга (таблица rating_event) и суммы по периодам (rating_bucket).
+
+События копятся в памяти и пишутся одной вставкой: по таймеру или как только наберётся пачка.
+В той же транзакции суммы пачки прибавляются к корзинам недели, месяца и семестра.
+При остановке бота остаток дописывается; при падении процесса последние секунды журнала теряются,
+сам рейтинг при этом уже сохранён. Пачку, нарушающую ограничения БД (событие удалённого пользователя
+или кампании), журнал пишет по одному событию и отбрасывает не прошедшие; при других ошибках пачка
+повторяется не больше RATING_LEDGER_MAX_RETRIES раз.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from datetime import UTC, date, datetime
+from typing import NamedTuple
+from uuid import UUID
+
+from tortoise import BaseDBAsyncClient
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
+from db.models import RatingEvent
+from services.settings import settings
+from utils.rating_window import RatingWindow, period_start
+
+logger = logging.getLogger(__name__)
+
+
+class RatingSource(NamedTuple):
+    """Кто, где и почему меняет рейтинг"""
+
+    actor_id: int | None = None
+    campaign_id: UUID | None = None
+    reason: str | None = None
+
+
+BUCKET_WINDOWS = (RatingWindow.WEEK, RatingWindow.MONTH, RatingWindow.SEMESTER)
+BUCKET_UPSERT_CHUNK_SIZE = 1000
+
+_UPSERT_BUCKETS_SQL = """
+INSERT INTO "rating_bucket" ("window", "period_start", "user_id", "total") VALUES {values}
+ON CONFLICT ("window", "period_start", "user_id") DO UPDATE SET "total" = "rating_bucket"."total" + EXCLUDED."total"
+"""
+
+
+async def _add_to_buckets(conn: BaseDBAsyncClient, batch: list[RatingEvent]) -> None:
+    """Прибавляет изменения пачки к корзинам периодов одним INSERT ... ON CONFLICT"""
+    totals: defaultdict[tuple[str, date, int], int] = defaultdict(int)
+    for event in batch:
+        moment = event.created_at.astimezone(settings.timezone)
+        for window in BUCKET_WINDOWS:
+            totals[window.value, period_start(window, moment), event.user_id] += event.delta
+
+    rows = list(totals.items())
+    # Postgres принимает не больше 32767 параметров на запрос
+    for i in range(0, len(rows), BUCKET_UPSERT_CHUNK_SIZE):
+        params: list = []
+        values = []
+        for (window, start, user_id), total in rows[i : i + BUCKET_UPSERT_CHUNK_SIZE]:
+            n = len(params)
+            values.append(f"(${n + 1}, ${n + 2}, ${n + 3}, ${n + 4})")
+            params.extend((window, start, user_id, total))
+        await conn.execute_query(_UPSERT_BUCKETS_SQL.format(values=", ".join(values)), params)
+
+
+async def _write(batch: list[RatingEvent]) -> None:
+    async with in_transaction() as conn:
+        await RatingEvent.bulk_create(batch, using_db=conn)
+        await _add_to_buckets(conn, batch)
+
+
+class RatingLedger:
+    def __init__(self, flush_interval: float, batch_size: int, max_retries: int) -> None:
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self._pending: list[RatingEvent] = []
+        self._failures = 0
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: asyncio.Task | None = None
+
+    def record(self, user_id: int, delta: int, rating: int, source: RatingSource) -> None:
+        self._pending.append(
+            RatingEvent(
+                user_id=user_id,
+                actor_id=source.actor_id,
+                campaign_id=source.campaign_id,
+                delta=delta,
+                rating=rating,
+                reason=source.reason[:255] if source.reason else None,
+                created_at=datetime.now(UTC),
+            )
+        )
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await _write(batch)
+        except asyncio.CancelledError:
+            # Задачу отменили посреди записи: транзакция откатилась, пачка уйдёт при следующей записи
+            self._pending[:0] = batch
+            raise
+        except IntegrityError:
+            # Обычно виновато событие удалённого до записи пользователя или кампании; такая пачка
+            # не запишется никогда, поэтому события пишутся по одному, непрошедшие отбрасываются
+            logger.warning("Пачка из %d событий рейтинга нарушает ограничения, запись по одному", len(batch))
+            await self._write_each(batch)
+            return
+        except Exception:
+            self._failures += 1
+            if self._failures > self.max_retries:
+                logger.exception("Не удалось записать %d событий рейтинга, пачка отброшена", len(batch))
+                self._failures = 0
+                return
+            # Пачка возвращается в очередь и уйдёт при следующей записи
+            logger.exception("Не удалось записать %d событий рейтинга", len(batch))
+            self._pending[:0] = batch
+            return
+        self._failures = 0
+        logger.debug("Записано %d событий рейтинга", len(batch))
+
+    async def _write_each(self, batch: list[RatingEvent]) -> None:
+        for i, event in enumerate(batch):
+            try:
+                await _write([event])
+            except asyncio.CancelledError:
+                self._pending[:0] = batch[i:]
+                raise
+            except Exception:
+                logger.exception(
+                    "Событие рейтинга отброшено: user=%s, campaign=%s, delta=%d",
+                    event.user_id,
+                    event.campaign_id,
+                    event.delta,
+                )
+
+    async def _run(self) -> None:
+        while not self._closing:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run(), name="rating-ledger")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            # Задача не отменяется посреди записи: цикл сам выходит после текущей пачки
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+rating_ledger = RatingLedger(
+    settings.RATING_LEDGER_FLUSH_INTERVAL,
+    settings.RATING_LEDGER_BATCH_SIZE,
+    settings.RATING_LEDGER_MAX_RETRIES,
+)
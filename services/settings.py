@@ -11,7 +11,6 @@ from typing import Any
 from zoneinfo import ZoneInfo
 
 from aiogram import Bot
-from minio import Minio
 from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings
 
@@ -33,6 +32,9 @@ class Settings(BaseSettings):
     MAX_ONE_TIME_RATING: int = 200
     MAX_ITEM_QUANTITY: int = 1000
 
+    # PLAYER
+    MAX_CHARACTER_FILE_SIZE: int = 2 * 1024 * 1024  # байт, экспорт LSS обычно весит десятки килобайт
+
     # ^ PostgreSQL
     DB_HOST: str = "db"
     DB_PORT: int = 5432
@@ -46,11 +48,65 @@ class Settings(BaseSettings):
     MINIO_ROOT_USER: str = Field(default="admin", alias="MINIO_ROOT_USER")
     MINIO_ROOT_PASSWORD: str = Field(default="admin", alias="MINIO_ROOT_PASSWORD")
     MINIO_BUCKETS: list[str] = ["campaign-icons"]
+    MINIO_POOL_SIZE: int = 10  # соединений в пуле клиента (db.minio)
+    MINIO_CONNECT_TIMEOUT: float = 5.0  # секунд
+    MINIO_READ_TIMEOUT: float = 30.0  # секунд
+    MINIO_RETRIES: int = 3  # повторов при сетевых ошибках и ответах 5xx
+    MINIO_MEDIA_CACHE_BYTES: int = 32 * 1024 * 1024  # кэш иконок в памяти (utils.minio.media_cache)
+    MEDIA_FILE_ID_TTL: int = 60 * 60 * 24 * 30  # секунд хранения каждого file_id от Telegram (services.media_file_ids)
+
+    # ^ Иконки кампаний (services.icons)
+    ICON_MAX_SIDE: int = 1280  # пикселей по большей стороне
+    ICON_MAX_BYTES: int = 300 * 1024
+    ICON_THUMBNAIL_SIDE: int = 320
+    ICON_THUMBNAIL_MAX_BYTES: int = 32 * 1024
+    ICON_MAX_PIXELS: int = 40_000_000  # картинки крупнее не открываются вовсе
+    IMAGE_WORKERS: int = 2  # потоков в пуле обработки картинок
+    ICON_PENDING_TTL: int = 60 * 60 * 24  # секунд иконка из незавершённого диалога защищена от удаления
 
     # ^ Redis
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str = Field(default="secure_password")
+    REDIS_CACHE_DB: int = 2  # 0 и 1 заняты FSM-хранилищами ботов
+
+    # ^ Кэш персонажей
+    CHARACTER_CACHE_SIZE: int = 1024
+    CHARACTER_CACHE_REDIS: bool = False
+    CHARACTER_CACHE_TTL: int = 60 * 60 * 24
+
+    # ^ Кэш пользователей
+    USER_CACHE_SIZE: int = 4096
+    # Секунд; при нескольких процессах бота столько могут жить чужие изменения в памяти соседнего процесса
+    USER_CACHE_TTL: float = 60.0
+    USER_CACHE_REDIS: bool = False
+    USER_SYNC_FLUSH_INTERVAL: float = 30.0  # секунд между записями username и времени визита
+
+    # ^ Журнал рейтинга
+    RATING_LEDGER_FLUSH_INTERVAL: float = 5.0  # секунд между записями пачек
+    RATING_LEDGER_BATCH_SIZE: int = 100  # пачка такого размера пишется сразу, не дожидаясь интервала
+    RATING_LEDGER_MAX_RETRIES: int = 12  # столько раз подряд повторяется пачка, которую не удалось записать
+
+    # ^ Массовый разбор листов
+    CHARACTER_PARSE_WORKERS: int = 2  # процессов в пуле
+    CHARACTER_PARSE_PROCESS_THRESHOLD: int = 16  # меньшие пачки разбираются в потоке, пул не нужен
+    CHARACTER_PARSE_CHUNK_SIZE: int = 8  # листов на одну задачу пула
+
+    # ^ Счётчик запросов к БД на апдейт
+    QUERY_STATS_LOG_QUERIES: int = 15  # апдейт, сделавший столько запросов, пишется в лог
+    QUERY_STATS_LOG_SECONDS: float = 0.5  # или потративший на запросы столько секунд
+    QUERY_STATS_REPEAT_THRESHOLD: int = 5  # столько одинаковых запросов за апдейт считаются N+1
+
+    # ^ Метрики (/metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_HOST: str = "127.0.0.1"  # в контейнере - 0.0.0.0, чтобы Prometheus достучался снаружи
+    METRICS_PORT: int = 9100
+
+    # ^ Наблюдение за event loop
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.1  # секунд между пульсами
+    LOOP_MONITOR_THRESHOLD: float = 0.25  # секунд задержки, после которых пишется стек
+    LOOP_MONITOR_MAX_SAMPLES: int = 3  # стеков на одно зависание
 
     # ^ Tortoise ORM
     TORTOISE_APP: str = "models"
@@ -71,7 +127,19 @@ class Settings(BaseSettings):
     @property
     def tortoise_config(self) -> dict[str, Any]:
         return {
-            "connections": {"default": self.tortoise_db_url},
+            "connections": {
+                "default": {
+                    # asyncpg, засекающий запросы для services.query_stats
+                    "engine": "db.instrumented_asyncpg",
+                    "credentials": {
+                        "host": self.DB_HOST,
+                        "port": self.DB_PORT,
+                        "user": self.DB_USER,
+                        "password": self.DB_PASSWORD,
+                        "database": self.DB_NAME,
+                    },
+                }
+            },
             "apps": {
                 self.TORTOISE_APP: {
                     "models": self.TORTOISE_MODELS,
@@ -89,16 +157,6 @@ class Settings(BaseSettings):
             self._timezone = ZoneInfo(self.TZ)
         return self._timezone
 
-    @computed_field
-    @property
-    def minio(self) -> Minio:
-        return Minio(
-            f"{self.MINIO_HOST}:{self.MINIO_PORT}",
-            access_key=self.MINIO_ROOT_USER,
-            secret_key=self.MINIO_ROOT_PASSWORD,
-            secure=False,
-        )
-
     admin_bot: Bot | None = None
     player_bot: Bot | None = None
 
@@ -1,11 +1,21 @@
 from aiogram import types
 
 from db.models import User
+from services.rating import update_leaderboard
 from services.settings import settings
+from services.user_cache import user_cache
 
 
-async def get_or_create_user(user: types.User):
-    return await User.get_or_create(
+async def get_or_create_user(user: types.User) -> tuple[User, bool]:
+    """
+    Пользователь для апдейта. Существующий берётся из кэша пользователей частичной моделью без листа и превью
+    (их читают services.character_data.get_sheet и get_preview, сохранять - только с update_fields), новый создаётся.
+    """
+    db_user = await user_cache.load(user.id)
+    if db_user is not None:
+        return db_user, False
+
+    db_user, created = await User.get_or_create(
         id=user.id,
         defaults={
             "id": user.id,
@@ -13,3 +23,6 @@ async def get_or_create_user(user: types.User):
             "username": user.username if user.username else None,
         },
     )
+    if created:
+        await update_leaderboard(db_user.id, db_user.rating)
+    return db_user, created
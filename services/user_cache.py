@@ -0,0 +1,138 @@
+"""
+Кэш пользователей для UserMiddleware, чтобы не ходить в БД на каждое нажатие кнопки.
+
+Хранится лёгкая запись пользователя: все колонки, кроме листа персонажа (data) и его превью (preview).
+Из неё собирается частичная модель User (как после .only() в Tortoise): лист и превью читаются только через
+services.character_data.get_sheet и get_preview, которые догружают их по требованию (наличие листа проверяет
+has_sheet, не загружая его), а save() без update_fields на такой модели падает с IncompleteInstanceError
+вместо записи неполной строки.
+Запись живёт не дольше ttl секунд и сбрасывается при каждой записи в строку пользователя.
+Первый уровень - LRU в памяти процесса, второй (опциональный) - Redis.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from db.models import User
+from db.redis import get_redis
+from services.settings import settings
+from utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Тяжёлые JSONB-колонки, которые в лёгкую запись не попадают
+DEFERRED_FIELDS = ("data", "preview")
+# Колонки пользователя без листа персонажа и превью
+LIGHT_FIELDS = tuple(
+    field
+    for field in User._meta.fields_db_projection  # noqa: SLF001
+    if field not in DEFERRED_FIELDS
+)
+
+type UserRecord = dict[str, Any]
+
+
+def _json_default(value: object) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(type(value).__name__)
+
+
+class UserCache:
+    def __init__(self, max_size: int, ttl: float, *, use_redis: bool = False) -> None:
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._local: LRUCache[int, tuple[float, UserRecord]] = LRUCache(max_size)
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def _build(record: UserRecord) -> User:
+        # Каждому апдейту своя модель: запись в кэше не должна меняться из обработчиков
+        return User._init_from_db(**record)  # noqa: SLF001
+
+    async def get(self, user_id: int) -> User | None:
+        cached = self._local.get(user_id)
+        if cached is not None:
+            expires_at, record = cached
+            if expires_at > time.monotonic():
+                return self._build(record)
+            self._local.pop(user_id)
+
+        if not self.use_redis:
+            return None
+
+        record = await self._get_remote(user_id)
+        if record is None:
+            return None
+        self._local.set(user_id, (time.monotonic() + self.ttl, record))
+        return self._build(record)
+
+    async def _get_remote(self, user_id: int) -> UserRecord | None:
+        try:
+            raw = await get_redis().get(self._redis_key(user_id))
+        except RedisError as e:
+            logger.warning("Не удалось прочитать пользователя %d из Redis: %s", user_id, e)
+            return None
+        if raw is None:
+            return None
+
+        try:
+            record = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning("Повреждённая запись пользователя %d в Redis", user_id)
+            return None
+        if not isinstance(record, dict) or record.keys() != set(LIGHT_FIELDS):
+            # Запись от прежней версии модели
+            return None
+        return record
+
+    async def set(self, record: UserRecord) -> None:
+        user_id = record["id"]
+        self._local.set(user_id, (time.monotonic() + self.ttl, record))
+
+        if not self.use_redis:
+            return
+
+        payload = json.dumps(record, default=_json_default, ensure_ascii=False)
+        try:
+            await get_redis().set(self._redis_key(user_id), payload, ex=max(1, int(self.ttl)))
+        except RedisError as e:
+            logger.warning("Не удалось записать пользователя %d в Redis: %s", user_id, e)
+
+    async def load(self, user_id: int) -> User | None:
+        """Лёгкая модель пользователя из кэша или из БД (без листа и превью). None - пользователя нет"""
+        user = await self.get(user_id)
+        if user is not None:
+            return user
+
+        record = await User.filter(id=user_id).first().values(*LIGHT_FIELDS)
+        if record is None:
+            return None
+        await self.set(record)
+        return self._build(record)
+
+    async def invalidate(self, *user_ids: int) -> None:
+        """Сбрасывает записи пользователей; вызывать после любой записи в их строки"""
+        if not user_ids:
+            return
+        for user_id in user_ids:
+            self._local.pop(user_id)
+
+        if not self.use_redis:
+            return
+
+        try:
+            await get_redis().delete(*(self._redis_key(user_id) for user_id in user_ids))
+        except RedisError as e:
+            logger.warning("Не удалось удалить пользователей %s из Redis: %s", list(user_ids), e)
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL, use_redis=settings.USER_CACHE_REDIS)
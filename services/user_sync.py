@@ -0,0 +1,111 @@
+"""
+Отложенная запись username и времени последнего визита пользователей.
+
+UserMiddleware сообщает увиденные username и время апдейта, они копятся в памяти (по записи на пользователя)
+и пишутся в Postgres одним UPDATE на всю пачку по таймеру. Так username остаётся актуальным
+(приглашения по @username), а обычный апдейт не добавляет записи в БД.
+При падении процесса теряются только наблюдения последнего интервала.
+"""
+
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+from tortoise.transactions import in_transaction
+
+from db.models import User
+from services.settings import settings
+from services.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+
+class _Seen(NamedTuple):
+    username: str | None
+    at: datetime
+    renamed: bool  # username отличается от сохранённого в БД
+
+
+# Telegram отдаёт username новому владельцу, поэтому прежнему владельцу он обнуляется: иначе поиск
+# приглашения по @username нашёл бы двоих
+_RELEASE_USERNAMES_SQL = """
+UPDATE "user" SET "username" = NULL WHERE "username" = ANY($1::VARCHAR[]) AND NOT ("id" = ANY($2::BIGINT[]))
+"""
+
+_SYNC_SQL = """
+UPDATE "user" u SET "username" = t."username", "last_seen" = GREATEST(u."last_seen", t."last_seen")
+FROM unnest($1::BIGINT[], $2::VARCHAR[], $3::TIMESTAMPTZ[]) AS t("id", "username", "last_seen")
+WHERE u."id" = t."id"
+"""
+
+
+class UserSync:
+    def __init__(self, flush_interval: float) -> None:
+        self.flush_interval = flush_interval
+        self._pending: dict[int, _Seen] = {}
+        self._task: asyncio.Task | None = None
+
+    def observe(self, user: User, username: str | None) -> None:
+        """
+        Запоминает username из апдейта. Если он сменился, модель апдейта сразу получает новый,
+        в БД он попадёт при следующей записи.
+        """
+        username = username or None
+        renamed = username != user.username
+        if renamed:
+            user.username = username
+
+        previous = self._pending.get(user.id)
+        renamed = renamed or (previous is not None and previous.renamed)
+        self._pending[user.id] = _Seen(username, datetime.now(UTC), renamed)
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+
+        ids = list(batch)
+        renamed = {user_id: seen.username for user_id, seen in batch.items() if seen.renamed}
+        released = [username for username in renamed.values() if username]
+        try:
+            async with in_transaction() as conn:
+                if released:
+                    await conn.execute_query(_RELEASE_USERNAMES_SQL, [released, list(renamed)])
+                await conn.execute_query(
+                    _SYNC_SQL,
+                    [ids, [seen.username for seen in batch.values()], [seen.at for seen in batch.values()]],
+                )
+        except Exception:
+            # Более свежие наблюдения, пришедшие во время записи, важнее возвращаемых
+            logger.exception("Не удалось записать %d наблюдений пользователей", len(batch))
+            for user_id, seen in batch.items():
+                self._pending.setdefault(user_id, seen)
+            return
+
+        if renamed:
+            # Прежние владельцы снятых username остаются в кэше прежними, пока запись не истечёт
+            await user_cache.invalidate(*renamed)
+            logger.info("Обновлены username %d пользователей", len(renamed))
+        logger.debug("Записано %d наблюдений пользователей", len(batch))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="user-sync")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+
+user_sync = UserSync(settings.USER_SYNC_FLUSH_INTERVAL)
@@ -1,10 +1,19 @@
+import hashlib
+import json
 import logging
+from functools import cached_property
 from typing import Any
 
 from pydantic import BaseModel, Field
 
+from utils.rich_text import render_html
+
 logger = logging.getLogger(__name__)
 
+# Версия разметки превью; при любом изменении preview(), light_preview() или preview_stats() поднять,
+# тогда сохранённые в БД превью будут перестроены при первом показе
+PREVIEW_VERSION = 1
+
 
 class CharacterStat(BaseModel):
     score: int = 0
@@ -34,7 +43,53 @@ class CharacterCoins(BaseModel):
     cp: int = 0
 
 
-class CharacterData(BaseModel):
+class CharacterPreviewMixin:
+    """Представления персонажа, общие для CharacterData и LazyCharacterData"""
+
+    def preview(self) -> str:
+        return (
+            f"<b>Имя:</b> {self.name}\n"
+            f"<b>Класс:</b> {self.klass} {f'({self.subclass})' if self.subclass else ''}\n"
+            f"<b>Уровень:</b> {self.level}\n"
+            f"<b>Хиты:</b> {self.hp.current}/{self.hp.max} {f'(+{self.hp.temp} временное)' if self.hp.temp else ''}\n"
+            f"<b>Класс брони:</b> {self.hp.ac}\n"
+            f"<b>Скорость:</b> {self.hp.speed} фт.\n"
+            f"<b>Раса:</b> {self.race}\n"
+            f"<b>Предыстория:</b> {self.background}\n"
+            f"<b>Мировоззрение:</b> {self.alignment}"
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """Значения для колонок-сводки модели db.models.base.CharacterData"""
+        return {
+            "name": self.name[:255],
+            "klass": self.klass[:255],
+            "level": self.level,
+            "hp_current": self.hp.current,
+            "hp_max": self.hp.max,
+            "ac": self.hp.ac,
+        }
+
+    def light_preview(self) -> str:
+        return f"<b>Имя:</b> {self.name}\n"
+
+    def preview_stats(self) -> str:
+        return "\n".join(
+            [f"<b>{STATS_CONVERSION[key]}:</b> {value.score}({value.modifier})" for key, value in self.stats.items()]
+        )
+
+    def rendered_previews(self) -> dict[str, Any]:
+        """Готовые превью для поля preview модели db.models.base.CharacterData"""
+        return {
+            "version": PREVIEW_VERSION,
+            "full": self.preview(),
+            "light": self.light_preview(),
+            "stats": self.preview_stats(),
+            "avatar": self.avatar_link,
+        }
+
+
+class CharacterData(CharacterPreviewMixin, BaseModel):
     name: str = "Неизвестно"
     klass: str = Field(default="Неизвестно", alias="class")
     subclass: str = ""
@@ -74,27 +129,6 @@ class CharacterData(BaseModel):
     class Config:
         validate_by_name = True
 
-    def preview(self) -> str:
-        return (
-            f"<b>Имя:</b> {self.name}\n"
-            f"<b>Класс:</b> {self.klass} {f'({self.subclass})' if self.subclass else ''}\n"
-            f"<b>Уровень:</b> {self.level}\n"
-            f"<b>Хиты:</b> {self.hp.current}/{self.hp.max} {f'(+{self.hp.temp} временное)' if self.hp.temp else ''}\n"
-            f"<b>Класс брони:</b> {self.hp.ac}\n"
-            f"<b>Скорость:</b> {self.hp.speed} фт.\n"
-            f"<b>Раса:</b> {self.race}\n"
-            f"<b>Предыстория:</b> {self.background}\n"
-            f"<b>Мировоззрение:</b> {self.alignment}"
-        )
-
-    def light_preview(self) -> str:
-        return f"<b>Имя:</b> {self.name}\n"
-
-    def preview_stats(self) -> str:
-        return "\n".join(
-            [f"<b>{STATS_CONVERSION[key]}:</b> {value.score}({value.modifier})" for key, value in self.stats.items()]
-        )
-
 
 STATS_CONVERSION = {
     "str": "Сила",
@@ -106,143 +140,253 @@ STATS_CONVERSION = {
 }
 
 
-def parse_character_data(data: dict) -> CharacterData:
+def extract_sheet(payload: Any) -> dict:
     """
-    Превращает json персонажа Long Story Short в адекватный Pydantic объект
+    Достаёт документ персонажа из экспорта Long Story Short.
+
+    LSS кладёт сам лист строкой JSON в поле "data" конверта, но принимаем и уже развёрнутый документ.
     """
-    basic_info = data.get("info", {})
-    sub_info = data.get("subInfo", {})
-    vitality = data.get("vitality", {})
-    coins_data = data.get("coins", {})
-    prof_skills = []
-    for skill_name, skill_data in data.get("skills", {}).items():
-        if skill_data.get("isProf"):
-            prof_skills.append(skill_name)
-    stats = {}
-    for stat_name, stat_data in data.get("stats", {}).items():
-        stats[stat_name] = CharacterStat(
-            score=stat_data.get("score", 0),
-            modifier=stat_data.get("modifier", 0),
-        )
-    weapons = [
-        CharacterWeapon(
-            name=weapon.get("name", {}).get("value", "Неизвестно"),
-            mod=weapon.get("mod", {}).get("value", ""),
-            damage=weapon.get("dmg", {}).get("value", ""),
-            notes=weapon.get("notes", {}).get("value", ""),
-        )
-        for weapon in data.get("weaponsList", [])
-    ]
+    if not isinstance(payload, dict):
+        msg = "character export must be a JSON object"
+        raise TypeError(msg)
 
-    # noinspection PyArgumentList
-    return CharacterData(
-        # Basic info
-        name=data.get("name", {}).get("value", "Неизвестно"),
-        klass=basic_info.get("charClass", {}).get("value", "Неизвестно"),
-        subclass=basic_info.get("charSubclass", {}).get("value", ""),
-        level=basic_info.get("level", {}).get("value", 0),
-        race=basic_info.get("race", {}).get("value", "Неизвестно"),
-        background=basic_info.get("background", {}).get("value", "Неизвестно"),
-        alignment=basic_info.get("alignment", {}).get("value", "Неизвестно"),
-        avatar_link=basic_info.get("avatar", {}).get("webp") or basic_info.get("avatar", {}).get("jpeg"),
-        # Physical characteristics
-        age=sub_info.get("age", {}).get("value", ""),
-        height=sub_info.get("height", {}).get("value", ""),
-        weight=sub_info.get("weight", {}).get("value", ""),
-        eyes=sub_info.get("eyes", {}).get("value", ""),
-        skin=sub_info.get("skin", {}).get("value", ""),
-        hair=sub_info.get("hair", {}).get("value", ""),
-        # Stats
-        proficiency=data.get("proficiency", 0),
-        stats=stats,
-        # Skills
-        skills=data.get("skills", {}),
-        prof_skills=prof_skills,
-        # Vitality
-        hp=CharacterHP(
+    sheet = payload.get("data")
+    if isinstance(sheet, str):
+        sheet = json.loads(sheet)
+        if not isinstance(sheet, dict):
+            msg = "character sheet must be a JSON object"
+            raise TypeError(msg)
+        return sheet
+    return payload
+
+
+class LazyCharacterData(CharacterPreviewMixin):
+    """
+    Ленивое представление листа LSS с тем же API атрибутов, что и у CharacterData.
+
+    Каждое поле разбирается при первом обращении, так что light_preview() не трогает
+    ни подмодели, ни форматированный текст.
+    """
+
+    def __init__(self, data: dict) -> None:
+        self._data = data
+
+    @cached_property
+    def _info(self) -> dict:
+        return self._data.get("info", {})
+
+    @cached_property
+    def _sub_info(self) -> dict:
+        return self._data.get("subInfo", {})
+
+    @cached_property
+    def _vitality(self) -> dict:
+        return self._data.get("vitality", {})
+
+    def _text(self, *path: str) -> str:
+        node = self._data
+        for key in path:
+            node = node.get(key, {})
+        return extract_telegram_text(node.get("value", {}))
+
+    # Basic info
+    @cached_property
+    def name(self) -> str:
+        return self._data.get("name", {}).get("value", "Неизвестно")
+
+    @cached_property
+    def klass(self) -> str:
+        return self._info.get("charClass", {}).get("value", "Неизвестно")
+
+    @cached_property
+    def subclass(self) -> str:
+        return self._info.get("charSubclass", {}).get("value", "")
+
+    @cached_property
+    def level(self) -> int:
+        return self._info.get("level", {}).get("value", 0)
+
+    @cached_property
+    def race(self) -> str:
+        return self._info.get("race", {}).get("value", "Неизвестно")
+
+    @cached_property
+    def background(self) -> str:
+        return self._info.get("background", {}).get("value", "Неизвестно")
+
+    @cached_property
+    def alignment(self) -> str:
+        return self._info.get("alignment", {}).get("value", "Неизвестно")
+
+    @cached_property
+    def avatar_link(self) -> str | None:
+        avatar = self._info.get("avatar") or self._data.get("avatar", {})
+        return avatar.get("webp") or avatar.get("jpeg")
+
+    # Physical characteristics
+    @cached_property
+    def age(self) -> str:
+        return self._sub_info.get("age", {}).get("value", "")
+
+    @cached_property
+    def height(self) -> str:
+        return self._sub_info.get("height", {}).get("value", "")
+
+    @cached_property
+    def weight(self) -> str:
+        return self._sub_info.get("weight", {}).get("value", "")
+
+    @cached_property
+    def eyes(self) -> str:
+        return self._sub_info.get("eyes", {}).get("value", "")
+
+    @cached_property
+    def skin(self) -> str:
+        return self._sub_info.get("skin", {}).get("value", "")
+
+    @cached_property
+    def hair(self) -> str:
+        return self._sub_info.get("hair", {}).get("value", "")
+
+    # Stats
+    @cached_property
+    def proficiency(self) -> int:
+        return self._data.get("proficiency", 0)
+
+    @cached_property
+    def stats(self) -> dict[str, CharacterStat]:
+        return {
+            stat_name: CharacterStat(
+                score=stat_data.get("score", 0),
+                modifier=stat_data.get("modifier", 0),
+            )
+            for stat_name, stat_data in self._data.get("stats", {}).items()
+        }
+
+    # Skills
+    @cached_property
+    def skills(self) -> dict[str, dict]:
+        return self._data.get("skills", {})
+
+    @cached_property
+    def prof_skills(self) -> list[str]:
+        return [skill_name for skill_name, skill_data in self.skills.items() if skill_data.get("isProf")]
+
+    # Vitality
+    @cached_property
+    def hp(self) -> CharacterHP:
+        vitality = self._vitality
+        return CharacterHP(
             current=vitality.get("hp-current", {}).get("value", 0),
             max=vitality.get("hp-max", {}).get("value", 0),
             temp=vitality.get("hp-temp", {}).get("value", 0),
             ac=vitality.get("ac", {}).get("value", 0),
             speed=vitality.get("speed", {}).get("value", 0),
-        ),
-        # Weapons
-        weapons=weapons,
-        # Text content
-        traits=extract_telegram_text(data.get("text", {}).get("traits", {}).get("value", {})),
-        equipment=extract_telegram_text(data.get("equipment", {}).get("value", {})),
-        background_story=extract_telegram_text(data.get("quests", {}).get("value", {})),
-        personality=extract_telegram_text(data.get("background", {}).get("value", {})),
-        appearance=extract_telegram_text(data.get("appearance", {}).get("value", {})),
-        allies=extract_telegram_text(data.get("allies", {}).get("value", {})),
-        proficiencies=extract_telegram_text(data.get("prof", {}).get("value", {})),
-        # Currency
-        coins=CharacterCoins(
+        )
+
+    # Weapons
+    @cached_property
+    def weapons(self) -> list[CharacterWeapon]:
+        return [
+            CharacterWeapon(
+                name=weapon.get("name", {}).get("value", "Неизвестно"),
+                mod=weapon.get("mod", {}).get("value", ""),
+                damage=weapon.get("dmg", {}).get("value", ""),
+                notes=weapon.get("notes", {}).get("value", ""),
+            )
+            for weapon in self._data.get("weaponsList", [])
+        ]
+
+    # Text content
+    @cached_property
+    def traits(self) -> str:
+        return self._text("text", "traits")
+
+    @cached_property
+    def equipment(self) -> str:
+        return self._text("equipment")
+
+    @cached_property
+    def background_story(self) -> str:
+        return self._text("quests")
+
+    @cached_property
+    def personality(self) -> str:
+        return self._text("background")
+
+    @cached_property
+    def appearance(self) -> str:
+        return self._text("appearance")
+
+    @cached_property
+    def allies(self) -> str:
+        return self._text("allies")
+
+    @cached_property
+    def proficiencies(self) -> str:
+        return self._text("prof")
+
+    # Currency
+    @cached_property
+    def coins(self) -> CharacterCoins:
+        coins_data = self._data.get("coins", {})
+        return CharacterCoins(
             pp=coins_data.get("pp", {}).get("value", 0),
             gp=coins_data.get("gp", {}).get("value", 0),
             ep=coins_data.get("ep", {}).get("value", 0),
             sp=coins_data.get("sp", {}).get("value", 0),
             cp=coins_data.get("cp", {}).get("value", 0),
-        ),
-    )
-
+        )
 
-def extract_telegram_text(text_data: dict[str, Any]) -> str:
-    """
-    Превращает json документооборот в HTML
-    """
-    if not text_data:
-        return ""
 
-    content = text_data.get("data", {}).get("content", [])
-    paragraphs = []
+def sheet_hash(data: dict) -> str:
+    """Хэш содержимого листа, не зависящий от порядка ключей и форматирования файла"""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-    for block in content:
-        if block.get("type") == "paragraph":
-            paragraph_text = process_paragraph(block.get("content", []))
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
 
-    return "\n".join(paragraphs)
+def load_character(raw: str) -> tuple[dict, CharacterData]:
+    """
+    Разбирает и валидирует загруженный экспорт LSS.
 
+    Работает синхронно и может занять заметное время на больших листах, поэтому вызывать вне event loop.
+    """
+    data = extract_sheet(json.loads(raw))
+    return data, parse_character_data(data)
 
-def process_paragraph(items: list[dict[str, Any]]) -> str:
-    """Process all items in paragraph into HTML."""
-    result = []
 
-    for item in items:
-        item_type = item.get("type")
+def parse_character_data(data: dict) -> CharacterData:
+    """
+    Превращает json персонажа Long Story Short в адекватный Pydantic объект
+    """
+    view = LazyCharacterData(data)
+    # noinspection PyArgumentList
+    return CharacterData(**{field: getattr(view, field) for field in CharacterData.model_fields})
 
-        if item_type == "text":
-            html_text = process_text_item(item)
-            if html_text:
-                result.append(html_text)
 
-        elif item_type == "roller":
-            result.append(process_roller_item(item))
+def parse_character_batch(sheets: list[dict | None]) -> list[CharacterData | None]:
+    """
+    Разбирает пачку листов; ошибка в одном листе не мешает остальным, на его месте будет None.
 
-    return " ".join(result).strip()
+    Вызывается в процессе пула, поэтому живёт здесь: модуль импортируется без настроек и БД.
+    """
+    result: list[CharacterData | None] = []
+    for data in sheets:
+        if not data:
+            result.append(None)
+            continue
+        try:
+            result.append(parse_character_data(data))
+        except Exception:
+            logger.exception("Не удалось разобрать лист персонажа")
+            result.append(None)
+    return result
 
 
-def process_text_item(item: dict[str, Any]) -> str:
-    """Apply HTML formatting to text item."""
-    text = item.get("text", "").strip()
-    if not text:
+def extract_telegram_text(text_data: dict[str, Any]) -> str:
+    """
+    Превращает json документооборот в HTML
+    """
+    if not text_data:
         return ""
-
-    for mark in item.get("marks", []):
-        mark_type = mark.get("type")
-        if mark_type == "bold":
-            text = f"<b>{text}</b>"
-        elif mark_type == "italic":
-            text = f"<i>{text}</i>"
-        elif mark_type == "underline":
-            text = f"<u>{text}</u>"
-
-    return text
-
-
-def process_roller_item(item: dict[str, Any]) -> str:
-    """Convert roller item to placeholder HTML-like form."""
-    roller_text = item.get("content", [{}])[0].get("text", "")
-    return f"[{roller_text}]"
+    return render_html(text_data.get("data"))
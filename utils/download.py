@@ -0,0 +1,38 @@
+import codecs
+from collections.abc import AsyncGenerator
+
+from aiogram import Bot
+
+from exceptions.upload import FileTooLargeError
+
+
+async def iter_file(
+    bot: Bot,
+    file_id: str,
+    max_size: int,
+    *,
+    chunk_size: int = 65536,
+) -> AsyncGenerator[bytes]:
+    """Скачивает файл из Telegram по частям и обрывает загрузку, как только он превысит max_size байт"""
+
+    # Telegram сообщает размер заранее - отказываемся от заведомо большого файла, не начиная загрузку
+    file = await bot.get_file(file_id)
+    if file.file_size and file.file_size > max_size:
+        raise FileTooLargeError(max_size)
+
+    url = bot.session.api.file_url(bot.token, file.file_path or "")
+    received = 0
+    async for chunk in bot.session.stream_content(url, chunk_size=chunk_size):
+        received += len(chunk)
+        if received > max_size:
+            raise FileTooLargeError(max_size)
+        yield chunk
+
+
+async def download_text(bot: Bot, file_id: str, max_size: int, encoding: str = "utf-8") -> str:
+    """Скачивает текстовый файл с ограничением размера, декодируя его по мере получения"""
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    parts = [decoder.decode(chunk) async for chunk in iter_file(bot, file_id, max_size)]
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
@@ -1,3 +1,5 @@
+from typing import Any
+
 from aiogram.types import TelegramObject
 
 
@@ -8,3 +10,12 @@ def extract_user(event: TelegramObject):
         or (event.my_chat_member and event.my_chat_member.from_user)
         or (event.chat_join_request and event.chat_join_request.from_user)
     )
+
+
+def handler_tag(data: dict[str, Any]) -> str:
+    """Чем обрабатывается событие: состояние диалога aiogram-dialog или имя обработчика"""
+    context = data.get("aiogd_context")
+    if context is not None:
+        return str(context.state.state)
+    callback = getattr(data.get("handler"), "callback", None)
+    return getattr(callback, "__qualname__", "unknown")
@@ -0,0 +1,84 @@
+"""
+Приведение загруженных картинок к единому виду (Pillow): поворот по EXIF, RGB, ограничение сторон и размера файла.
+
+Функции синхронные и тяжёлые, вызывать их нужно вне event loop (см. services.icons).
+"""
+
+from io import BytesIO
+from typing import NamedTuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from exceptions.media import ImageTooLargeError, InvalidImageError
+
+JPEG_CONTENT_TYPE = "image/jpeg"
+# Качество JPEG по убыванию: берётся первое, при котором файл укладывается в лимит
+JPEG_QUALITIES = (85, 75, 65, 55, 45)
+SHRINK_FACTOR = 0.75  # во сколько раз уменьшать стороны, если не помогло и худшее качество
+MIN_SIDE = 64
+
+
+class ImageLimits(NamedTuple):
+    max_side: int  # пикселей по большей стороне
+    max_bytes: int
+
+
+class EncodedImage(NamedTuple):
+    data: bytes
+    content_type: str
+    width: int
+    height: int
+
+
+class NormalizedIcon(NamedTuple):
+    icon: EncodedImage
+    thumbnail: EncodedImage
+
+
+def _open(data: bytes, max_side: int, max_pixels: int) -> Image.Image:
+    try:
+        image = Image.open(BytesIO(data))
+        width, height = image.size
+        if width * height > max_pixels:
+            raise ImageTooLargeError(width, height, max_pixels)
+        # JPEG можно декодировать сразу в уменьшенном масштабе, не меньше нужного размера
+        image.draft("RGB", (max_side, max_side))
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError(str(e)) from e
+
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        # JPEG не хранит прозрачность: прозрачные места заливаются белым
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _save_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _encode(image: Image.Image, limits: ImageLimits) -> EncodedImage:
+    image = image.copy()
+    image.thumbnail((limits.max_side, limits.max_side), Image.Resampling.LANCZOS)
+
+    while True:
+        for quality in JPEG_QUALITIES:
+            data = _save_jpeg(image, quality)
+            if len(data) <= limits.max_bytes:
+                return EncodedImage(data, JPEG_CONTENT_TYPE, *image.size)
+        if min(image.size) * SHRINK_FACTOR < MIN_SIDE:
+            # Меньше уже некуда, отдаём как есть
+            return EncodedImage(data, JPEG_CONTENT_TYPE, *image.size)
+        size = (round(image.width * SHRINK_FACTOR), round(image.height * SHRINK_FACTOR))
+        image = image.resize(size, Image.Resampling.LANCZOS)
+
+
+def normalize_icon(data: bytes, icon: ImageLimits, thumbnail: ImageLimits, max_pixels: int) -> NormalizedIcon:
+    """Иконка и миниатюра в JPEG в пределах заданных сторон и размеров. InvalidImageError - не картинка"""
+    image = _open(data, max(icon.max_side, thumbnail.max_side), max_pixels)
+    return NormalizedIcon(_encode(image, icon), _encode(image, thumbnail))
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class LRUCache[K: Hashable, V]:
+    """
+    Ограниченный по количеству элементов LRU-кэш.
+
+    Не потокобезопасен: рассчитан на использование из event loop.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_size <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SizedLRUCache[K: Hashable]:
+    """
+    LRU-кэш байтовых значений, ограниченный суммарным размером.
+
+    Значение больше всего лимита не кэшируется. Не потокобезопасен: рассчитан на использование из event loop.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: OrderedDict[K, bytes] = OrderedDict()
+
+    def get(self, key: K) -> bytes | None:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self.pop(key)
+        self._data[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self.size -= len(evicted)
+
+    def pop(self, key: K) -> bytes | None:
+        value = self._data.pop(key, None)
+        if value is not None:
+            self.size -= len(value)
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size = 0
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,33 +1,151 @@
+import asyncio
 import logging
+import time
+from dataclasses import replace
 
 from aiogram import Bot
-from aiogram.types import BufferedInputFile, InputFile
-from aiogram_dialog.api.entities import MediaAttachment
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, InputFile, Message
+from aiogram_dialog.api.entities import MediaAttachment, MediaId, NewMessage, OldMessage
 from aiogram_dialog.manager.message_manager import MessageManager
 
+from db.minio import get_minio
+from services.media_file_ids import forget_file_id, get_file_id, set_file_id
+from services.metrics import MINIO_FETCH_DURATION
 from services.settings import settings
+from utils.lru import SizedLRUCache
 
 logger = logging.getLogger(__name__)
 
+# Объекты в MinIO не перезаписываются (имя выводится из содержимого), так что кэш сбрасывается только при удалении
+media_cache: SizedLRUCache[tuple[str, str]] = SizedLRUCache(settings.MINIO_MEDIA_CACHE_BYTES)
+# Загрузки, которые уже идут: одновременные показы одной иконки ждут одного запроса к MinIO
+_inflight: dict[tuple[str, str], asyncio.Task[bytes]] = {}
+# Фрагменты ответа Telegram на file_id, который он больше не принимает
+_REJECTED_FILE_ID = ("file identifier", "file reference", "file_id")
 
-def ensure_bucket(name: str) -> None:
-    if settings.minio.bucket_exists(name):
-        return
-    settings.minio.make_bucket(name)
-    logger.info("Created bucket %s", name)
+
+def read_object(bucket_name: str, object_name: str) -> bytes:
+    """Синхронно читает объект целиком и возвращает соединение в пул urllib3"""
+    response = get_minio().get_object(bucket_name, object_name)
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+
+async def _load_object(bucket_name: str, object_name: str) -> bytes:
+    key = bucket_name, object_name
+    started = time.perf_counter()
+    try:
+        data = await asyncio.to_thread(read_object, bucket_name, object_name)
+    finally:
+        del _inflight[key]
+    MINIO_FETCH_DURATION.observe(time.perf_counter() - started, bucket=bucket_name)
+    media_cache.set(key, data)
+    return data
+
+
+def _retrieve_exception(task: asyncio.Task[bytes]) -> None:
+    # Ошибку заберут ждущие; если их не осталось, asyncio не должен ругаться на необработанное исключение
+    if not task.cancelled():
+        task.exception()
+
+
+async def fetch_object(bucket_name: str, object_name: str) -> bytes:
+    """
+    Содержимое объекта из кэша или из MinIO; сам запрос к MinIO идёт в потоке, не блокируя event loop.
+
+    Загрузка идёт отдельной задачей, которую все запросившие ждут через shield: отмена одного из них
+    (например, его обработчика) не обрывает загрузку для остальных.
+    """
+    key = bucket_name, object_name
+    data = media_cache.get(key)
+    if data is not None:
+        return data
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_load_object(bucket_name, object_name), name=f"minio-fetch:{bucket_name}")
+        task.add_done_callback(_retrieve_exception)
+        _inflight[key] = task
+    return await asyncio.shield(task)
+
+
+def _media_source(media: MediaAttachment | None) -> str | None:
+    """Источник картинки, для которого запоминается file_id: объект MinIO или ссылка"""
+    if media is None:
+        return None
+    if media.path and str(media.path).startswith("minio://"):
+        return str(media.path)
+    return media.url
+
+
+def _with_file_id(media: MediaAttachment, file_id: MediaId | None) -> MediaAttachment:
+    # Источник остаётся во вложении: по нему можно откатиться к отправке самой картинки
+    return MediaAttachment(
+        media.type, url=media.url, path=media.path, file_id=file_id, use_pipe=media.use_pipe, **media.kwargs
+    )
 
 
 class MinioMessageManager(MessageManager):
+    """
+    Показывает картинки из MinIO, а для картинок из MinIO и по ссылке запоминает выданный Telegram file_id.
+
+    Повторные показы идут по file_id; если Telegram его отверг, file_id забывается и картинка отправляется заново.
+    """
+
     async def get_media_source(
         self,
         media: MediaAttachment,
         bot: Bot,
     ) -> InputFile | str:
-        if media.path and media.path.startswith("minio://"):
+        if media.file_id is None and media.path and media.path.startswith("minio://"):
             bucket_name, object_name = media.path.replace("minio://", "").split(":")
 
-            result = settings.minio.get_object(bucket_name, object_name)
-            data = result.read()
+            data = await fetch_object(bucket_name, object_name)
 
             return BufferedInputFile(file=data, filename=media.path)
         return await super().get_media_source(media, bot)
+
+    async def show_message(self, bot: Bot, new_message: NewMessage, old_message: OldMessage | None) -> OldMessage:
+        source = _media_source(new_message.media)
+        if source is None or new_message.media.file_id is not None:
+            return await super().show_message(bot, new_message, old_message)
+
+        cached = await get_file_id(bot.id, source)
+        if cached is not None:
+            # По file_id aiogram_dialog видит, что картинка не изменилась, и не трогает её при правке сообщения
+            new_message = replace(new_message, media=_with_file_id(new_message.media, cached))
+
+        shown = await super().show_message(bot, new_message, old_message)
+        if shown.media_id is not None:
+            media_id = MediaId(shown.media_id, shown.media_uniq_id)
+            if media_id != cached:
+                await set_file_id(bot.id, source, media_id)
+        return shown
+
+    async def _drop_rejected_file_id(self, bot: Bot, new_message: NewMessage, error: TelegramBadRequest) -> NewMessage:
+        """Забывает отвергнутый Telegram file_id и возвращает сообщение с самой картинкой; иначе пробрасывает ошибку"""
+        media = new_message.media
+        source = _media_source(media)
+        if source is None or media.file_id is None or not any(m in error.message.lower() for m in _REJECTED_FILE_ID):
+            raise error
+        logger.warning("Telegram отверг file_id для %s, картинка будет отправлена заново: %s", source, error.message)
+        await forget_file_id(bot.id, source)
+        return replace(new_message, media=_with_file_id(media, None))
+
+    async def send_media(self, bot: Bot, new_message: NewMessage) -> Message:
+        try:
+            return await super().send_media(bot, new_message)
+        except TelegramBadRequest as e:
+            new_message = await self._drop_rejected_file_id(bot, new_message, e)
+        return await super().send_media(bot, new_message)
+
+    async def edit_media(self, bot: Bot, new_message: NewMessage, old_message: OldMessage) -> Message:
+        try:
+            return await super().edit_media(bot, new_message, old_message)
+        except TelegramBadRequest as e:
+            new_message = await self._drop_rejected_file_id(bot, new_message, e)
+        return await super().edit_media(bot, new_message, old_message)
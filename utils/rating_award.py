@@ -0,0 +1,26 @@
+import re
+
+from exceptions.rating import InvalidAwardLineError
+
+# "@username +5", "username -3", "@username 10"; имя пользователя Telegram - до 32 символов [A-Za-z0-9_]
+_AWARD_LINE = re.compile(r"@?(?P<username>\w{1,32})\s*:?\s+(?P<delta>[+-]?\d+)")
+
+
+def parse_awards(text: str) -> dict[str, int]:
+    """
+    Разбирает список начислений вида "@username +N" (по строке на игрока).
+
+    Возвращает username в нижнем регистре (Telegram не различает регистр имён) -> суммарное изменение.
+    Пустые строки пропускаются, повтор одного игрока складывается.
+    """
+    awards: dict[str, int] = {}
+    for line_number, raw_line in enumerate(text.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+        match = _AWARD_LINE.fullmatch(line)
+        if match is None:
+            raise InvalidAwardLineError(line_number, line)
+        username = match["username"].lower()
+        awards[username] = awards.get(username, 0) + int(match["delta"])
+    return awards
@@ -0,0 +1,30 @@
+import enum
+from datetime import date, datetime
+
+# Семестры академии начинаются 1 февраля и 1 сентября
+SEMESTER_START_MONTHS = (2, 9)
+
+
+class RatingWindow(enum.StrEnum):
+    ALL = "all"
+    WEEK = "week"
+    MONTH = "month"
+    SEMESTER = "semester"
+
+
+def period_start(window: RatingWindow, moment: datetime) -> date:
+    """Первый день периода окна, в который попадает moment (в часовом поясе moment)"""
+    day = moment.date()
+    if window == RatingWindow.WEEK:
+        return date.fromordinal(day.toordinal() - day.weekday())
+    if window == RatingWindow.MONTH:
+        return day.replace(day=1)
+    if window == RatingWindow.SEMESTER:
+        spring, autumn = SEMESTER_START_MONTHS
+        if day.month >= autumn:
+            return date(day.year, autumn, 1)
+        if day.month >= spring:
+            return date(day.year, spring, 1)
+        return date(day.year - 1, autumn, 1)
+    msg = f"window {window} has no periods"
+    raise ValueError(msg)
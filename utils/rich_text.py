@@ -0,0 +1,295 @@
+"""
+Рендер форматированного текста Long Story Short (документ ProseMirror/tiptap) в HTML для Telegram.
+
+Обход одним проходом по явному стеку, без рекурсии: в стек кладутся узлы и готовые фрагменты разметки.
+Telegram не знает заголовков и списков, поэтому они сводятся к жирному тексту и строкам с маркерами.
+"""
+
+from collections.abc import Callable, Sequence
+from html import escape
+from typing import Any
+
+# Виды элементов стека
+_NODE = 0  # узел документа
+_INLINE = 1  # строчная разметка: перед ней выводятся отложенные перенос строки и маркер списка
+_RAW = 2  # закрывающие теги: выводятся как есть, отложенный перенос остаётся на потом
+_BLOCK_OPEN = 3  # открытие блока: выводит отложенный перенос, но не маркер списка, и снова начинает строку
+_BREAK = 4  # граница блока
+_PREFIX = 5  # маркер пункта списка
+_SIBLINGS = 6  # дети doc или неизвестного узла от индекса и дальше, подряд идущие абзацы выводятся без стека
+
+_SIMPLE_MARKS = {
+    "bold": ("<b>", "</b>"),
+    "italic": ("<i>", "</i>"),
+    "underline": ("<u>", "</u>"),
+    "strike": ("<s>", "</s>"),
+    "code": ("<code>", "</code>"),
+}
+
+HORIZONTAL_RULE = "——————"
+BULLET = "•"
+LIST_INDENT = "  "
+
+type _Item = tuple[int, Any, int]
+
+
+def _escape(text: str) -> str:
+    # Спецсимволы в обычном тексте редки, проверка вхождения дешевле трёх замен
+    if "&" in text or "<" in text or ">" in text:
+        return escape(text, quote=False)
+    return text
+
+
+def _wrap_marks(text: str, marks: list[dict[str, Any]]) -> str:
+    # Первая метка оказывается внутри, как и в прежней реализации
+    for mark in marks:
+        mark_type = mark.get("type")
+        tags = _SIMPLE_MARKS.get(mark_type)
+        if tags is not None:
+            text = f"{tags[0]}{text}{tags[1]}"
+        elif mark_type == "link":
+            href = (mark.get("attrs") or {}).get("href")
+            if href:
+                text = f'<a href="{escape(href)}">{text}</a>'
+    return text
+
+
+def _children(node: dict[str, Any], depth: int) -> list[_Item]:
+    return [(_NODE, child, depth) for child in node.get("content") or ()]
+
+
+def _expand_text(node: dict[str, Any], depth: int) -> list[_Item]:
+    text = node.get("text")
+    if not text:
+        return []
+    html = _escape(text)
+    marks = node.get("marks")
+    return [(_INLINE, _wrap_marks(html, marks) if marks else html, depth)]
+
+
+def _render_inline(children: list[dict[str, Any]], out: list[str]) -> bool:  # noqa: C901, PLR0912 - горячий цикл, разбивка на функции замедлит
+    """
+    Быстрый путь для абзаца из одних строчных узлов: дописывает его HTML прямо в out, без стека.
+
+    Возвращает False, если среди детей есть блочные узлы, узлы без типа или бросок сложнее одной формулы
+    без меток, тогда абзац раскрывается обычным образом, а уже дописанное в out убирает вызывающий.
+    Это самый горячий участок рендера: экранирование, простые метки и бросок с одной формулой разобраны
+    здесь же, без вызовов функций,
+    а тип узла читается индексом, что заметно дешевле .get.
+    """
+    append = out.append
+    try:
+        for child in children:
+            child_type = child["type"]
+            if child_type == "text":
+                text = child.get("text")
+                if not text:
+                    continue
+                if "&" in text or "<" in text or ">" in text:
+                    text = escape(text, quote=False)
+                marks = child.get("marks")
+                if marks:
+                    for mark in marks:
+                        tags = _SIMPLE_MARKS.get(mark.get("type"))
+                        text = tags[0] + text + tags[1] if tags is not None else _wrap_marks(text, (mark,))
+                append(text)
+            elif child_type == "roller":
+                # Обычно внутри броска одна формула без меток, её выводим сразу
+                content = child.get("content") or ()
+                if len(content) == 1:
+                    inner = content[0]
+                    if inner["type"] == "text" and not inner.get("marks"):
+                        text = inner.get("text") or ""
+                        if "&" in text or "<" in text or ">" in text:
+                            text = escape(text, quote=False)
+                        append(f"[{text}]")
+                        continue
+                # Бросок посложнее раскрывается через стек, как и весь абзац
+                return False
+            elif child_type == "hardBreak":
+                append("\n")
+            else:
+                return False
+    except KeyError:
+        return False
+    return True
+
+
+def _expand_siblings(node: dict[str, Any], depth: int) -> list[_Item]:
+    return [(_SIBLINGS, (node.get("content") or (), 0), depth)]
+
+
+def _expand_block(node: dict[str, Any], depth: int) -> list[_Item]:
+    # Абзац из одних строчных узлов выводится раньше, без раскрытия (см. _render_inline)
+    return [(_BREAK, None, depth), *_children(node, depth), (_BREAK, None, depth)]
+
+
+def _expand_heading(node: dict[str, Any], depth: int) -> list[_Item]:
+    return [
+        (_BREAK, None, depth),
+        (_INLINE, "<b>", depth),
+        *_children(node, depth),
+        (_RAW, "</b>", depth),
+        (_BREAK, None, depth),
+    ]
+
+
+def _expand_list(node: dict[str, Any], depth: int) -> list[_Item]:
+    indent = LIST_INDENT * depth
+    ordered = node.get("type") == "orderedList"
+    start = (node.get("attrs") or {}).get("start") or 1
+
+    items: list[_Item] = []
+    for index, child in enumerate(node.get("content") or ()):
+        marker = f"{start + index}." if ordered else BULLET
+        items.extend(((_BREAK, None, depth), (_PREFIX, f"{indent}{marker} ", depth), (_NODE, child, depth + 1)))
+    items.append((_BREAK, None, depth))
+    return items
+
+
+def _expand_blockquote(node: dict[str, Any], depth: int) -> list[_Item]:
+    return [
+        (_BREAK, None, depth),
+        (_BLOCK_OPEN, "<blockquote>", depth),
+        *_children(node, depth),
+        (_RAW, "</blockquote>", depth),
+        (_BREAK, None, depth),
+    ]
+
+
+def _expand_code_block(node: dict[str, Any], depth: int) -> list[_Item]:
+    code = "".join(child.get("text", "") for child in node.get("content") or ())
+    return [
+        (_BREAK, None, depth),
+        (_BLOCK_OPEN, "<pre>", depth),
+        (_INLINE, _escape(code), depth),
+        (_RAW, "</pre>", depth),
+        (_BREAK, None, depth),
+    ]
+
+
+def _expand_roller(node: dict[str, Any], depth: int) -> list[_Item]:
+    return [(_INLINE, "[", depth), *_children(node, depth), (_RAW, "]", depth)]
+
+
+def _expand_hard_break(node: dict[str, Any], depth: int) -> list[_Item]:
+    return [(_INLINE, "\n", depth)]
+
+
+def _expand_horizontal_rule(node: dict[str, Any], depth: int) -> list[_Item]:
+    return [(_BREAK, None, depth), (_INLINE, HORIZONTAL_RULE, depth), (_BREAK, None, depth)]
+
+
+# Блоки, которые выводятся одной строкой, если внутри только строчные узлы (см. _render_inline)
+_INLINE_BLOCKS = frozenset(("paragraph", "listItem"))
+
+# Раскрытие узла в последовательность элементов стека (в порядке документа); doc и неизвестные узлы
+# раскрываются в серию детей (_expand_siblings)
+_EXPANDERS: dict[str, Callable[[dict[str, Any], int], list[_Item]]] = {
+    "text": _expand_text,
+    "paragraph": _expand_block,
+    "listItem": _expand_block,
+    "heading": _expand_heading,
+    "bulletList": _expand_list,
+    "orderedList": _expand_list,
+    "blockquote": _expand_blockquote,
+    "codeBlock": _expand_code_block,
+    "roller": _expand_roller,
+    "hardBreak": _expand_hard_break,
+    "horizontalRule": _expand_horizontal_rule,
+}
+
+
+def _render_siblings(
+    siblings: tuple[Sequence[dict[str, Any]], int], depth: int, out: list[str], stack: list[_Item], lead: str
+) -> bool:
+    """
+    Выводит подряд идущие абзацы из одних строчных узлов прямо в out, по строке на абзац.
+
+    lead пишется перед первой строкой (отложенные перенос и маркер), перед остальными перенос строки,
+    пустые абзацы не выводят ничего. Первый узел, который так вывести нельзя, раскрывается в стек,
+    а следующие за ним уходят туда же новой серией. Возвращает True, если выведена хотя бы одна строка.
+    """
+    nodes, first = siblings
+    size = len(out)
+    for index in range(first, len(nodes)):
+        node = nodes[index]
+        node_type = node.get("type")
+        if node_type in _INLINE_BLOCKS:
+            start = len(out)
+            out.append(lead)
+            if _render_inline(node.get("content") or (), out):
+                if len(out) - start > 1:
+                    lead = "\n"
+                else:
+                    del out[start:]
+                continue
+            del out[start:]
+        if index + 1 < len(nodes):
+            stack.append((_SIBLINGS, (nodes, index + 1), depth))
+        stack.extend(reversed(_EXPANDERS.get(node_type, _expand_siblings)(node, depth)))
+        break
+    return len(out) != size
+
+
+def render_html(doc: dict[str, Any] | None) -> str:  # noqa: C901, PLR0912 - горячий цикл, разбивка на функции замедлит
+    """Превращает документ LSS (узел типа doc) в HTML для Telegram"""
+    if not doc:
+        return ""
+
+    out: list[str] = []
+    # Перенос строки и маркер списка откладываются до первого видимого фрагмента,
+    # так пустые абзацы не дают лишних строк, и маркер встаёт после переноса
+    need_break = False
+    line_start = True
+    prefix: str | None = None
+    stack: list[_Item] = [(_NODE, doc, 0)]
+
+    while stack:
+        kind, payload, depth = stack.pop()
+
+        if kind == _NODE:
+            node_type = payload.get("type")
+            if node_type in _INLINE_BLOCKS:
+                # Абзац из одних строчных узлов выводится сразу, минуя стек: сначала отложенные перенос
+                # и маркер, затем разметка; пустой абзац не выводит ничего
+                start = len(out)
+                if need_break or not line_start:
+                    out.append("\n")
+                if prefix is not None:
+                    out.append(prefix)
+                separators = len(out)
+                if _render_inline(payload.get("content") or (), out):
+                    if len(out) == separators:
+                        del out[start:]
+                    else:
+                        prefix = None
+                        line_start = False
+                        need_break = True
+                    continue
+                del out[start:]
+            expand = _EXPANDERS.get(node_type, _expand_siblings)
+            stack.extend(reversed(expand(payload, depth)))
+        elif kind == _SIBLINGS:
+            lead = ("\n" if need_break or not line_start else "") + (prefix or "")
+            if _render_siblings(payload, depth, out, stack, lead):
+                prefix = None
+                line_start = False
+                need_break = True
+        elif kind == _BREAK:
+            need_break = need_break or not line_start
+        elif kind == _PREFIX:
+            prefix = payload
+        elif kind == _RAW:
+            out.append(payload)
+        else:
+            if need_break:
+                out.append("\n")
+                need_break = False
+            if kind != _BLOCK_OPEN and prefix is not None:
+                out.append(prefix)
+                prefix = None
+            out.append(payload)
+            line_start = kind == _BLOCK_OPEN
+
+    return "".join(out).strip()